@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+"""Benchmark the change list of the admins in tests/admin.py at each level of the date hierarchy.
+
+Usage (from the root of the repository):
+
+    $ python -m benchmarks.run --rows 1000000 --output results.json
+
+By default the benchmark runs against SQLite (benchmarks/benchmark.sqlite3).
+To run against PostgreSQL, set BENCHMARK_DATABASE=postgresql and the standard
+libpq environment variables (PGDATABASE, PGUSER, PGHOST, ...).
+
+The data is seeded once and reused by subsequent runs with the same number of rows.
+"""
+from typing import Any, Dict, Iterator, List, Tuple
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+
+def seed(rows: int, years: int, batch_size: int) -> None:
+    from tests.models import Foo
+
+    existing = Foo.objects.count()
+    if existing >= rows:
+        return
+
+    rng = random.Random(rows)
+    end = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+    span = int(datetime.timedelta(days=365 * years).total_seconds())
+
+    for start in range(existing, rows, batch_size):
+        Foo.objects.bulk_create([
+            Foo(created=end - datetime.timedelta(seconds=rng.randrange(span)))
+            for _ in range(min(batch_size, rows - start))
+        ])
+        print(f'Seeded {min(start + batch_size, rows):,} / {rows:,} rows', file=sys.stderr)
+
+
+def create_index() -> None:
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        cursor.execute('CREATE INDEX IF NOT EXISTS benchmark_foo_created ON tests_foo (created)')
+
+
+def iter_endpoints(year: int) -> Iterator[Tuple[Any, str, str]]:
+    from django.contrib import admin
+
+    from tests.models import Foo
+
+    levels = (
+        ('all', ''),
+        ('year', f'?created__year={year}'),
+        ('month', f'?created__year={year}&created__month=6'),
+        ('day', f'?created__year={year}&created__month=6&created__day=15'),
+    )
+
+    for model, model_admin in admin.site._registry.items():
+        if not issubclass(model, Foo) or not model_admin.date_hierarchy:
+            continue
+
+        for level, query in levels:
+            yield model_admin, level, f'/admin/{model._meta.app_label}/{model._meta.model_name}/{query}'
+
+
+def explain(sql: str) -> List[str]:
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'{connection.ops.explain_query_prefix()} {sql}')
+        return [' '.join(str(column) for column in row) for row in cursor.fetchall()]
+
+
+def benchmark(client: Any, url: str, repeat: int) -> Dict[str, Any]:
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    cache.clear()
+
+    timings = []
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as context:
+            start = time.perf_counter()
+            response = client.get(url)
+            timings.append((time.perf_counter() - start) * 1000)
+
+    queries = [query['sql'] for query in context.captured_queries if 'tests_foo' in query['sql']]
+
+    return {
+        'status': response.status_code,
+        'queries': len(context.captured_queries),
+        'time_ms': {
+            'min': min(timings),
+            'median': statistics.median(timings),
+            'max': max(timings),
+        },
+        'plans': [{'sql': sql, 'plan': explain(sql)} for sql in queries],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Number of rows to seed (default 1,000,000).')
+    parser.add_argument('--years', type=int, default=5, help='Number of years to spread the rows over (default 5).')
+    parser.add_argument('--batch-size', type=int, default=10_000, help='Rows per bulk_create (default 10,000).')
+    parser.add_argument('--repeat', type=int, default=5, help='Renders of each change list (default 5).')
+    parser.add_argument('--index', action='store_true', help='Create an index on the date hierarchy field.')
+    parser.add_argument('--output', default='-', help='Path of the JSON results (default stdout).')
+    args = parser.parse_args()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+
+    import django
+    django.setup()
+
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+    from django.db import connection
+    from django.test import Client
+
+    call_command('migrate', run_syncdb=True, verbosity=0)
+    seed(args.rows, args.years, args.batch_size)
+    if args.index:
+        create_index()
+    call_command('rebuild_date_hierarchy_rollup', verbosity=0)
+
+    user, _ = User.objects.get_or_create(username='benchmark', defaults={'is_staff': True, 'is_superuser': True})
+    client = Client()
+    client.force_login(user)
+
+    results = []
+    for model_admin, level, url in iter_endpoints(year=2025 - args.years // 2 - 1):
+        result = benchmark(client, url, args.repeat)
+        results.append({
+            'admin': type(model_admin).__name__,
+            'level': level,
+            'url': url,
+            **result,
+        })
+        print(f'{type(model_admin).__name__:<50} {level:<6} {result["time_ms"]["median"]:>10.1f}ms', file=sys.stderr)
+
+    output = json.dumps({
+        'meta': {
+            'date': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'rows': args.rows,
+            'index': args.index,
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }, indent=2)
+
+    if args.output == '-':
+        print(output)
+    else:
+        with open(args.output, 'w') as f:
+            f.write(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+import os
+
+from tests.settings import *  # NOQA
+
+DEBUG = False
+ALLOWED_HOSTS = ['testserver']
+
+if os.environ.get('BENCHMARK_DATABASE') == 'postgresql':
+    # Connection parameters are read from the standard libpq environment variables.
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('PGDATABASE', 'ldh_benchmark'),
+            'USER': os.environ.get('PGUSER', ''),
+            'PASSWORD': os.environ.get('PGPASSWORD', ''),
+            'HOST': os.environ.get('PGHOST', ''),
+            'PORT': os.environ.get('PGPORT', ''),
+        }
+    }
+
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get(
+                'BENCHMARK_SQLITE_NAME',
+                os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark.sqlite3'),
+            ),
+        }
+    }
+
+# Admins querying the replica (date_hierarchy_drilldown_using) read the same database.
+DATABASES['replica'] = dict(DATABASES['default'])
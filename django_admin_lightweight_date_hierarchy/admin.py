@@ -1,15 +1,34 @@
-from typing import Any, Dict, Iterator, Optional, Tuple, Type, TYPE_CHECKING
-import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type, TYPE_CHECKING
 import datetime
 
 import django
-from django.core.exceptions import ImproperlyConfigured
+from django.core.exceptions import ImproperlyConfigured, PermissionDenied
 from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
 from django.contrib import admin
-from django.utils import timezone
-from django.http import HttpRequest
-from django.db.models import Model, QuerySet
+from django.utils import formats, timezone
+from django.utils.text import capfirst
+from django.utils.cache import add_never_cache_headers, patch_cache_control
+from django.http import Http404, HttpRequest, HttpResponse, HttpResponseBadRequest, JsonResponse
+from django.db.models import Count, Model, Q, QuerySet
+from django.template.loader import render_to_string
+from django.urls import URLPattern, path
 from django.contrib.admin import ModelAdmin
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.sites import all_sites
+from django.contrib.admin.views.main import ChangeList
+
+from .cache import CACHE_KEY_PREFIX
+from .executor import submit
+from .instrumentation import measure, record
+from .metadata import get_date_hierarchy_metadata
+from .pagination import (
+    EXACT_COUNT_VAR,
+    EstimatedCountPaginator,
+    estimate_result_count,
+    get_estimated_count_changelist_class,
+    get_keyset_changelist_class,
+)
 
 
 if TYPE_CHECKING:
@@ -57,6 +76,105 @@ def get_date_range_for_hierarchy(
     return from_date, to_date
 
 
+def get_date_range_lookups_for_hierarchy(
+    field_name: str,
+    date_hierarchy: DateHierarchy,
+    tz: Optional[datetime.timezone],
+) -> Dict[str, datetime.datetime]:
+    """Generate range lookups on field for date hierarchy.
+
+    Unlike the `__year`, `__month` and `__day` lookups, which extract the date
+    part from the field using a database function, a half-open range on the
+    field itself can be satisfied by an index range scan.
+
+    Returns:
+        Lookups to pass to `QuerySet.filter`.
+    """
+    from_date, to_date = get_date_range_for_hierarchy(date_hierarchy, tz)
+
+    return {
+        f'{field_name}__gte': from_date,
+        f'{field_name}__lt': to_date,
+    }
+
+
+def get_first_pk_from_date(model: Type[Model], field_name: str, value: datetime.datetime, using: str) -> Any:
+    """Get the primary key of the first row of model with field_name at or after value.
+
+    Returns:
+        Primary key, None when there are no rows at or after value.
+    """
+    return (
+        model._base_manager
+        .db_manager(using)
+        .filter(**{f'{field_name}__gte': value})
+        .order_by(field_name, 'pk')
+        .values_list('pk', flat=True)
+        .first()
+    )
+
+
+def get_pk_range_lookups_for_hierarchy(
+    model_admin: ModelAdmin,
+    using: str,
+    date_hierarchy: DateHierarchy,
+    tz: Optional[datetime.timezone],
+) -> Optional[Dict[str, Any]]:
+    """Generate primary key range lookups for date hierarchy.
+
+    For tables where the primary key increases with the date hierarchy field
+    (e.g. an auto increment id or UUIDv7 and a creation date), the date range
+    is mapped to the primary keys of the first rows at or after its bounds.
+    Each bound is a single lookup on an index of the field, and the filter is
+    a range scan on the primary key.
+
+    The bounds are cached when date_hierarchy_drilldown_cache_timeout is set on
+    the model admin.
+
+    Returns:
+        Lookups to pass to `QuerySet.filter`, None when there are no rows in the range.
+    """
+    model = model_admin.model
+    field_name: str = model_admin.date_hierarchy
+    timeout: Optional[int] = getattr(model_admin, 'date_hierarchy_drilldown_cache_timeout', None)
+    cache = caches[getattr(model_admin, 'date_hierarchy_drilldown_cache_alias', DEFAULT_CACHE_ALIAS)]
+
+    def get_pk(value: datetime.datetime) -> Any:
+        if timeout is None:
+            return get_first_pk_from_date(model, field_name, value, using)
+
+        key = ':'.join((CACHE_KEY_PREFIX, 'pk', model._meta.label_lower, field_name, using, value.isoformat()))
+        pk = cache.get(key)
+        if pk is None:
+            pk = get_first_pk_from_date(model, field_name, value, using)
+            # Rows may still be added after the last row, so it is not cached.
+            if pk is not None:
+                cache.set(key, pk, timeout)
+        return pk
+
+    from_date, to_date = get_date_range_for_hierarchy(date_hierarchy, tz)
+
+    from_pk = get_pk(from_date)
+    if from_pk is None:
+        return None
+
+    lookups = {'pk__gte': from_pk}
+
+    to_pk = get_pk(to_date)
+    if to_pk is not None:
+        lookups['pk__lt'] = to_pk
+
+    return lookups
+
+
+def iter_date_hierarchy_model_admins() -> Iterator[ModelAdmin]:
+    """Iterate over the model admins with date_hierarchy in all admin sites."""
+    for site in all_sites:
+        for model_admin in site._registry.values():
+            if model_admin.date_hierarchy:
+                yield model_admin
+
+
 class RangeBasedDateHierarchyListFilter(admin.ListFilter):
     title = ''
 
@@ -67,6 +185,8 @@ class RangeBasedDateHierarchyListFilter(admin.ListFilter):
         model: Type[Model],
         model_admin: ModelAdmin,
     ) -> None:
+        self.request = request
+        self.model_admin = model_admin
         self.date_hierarchy_field = model_admin.date_hierarchy
 
         if self.date_hierarchy_field is None:
@@ -76,7 +196,7 @@ class RangeBasedDateHierarchyListFilter(admin.ListFilter):
 
         self.date_hierarchy: "DateHierarchy" = {}  # type: ignore[typeddict-item]
 
-        date_hierarchy_field_re = re.compile(fr'^{self.date_hierarchy_field}__(day|month|year)$')
+        date_hierarchy_field_re = get_date_hierarchy_metadata(model_admin).param_re
 
         # Django applies filters one by one on the params requested in the URL's.
         # By poping the date hierarchy from the params list we prevent the
@@ -96,15 +216,274 @@ class RangeBasedDateHierarchyListFilter(admin.ListFilter):
         # Is there a date hierarchy filter?
         return bool(self.date_hierarchy)
 
-    def choices(self, changelist: Any) -> Optional[Iterator[Dict[str, Any]]]:
-        # Required.
-        return iter(())
+    def expected_parameters(self) -> List[str]:
+        return [f'{self.date_hierarchy_field}__{period}' for period in ('year', 'month', 'day')]
 
-    def queryset(self, request: HttpRequest, queryset: QuerySet) -> QuerySet:
+    def get_facet_dates(self) -> List[datetime.date]:
+        """Get the periods one level below the selected level of the hierarchy.
+
+        The candidates are generated by get_date_hierarchy_drilldown on the model
+        admin, like the drill-down without a query. Empty when a day is selected.
+        """
+        from .templatetags.ldh_admin_list import default_date_hierarchy_drilldown
+
+        if 'day' in self.date_hierarchy or 'year' not in self.date_hierarchy:
+            return []
+
+        date_hierarchy_drilldown_fn = getattr(
+            self.model_admin,
+            'get_date_hierarchy_drilldown',
+            default_date_hierarchy_drilldown,
+        )
+        return list(date_hierarchy_drilldown_fn(self.date_hierarchy['year'], self.date_hierarchy.get('month')))
+
+    def get_facet_counts(self, pk_attname: str, filtered_qs: QuerySet) -> Dict[str, Any]:
+        """Count the rows of each period in get_facet_dates using a conditional aggregate on its range."""
         tz = timezone.get_default_timezone() if settings.USE_TZ else None
-        from_date, to_date = get_date_range_for_hierarchy(self.date_hierarchy, tz)
+        period = 'day' if 'month' in self.date_hierarchy else 'month'
+
+        counts = {}
+        for i, date in enumerate(self.get_facet_dates()):
+            date_hierarchy: DateHierarchy = {'year': date.year, 'month': date.month}
+            if period == 'day':
+                date_hierarchy['day'] = date.day
+
+            lookups = get_date_range_lookups_for_hierarchy(self.date_hierarchy_field, date_hierarchy, tz)
+            counts[f'{i}__c'] = Count(pk_attname, filter=Q(**lookups))
+
+        return counts
+
+    def get_facet_queryset(self, changelist: Any) -> Dict[str, int]:
+        # Unlike other filters, this filter is not excluded. The periods are
+        # within the selected period, so the counts are narrowed to its range.
+        filtered_qs = changelist.get_queryset(self.request)
+        facet_counts: Dict[str, int] = filtered_qs.aggregate(
+            **self.get_facet_counts(changelist.pk_attname, filtered_qs)
+        )
+        return facet_counts
+
+    def choices(self, changelist: Any) -> Iterator[Dict[str, Any]]:
+        # Facets were added in Django 5.0.
+        if not getattr(changelist, 'add_facets', False):
+            return
+
+        dates = self.get_facet_dates()
+        if not dates:
+            return
+
+        facet_counts = self.get_facet_queryset(changelist)
+        field_generic = f'{self.date_hierarchy_field}__'
+
+        for i, date in enumerate(dates):
+            params = {f'{field_generic}year': date.year, f'{field_generic}month': date.month}
+            if 'month' in self.date_hierarchy:
+                params[f'{field_generic}day'] = date.day
+                title = capfirst(formats.date_format(date, 'MONTH_DAY_FORMAT'))
+            else:
+                title = capfirst(formats.date_format(date, 'YEAR_MONTH_FORMAT'))
+
+            yield {
+                'selected': False,
+                'query_string': changelist.get_query_string(params, [field_generic]),
+                'display': f'{title} ({facet_counts[f"{i}__c"]})',
+            }
+
+    def queryset(self, request: HttpRequest, queryset: QuerySet) -> QuerySet:
+        with measure('filter', self.model_admin, queryset.db):
+            record(level=('year', 'month', 'day')[len(self.date_hierarchy) - 1])
+
+            tz = timezone.get_default_timezone() if settings.USE_TZ else None
+
+            if getattr(self.model_admin, 'date_hierarchy_pk_range', False):
+                lookups = get_pk_range_lookups_for_hierarchy(self.model_admin, queryset.db, self.date_hierarchy, tz)
+                return queryset.none() if lookups is None else queryset.filter(**lookups)
 
-        return queryset.filter(**{
-            f'{self.date_hierarchy_field}__gte': from_date,
-            f'{self.date_hierarchy_field}__lt': to_date,
+            return queryset.filter(**get_date_range_lookups_for_hierarchy(
+                self.date_hierarchy_field,
+                self.date_hierarchy,
+                tz,
+            ))
+
+
+def get_date_hierarchy_changelist_class(changelist_class: Type[ChangeList]) -> Type[ChangeList]:
+    """Get a subclass of changelist_class that doesn't query the results of the change list."""
+
+    class DateHierarchyChangeList(changelist_class):
+        def get_results(self, request: HttpRequest) -> None:
+            # Only the date hierarchy is rendered, the results are not required.
+            pass
+
+    return DateHierarchyChangeList
+
+
+class LazyDateHierarchyMixin(ModelAdmin):
+    """Load the date hierarchy after the change list is rendered.
+
+    The date_hierarchy tag renders a placeholder, and the dates to drill-down to
+    are fetched from date_hierarchy_view, so the time of the change list does
+    not include the drill-down queries.
+
+    When date_hierarchy_drilldown_cache_timeout is set on the model admin, the
+    response can be cached by the browser for the same amount of time.
+
+    Usage:
+        class MyModelAdmin(LazyDateHierarchyMixin, admin.ModelAdmin):
+            date_hierarchy = 'created'
+    """
+    date_hierarchy_lazy = True
+
+    def get_urls(self) -> List[URLPattern]:
+        info = self.opts.app_label, self.opts.model_name
+        urls: List[URLPattern] = [
+            path(
+                'date_hierarchy/',
+                self.admin_site.admin_view(self.date_hierarchy_view, cacheable=True),
+                name='%s_%s_date_hierarchy' % info,
+            ),
+        ]
+        urls += super().get_urls()
+        return urls
+
+    def get_changelist(self, request: HttpRequest, **kwargs: Any) -> Type[ChangeList]:
+        changelist_class: Type[ChangeList] = super().get_changelist(request, **kwargs)
+        if getattr(request, '_date_hierarchy_view', False):
+            return get_date_hierarchy_changelist_class(changelist_class)
+        return changelist_class
+
+    def date_hierarchy_view(self, request: HttpRequest) -> HttpResponse:
+        """Get the date hierarchy of the change list with the same query string.
+
+        Returns:
+            JSON of the back link and the choices of the date hierarchy, and the
+            rendered admin/date_hierarchy.html template.
+        """
+        from .templatetags.ldh_admin_list import measure_date_hierarchy_context
+
+        if not self.has_view_or_change_permission(request):
+            raise PermissionDenied
+
+        if not self.date_hierarchy:
+            raise Http404
+
+        request._date_hierarchy_view = True
+        try:
+            cl = self.get_changelist_instance(request)
+        except IncorrectLookupParameters:
+            return HttpResponseBadRequest()
+
+        context = measure_date_hierarchy_context(cl)
+
+        response = JsonResponse({
+            'back': context.get('back'),
+            'choices': context['choices'],
+            'html': render_to_string('admin/date_hierarchy.html', context, request),
         })
+
+        timeout: Optional[int] = getattr(self, 'date_hierarchy_drilldown_cache_timeout', None)
+        if timeout is None:
+            add_never_cache_headers(response)
+        else:
+            patch_cache_control(response, private=True, max_age=timeout)
+
+        return response
+
+
+def get_concurrent_date_hierarchy_changelist_class(changelist_class: Type[ChangeList]) -> Type[ChangeList]:
+    """Get a subclass of changelist_class that computes the date hierarchy in a thread.
+
+    The date hierarchy is submitted to the executor (see executor.submit) before the
+    results of the change list are queried, and collected by the date_hierarchy tag.
+    """
+
+    class ConcurrentDateHierarchyChangeList(changelist_class):
+        def get_results(self, request: HttpRequest) -> None:
+            from .templatetags.ldh_admin_list import measure_date_hierarchy_context
+
+            if self.date_hierarchy and not getattr(self.model_admin, 'date_hierarchy_lazy', False):
+                self.date_hierarchy_future = submit(measure_date_hierarchy_context, self)
+
+            super().get_results(request)
+
+    return ConcurrentDateHierarchyChangeList
+
+
+class ConcurrentDateHierarchyMixin(ModelAdmin):
+    """Compute the date hierarchy concurrently with the results of the change list.
+
+    The drill-down queries are executed in a thread, using its own database
+    connection, while the change list counts and queries its results. The time
+    of the change list is the longer of the two instead of their sum.
+
+    Usage:
+        class MyModelAdmin(ConcurrentDateHierarchyMixin, admin.ModelAdmin):
+            date_hierarchy = 'created'
+    """
+
+    def get_changelist(self, request: HttpRequest, **kwargs: Any) -> Type[ChangeList]:
+        changelist_class: Type[ChangeList] = super().get_changelist(request, **kwargs)
+        return get_concurrent_date_hierarchy_changelist_class(changelist_class)
+
+
+class KeysetPaginationMixin(ModelAdmin):
+    """Paginate the change list using a keyset on the date hierarchy field and the primary key.
+
+    Deep pages cost the same as the first page, see get_keyset_changelist_class.
+    The change list must be ordered by the date hierarchy field, for example
+    ordering = ('-created',).
+
+    Usage:
+        class MyModelAdmin(KeysetPaginationMixin, admin.ModelAdmin):
+            date_hierarchy = 'created'
+            ordering = ('-created',)
+    """
+    change_list_template = 'django_admin_lightweight_date_hierarchy/change_list.html'
+
+    def get_changelist(self, request: HttpRequest, **kwargs: Any) -> Type[ChangeList]:
+        changelist_class: Type[ChangeList] = super().get_changelist(request, **kwargs)
+        return get_keyset_changelist_class(changelist_class)
+
+
+class EstimatedCountMixin(ModelAdmin):
+    """Estimate the number of results of the change list instead of counting them.
+
+    The count is estimated from the rollup when the date hierarchy drill-down
+    uses the rollup and the change list is filtered only by the date hierarchy,
+    otherwise from the estimate of the planner in PostgreSQL (see
+    pagination.estimate_result_count). Estimates up to
+    date_hierarchy_estimated_count_threshold, list_per_page or
+    list_max_show_all (the largest) are replaced by an exact count.
+
+    Estimated counts are shown as approximate, with a link to count exactly.
+    The total number of rows (show_full_result_count) is not counted.
+
+    Usage:
+        class MyModelAdmin(EstimatedCountMixin, admin.ModelAdmin):
+            date_hierarchy = 'created'
+    """
+    change_list_template = 'django_admin_lightweight_date_hierarchy/change_list.html'
+    show_full_result_count = False
+    date_hierarchy_estimated_count_threshold = 1000
+
+    def get_changelist(self, request: HttpRequest, **kwargs: Any) -> Type[ChangeList]:
+        changelist_class: Type[ChangeList] = super().get_changelist(request, **kwargs)
+        return get_estimated_count_changelist_class(changelist_class)
+
+    def get_paginator(
+        self,
+        request: HttpRequest,
+        queryset: QuerySet,
+        per_page: int,
+        orphans: int = 0,
+        allow_empty_first_page: bool = True,
+    ) -> EstimatedCountPaginator:
+        def estimate() -> Optional[int]:
+            return estimate_result_count(self, request, queryset)
+
+        return EstimatedCountPaginator(
+            queryset,
+            per_page,
+            orphans,
+            allow_empty_first_page,
+            estimate=None if EXACT_COUNT_VAR in request.GET else estimate,
+            threshold=max(self.date_hierarchy_estimated_count_threshold, per_page, self.list_max_show_all),
+        )
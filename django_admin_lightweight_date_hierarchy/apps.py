@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.core import checks
 
 
 class DjangoAdminLightweightDateHierarchyConfig(AppConfig):
     name = 'django_admin_lightweight_date_hierarchy'
     verbose_name = 'Django admin lightweight date hierarchy'
+    default_auto_field = 'django.db.models.AutoField'
+
+    def ready(self) -> None:
+        from .indexes import check_date_hierarchy_indexes
+        from .tracking import connect_tracking_signals
+        connect_tracking_signals()
+        checks.register(check_date_hierarchy_indexes, checks.Tags.database)
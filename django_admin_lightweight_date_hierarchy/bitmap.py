@@ -0,0 +1,267 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+import calendar
+import datetime
+import functools
+import time
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.db import DEFAULT_DB_ALIAS, models, transaction
+from django.utils import timezone
+
+from .admin import get_date_range_lookups_for_hierarchy
+from .cache import CACHE_KEY_PREFIX
+from .drilldown import get_local_date_expression
+from .tracking import DayChangedHandler
+
+
+# One bit for each day of a leap year.
+BITMAP_BYTES_PER_YEAR = (366 + 7) // 8
+
+# Seconds to wait for the lock of the bitmaps, see apply_bitmaps_update.
+BITMAP_LOCK_TIMEOUT = 5
+BITMAP_LOCK_POLL_INTERVAL = 0.01
+
+# Bitmaps of the years of a date hierarchy field, the bit of a day is its day of the year - 1.
+Bitmaps = Dict[int, bytes]
+
+
+def get_bitmap_cache_key(model: Type[models.Model], field_name: str) -> str:
+    return ':'.join((CACHE_KEY_PREFIX, 'bitmap', model._meta.concrete_model._meta.label_lower, field_name))
+
+
+def get_day_bit(day: datetime.date) -> int:
+    return day.timetuple().tm_yday - 1
+
+
+def build_bitmaps(days: Iterable[datetime.date]) -> Bitmaps:
+    """Build the bitmaps of the years of days."""
+    bitmaps: Dict[int, bytearray] = {}
+
+    for day in days:
+        bitmap = bitmaps.setdefault(day.year, bytearray(BITMAP_BYTES_PER_YEAR))
+        bit = get_day_bit(day)
+        bitmap[bit // 8] |= 1 << (bit % 8)
+
+    return {year: bytes(bitmap) for year, bitmap in bitmaps.items()}
+
+
+def rebuild_bitmaps(
+    model: Type[models.Model],
+    field_name: str,
+    using: str = DEFAULT_CACHE_ALIAS,
+    db: str = DEFAULT_DB_ALIAS,
+) -> Bitmaps:
+    """Rebuild the bitmaps of a date hierarchy field from the model's table and store them in the cache.
+
+    Scans the whole table, see the rebuild_date_hierarchy_bitmap management command.
+
+    using:
+        Cache alias.
+    db:
+        Alias of the database to read the table from.
+    """
+    model = model._meta.concrete_model
+
+    days = (
+        model._base_manager
+        .db_manager(db)
+        .filter(**{f'{field_name}__isnull': False})
+        .order_by()
+        .annotate(bitmap_day=get_local_date_expression(model, field_name))
+        .values_list('bitmap_day', flat=True)
+        .distinct()
+    )
+
+    bitmaps = build_bitmaps(days)
+    caches[using].set(get_bitmap_cache_key(model, field_name), bitmaps, None)
+
+    return bitmaps
+
+
+def get_bitmaps(model: Type[models.Model], field_name: str, using: str = DEFAULT_CACHE_ALIAS) -> Optional[Bitmaps]:
+    """Get the bitmaps of a date hierarchy field from the cache.
+
+    Returns:
+        None when the bitmaps are not in the cache. They are not rebuilt on a miss,
+        as it scans the whole table, see rebuild_bitmaps.
+    """
+    bitmaps: Optional[Bitmaps] = caches[using].get(get_bitmap_cache_key(model, field_name))
+    return bitmaps
+
+
+def update_bitmaps(
+    model: Type[models.Model],
+    field_name: str,
+    previous_day: Optional[datetime.date],
+    day: Optional[datetime.date],
+    using: str = DEFAULT_CACHE_ALIAS,
+    db: str = DEFAULT_DB_ALIAS,
+) -> None:
+    """Move a row between days in the bitmaps (see tracking.get_tracked_fields).
+
+    The bitmaps are updated when the transaction is committed, so changes that
+    are rolled back don't affect them. The bit of previous_day is cleared only
+    when there are no more rows on that day. When the bitmaps are not in the
+    cache, they are left to be rebuilt by rebuild_bitmaps.
+
+    using:
+        Cache alias.
+    db:
+        Alias of the database the row was saved to or deleted from.
+    """
+    transaction.on_commit(lambda: apply_bitmaps_update(model, field_name, previous_day, day, using, db), using=db)
+
+
+def apply_bitmaps_update(
+    model: Type[models.Model],
+    field_name: str,
+    previous_day: Optional[datetime.date],
+    day: Optional[datetime.date],
+    using: str = DEFAULT_CACHE_ALIAS,
+    db: str = DEFAULT_DB_ALIAS,
+) -> None:
+    """Move a row between days in the bitmaps, now.
+
+    Updates are serialized using a lock in the cache, so concurrent updates
+    don't overwrite each other. When the lock is not acquired within
+    BITMAP_LOCK_TIMEOUT, the bitmaps are deleted, to be rebuilt by rebuild_bitmaps.
+    """
+    cache = caches[using]
+    key = get_bitmap_cache_key(model, field_name)
+    lock_key = f'{key}:lock'
+
+    deadline = time.monotonic() + BITMAP_LOCK_TIMEOUT
+    while not cache.add(lock_key, 1, BITMAP_LOCK_TIMEOUT):
+        if time.monotonic() >= deadline:
+            cache.delete(key)
+            return
+        time.sleep(BITMAP_LOCK_POLL_INTERVAL)
+
+    try:
+        bitmaps: Optional[Bitmaps] = cache.get(key)
+        if bitmaps is None:
+            return
+
+        changed = False
+
+        if day is not None:
+            bitmap = bytearray(bitmaps.get(day.year, bytes(BITMAP_BYTES_PER_YEAR)))
+            bit = get_day_bit(day)
+            if not bitmap[bit // 8] & 1 << (bit % 8):
+                bitmap[bit // 8] |= 1 << (bit % 8)
+                bitmaps = {**bitmaps, day.year: bytes(bitmap)}
+                changed = True
+
+        if previous_day is not None and previous_day.year in bitmaps:
+            tz = timezone.get_default_timezone() if settings.USE_TZ else None
+            lookups = get_date_range_lookups_for_hierarchy(field_name, {
+                'year': previous_day.year,
+                'month': previous_day.month,
+                'day': previous_day.day,
+            }, tz)
+
+            if not model._base_manager.db_manager(db).filter(**lookups).exists():
+                bitmap = bytearray(bitmaps[previous_day.year])
+                bit = get_day_bit(previous_day)
+                bitmap[bit // 8] &= ~(1 << (bit % 8))
+                bitmaps = {**bitmaps, previous_day.year: bytes(bitmap)}
+                changed = True
+
+        if changed:
+            cache.set(key, bitmaps, None)
+    finally:
+        cache.delete(lock_key)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_bitmap_day_changed_handler(using: str) -> DayChangedHandler:
+    return functools.partial(_on_bitmap_day_changed, using=using)
+
+
+def _on_bitmap_day_changed(
+    model: Type[models.Model],
+    field_name: str,
+    previous_day: Optional[datetime.date],
+    day: Optional[datetime.date],
+    db: str,
+    using: str,
+) -> None:
+    if previous_day == day:
+        return
+
+    update_bitmaps(model, field_name, previous_day, day, using, db)
+
+
+def get_bitmap_day_changed_handler(model_admin: Any) -> DayChangedHandler:
+    """Get the handler maintaining the bitmaps in the cache of model_admin."""
+    return _get_bitmap_day_changed_handler(
+        getattr(model_admin, 'date_hierarchy_drilldown_cache_alias', DEFAULT_CACHE_ALIAS),
+    )
+
+
+def get_change_list_bitmaps(cl: Any) -> Optional[Bitmaps]:
+    return get_bitmaps(
+        cl.model,
+        cl.date_hierarchy,
+        getattr(cl.model_admin, 'date_hierarchy_drilldown_cache_alias', DEFAULT_CACHE_ALIAS),
+    )
+
+
+def query_bitmap_drilldown(
+    cl: Any,
+    year_lookup: Optional[int] = None,
+    month_lookup: Optional[int] = None,
+) -> Optional[List[datetime.date]]:
+    """Get the dates to drill-down to from the bitmaps.
+
+    The bitmaps mark the days with rows in the model, so filters applied to the
+    change list are not taken into account.
+
+    Returns:
+        Dates to drill-down to, None when the bitmaps are not in the cache.
+    """
+    bitmaps = get_change_list_bitmaps(cl)
+    if bitmaps is None:
+        return None
+
+    if year_lookup is None:
+        return [datetime.date(year, 1, 1) for year, bitmap in sorted(bitmaps.items()) if any(bitmap)]
+
+    bits = int.from_bytes(bitmaps.get(year_lookup, b''), 'little')
+
+    if month_lookup is None:
+        months = []
+        for month in range(1, 13):
+            first = datetime.date(year_lookup, month, 1)
+            days_in_month = calendar.monthrange(year_lookup, month)[1]
+            if bits >> get_day_bit(first) & ((1 << days_in_month) - 1):
+                months.append(first)
+        return months
+
+    first = datetime.date(year_lookup, month_lookup, 1)
+    return [
+        first + datetime.timedelta(days=i)
+        for i in range(calendar.monthrange(year_lookup, month_lookup)[1])
+        if bits >> (get_day_bit(first) + i) & 1
+    ]
+
+
+def query_bitmap_bounds(cl: Any) -> Tuple[Optional[datetime.date], Optional[datetime.date]]:
+    """Get the first and last days marked in the bitmaps, None when the bitmaps are not in the cache."""
+    bitmaps = get_change_list_bitmaps(cl) or {}
+    years = [
+        (year, int.from_bytes(bitmap, 'little'))
+        for year, bitmap in sorted(bitmaps.items())
+        if any(bitmap)
+    ]
+    if not years:
+        return None, None
+
+    first_year, first_bits = years[0]
+    last_year, last_bits = years[-1]
+
+    return (
+        datetime.date(first_year, 1, 1) + datetime.timedelta(days=(first_bits & -first_bits).bit_length() - 1),
+        datetime.date(last_year, 1, 1) + datetime.timedelta(days=last_bits.bit_length() - 1),
+    )
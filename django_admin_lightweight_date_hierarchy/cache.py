@@ -0,0 +1,230 @@
+from typing import Any, Callable, List, Optional, Tuple, Type, TypeVar
+import datetime
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, BaseCache, caches
+from django.db import models
+from django.utils import timezone
+from django.utils.http import urlencode
+
+from .instrumentation import record
+from .singleflight import coalesce, compute_with_cache_lock
+
+
+T = TypeVar('T')
+
+CACHE_KEY_PREFIX = 'ldh'
+
+_MISSING = object()
+
+# Version of all the buckets of a date hierarchy field, see get_date_hierarchy_cache_version.
+GENERATION_BUCKET = 'generation'
+
+
+def get_change_list_filters(cl: Any) -> List[Tuple[str, Any]]:
+    """Get the filters applied to a change list, excluding the date hierarchy itself."""
+    field_name: str = cl.date_hierarchy
+
+    return sorted(
+        (param, value)
+        for param, value in cl.get_filters_params().items()
+        if not param.startswith(f'{field_name}__')
+    )
+
+
+def get_date_hierarchy_cache_key(cl: Any, level: str) -> str:
+    """Generate a cache key for a level of the date hierarchy in a change list.
+
+    The key is made of the model, the model admin, the date hierarchy field,
+    the filters applied to the change list (excluding the date hierarchy itself),
+    the level in the hierarchy and the current timezone.
+
+    cl:
+        Admin ChangeList.
+    level:
+        Identifies the level in the hierarchy, for example "2017-01".
+    """
+    field_name: str = cl.date_hierarchy
+    model_admin = type(cl.model_admin)
+
+    digest = hashlib.md5('|'.join((
+        f'{model_admin.__module__}.{model_admin.__qualname__}',
+        urlencode(get_change_list_filters(cl), doseq=True),
+        cl.query,
+    )).encode()).hexdigest()
+
+    tz = timezone.get_current_timezone_name() if settings.USE_TZ else ''
+
+    return ':'.join((
+        CACHE_KEY_PREFIX,
+        cl.model._meta.label_lower,
+        field_name,
+        level,
+        tz,
+        digest,
+    ))
+
+
+def get_version_cache_key(model: Type[models.Model], field_name: str, bucket: str) -> str:
+    return ':'.join((
+        CACHE_KEY_PREFIX,
+        'version',
+        model._meta.concrete_model._meta.label_lower,
+        field_name,
+        bucket,
+    ))
+
+
+def get_level_bucket(level: str) -> Optional[str]:
+    """Get the bucket of the rows a level of the date hierarchy is computed from.
+
+    The months of a year ("2017") are computed from the rows of the year, the
+    days of a month ("2017-1") from the rows of the month, and the years
+    ("all") and the bounds ("bounds") from all the rows ("all").
+
+    Returns:
+        None for levels that are not versioned, such as the estimate of the
+        number of rows.
+    """
+    if level in ('all', 'bounds'):
+        return 'all'
+
+    if level.replace('-', '').isdigit():
+        return level
+
+    return None
+
+
+def get_filtered_bucket(bucket: str) -> str:
+    """Get the bucket of the levels of filtered change lists computed from the rows of bucket.
+
+    The levels of a change list without filters change only when a day gains
+    its first row or loses its last row. The levels of a filtered or searched
+    change list can change on any change of the rows, so they are versioned
+    separately.
+    """
+    return f'filtered:{bucket}'
+
+
+def get_day_buckets(day: datetime.date) -> List[str]:
+    """Get the buckets of the levels affected by a change of the rows in day."""
+    return [f'{day.year}-{day.month}', f'{day.year}', 'all']
+
+
+def get_date_hierarchy_cache_version(
+    cache: BaseCache,
+    model: Type[models.Model],
+    field_name: str,
+    level: str,
+    filtered: bool = False,
+) -> Optional[str]:
+    """Get the version of a level of the date hierarchy in the cache.
+
+    The version is made of the generation of the field and the version of
+    the bucket of the level. Versions missing from the cache are initialized
+    to the current time, so they never match a version that was evicted.
+
+    filtered:
+        True if the level is of a filtered or searched change list
+        (see get_filtered_bucket).
+
+    Returns:
+        None if the level is not versioned.
+    """
+    bucket = get_level_bucket(level)
+    if bucket is None:
+        return None
+
+    if filtered:
+        bucket = get_filtered_bucket(bucket)
+
+    keys = [
+        get_version_cache_key(model, field_name, GENERATION_BUCKET),
+        get_version_cache_key(model, field_name, bucket),
+    ]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+
+    return '.'.join(str(versions[key]) for key in keys)
+
+
+def bump_date_hierarchy_cache_version(
+    cache: BaseCache,
+    model: Type[models.Model],
+    field_name: str,
+    bucket: str,
+) -> None:
+    """Invalidate the cached levels of a bucket by incrementing its version."""
+    key = get_version_cache_key(model, field_name, bucket)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), None)
+
+
+def get_or_set_date_hierarchy_cache(
+    cl: Any,
+    level: str,
+    compute: Callable[[], T],
+    default_timeout: Any = None,
+) -> T:
+    """Get a level of the date hierarchy from the cache, compute it on a miss.
+
+    Caching is enabled by setting date_hierarchy_drilldown_cache_timeout (seconds)
+    on the model admin. The cache to use is set by date_hierarchy_drilldown_cache_alias.
+    When caching is not enabled, the value is always computed.
+
+    When date_hierarchy_drilldown_cache_invalidation is set on the model admin,
+    the levels are versioned, and invalidated when rows change (see invalidation).
+
+    When date_hierarchy_drilldown_single_flight is set on the model admin,
+    identical computations in flight in the process are coalesced. When
+    date_hierarchy_drilldown_lock_timeout (seconds) is also set, and caching
+    is enabled, identical computations in other processes are coalesced
+    using a lock in the cache (see singleflight).
+
+    default_timeout:
+        Timeout to use when not set on the model admin.
+        None to compute the value when caching is not enabled.
+    """
+    model_admin = cl.model_admin
+    single_flight = getattr(model_admin, 'date_hierarchy_drilldown_single_flight', False)
+
+    timeout = getattr(model_admin, 'date_hierarchy_drilldown_cache_timeout', default_timeout)
+    if timeout is None:
+        if single_flight:
+            return coalesce(get_date_hierarchy_cache_key(cl, level), compute)
+        return compute()
+
+    cache = caches[getattr(model_admin, 'date_hierarchy_drilldown_cache_alias', DEFAULT_CACHE_ALIAS)]
+    key = get_date_hierarchy_cache_key(cl, level)
+
+    if getattr(model_admin, 'date_hierarchy_drilldown_cache_invalidation', False):
+        filtered = bool(get_change_list_filters(cl) or cl.query)
+        version = get_date_hierarchy_cache_version(cache, cl.model, cl.date_hierarchy, level, filtered)
+        if version is not None:
+            key = f'{key}:{version}'
+
+    value = cache.get(key, _MISSING)
+    if value is not _MISSING:
+        record(strategy='cached')
+        return value  # type: ignore[no-any-return]
+
+    def compute_and_set() -> T:
+        if single_flight:
+            lock_timeout: Optional[float] = getattr(model_admin, 'date_hierarchy_drilldown_lock_timeout', None)
+            if lock_timeout is not None:
+                return compute_with_cache_lock(cache, key, compute, timeout, lock_timeout)
+
+        value = compute()
+        cache.set(key, value, timeout)
+        return value
+
+    if single_flight:
+        return coalesce(key, compute_and_set)
+    return compute_and_set()
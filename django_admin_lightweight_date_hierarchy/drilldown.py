@@ -0,0 +1,538 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import contextlib
+import datetime
+import json
+import random
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.contrib.admin.utils import get_fields_from_path
+from django.db import DatabaseError, connections, models, transaction
+from django.db.models import QuerySet
+from django.db.models.functions import Trunc, TruncDate
+from django.utils import timezone
+
+from .admin import (
+    DateHierarchy,
+    get_date_range_for_hierarchy,
+    get_date_range_lookups_for_hierarchy,
+    get_first_pk_from_date,
+)
+from .metadata import get_date_hierarchy_metadata
+
+
+# Number of SQLite virtual machine instructions between checks of the timeout.
+SQLITE_PROGRESS_HANDLER_STEPS = 1000
+
+# Number of primary key ranges to sample, see sample_dates.
+SAMPLE_PROBES = 10
+
+# SQLSTATE of a query canceled by statement_timeout in PostgreSQL (query_canceled).
+POSTGRESQL_QUERY_CANCELED = '57014'
+
+# Error codes of a query interrupted by max_execution_time in MySQL (ER_QUERY_TIMEOUT)
+# and by max_statement_time in MariaDB (ER_STATEMENT_TIMEOUT).
+MYSQL_QUERY_TIMEOUT_ERRORS = (3024, 1969)
+
+
+@contextlib.contextmanager
+def statement_timeout(using: str, timeout_ms: Optional[int]) -> Iterator[None]:
+    """Limit the time of queries executed in the block.
+
+    When the timeout is exceeded, the query is canceled and a DatabaseError
+    is raised (see is_statement_timeout). The block is executed in a transaction (or a savepoint), so
+    the connection can be used after the error.
+
+    Supported backends:
+        PostgreSQL - statement_timeout
+        MySQL - max_execution_time (SELECT statements only)
+        MariaDB - max_statement_time
+        SQLite - progress handler
+    On other backends the time of the queries is not limited.
+
+    using:
+        Database alias.
+    timeout_ms:
+        Timeout in milliseconds. None for no timeout.
+    """
+    if timeout_ms is None:
+        yield
+        return
+
+    connection = connections[using]
+    connection.ensure_connection()
+
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SHOW statement_timeout')
+            previous = cursor.fetchone()[0]
+
+        in_transaction = connection.in_atomic_block
+        with transaction.atomic(using=using):
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT set_config('statement_timeout', %s, true)", [str(max(timeout_ms, 1))])
+            yield
+
+            if in_transaction:
+                # The setting is local to the enclosing transaction.
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT set_config('statement_timeout', %s, true)", [previous])
+
+    elif connection.vendor == 'mysql':
+        if connection.mysql_is_mariadb:
+            variable, value = 'max_statement_time', timeout_ms / 1000
+        else:
+            variable, value = 'max_execution_time', max(timeout_ms, 1)
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT @@SESSION.{variable}')
+            previous = cursor.fetchone()[0]
+            cursor.execute(f'SET SESSION {variable} = %s', [value])
+        try:
+            with transaction.atomic(using=using):
+                yield
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute(f'SET SESSION {variable} = %s', [previous])
+
+    elif connection.vendor == 'sqlite':
+        deadline = time.monotonic() + timeout_ms / 1000
+        connection.connection.set_progress_handler(
+            lambda: time.monotonic() > deadline,
+            SQLITE_PROGRESS_HANDLER_STEPS,
+        )
+        try:
+            with transaction.atomic(using=using):
+                yield
+        finally:
+            connection.connection.set_progress_handler(None, 0)
+
+    else:
+        yield
+
+
+def is_statement_timeout(error: DatabaseError) -> bool:
+    """Check if a database error was raised by a query canceled by statement_timeout.
+
+    Other errors, such as errors in the SQL, should not be handled as a timeout.
+    """
+    # Django wraps the error of the database driver.
+    cause = error.__cause__ or error
+
+    if POSTGRESQL_QUERY_CANCELED in (getattr(cause, 'pgcode', None), getattr(cause, 'sqlstate', None)):
+        return True
+
+    if isinstance(cause, sqlite3.OperationalError):
+        return str(cause) == 'interrupted'
+
+    args: Tuple[Any, ...] = getattr(cause, 'args', ())
+    return bool(args) and args[0] in MYSQL_QUERY_TIMEOUT_ERRORS
+
+
+def estimate_count(queryset: QuerySet, limit: int) -> int:
+    """Estimate the number of rows in a queryset.
+
+    In PostgreSQL, the estimate of the planner is used (EXPLAIN). In other
+    databases, the rows are counted up to limit, so the database can stop
+    counting once the limit is reached.
+
+    Returns:
+        Estimated number of rows. When counted, at most limit + 1.
+    """
+    connection = connections[queryset.db]
+
+    if connection.vendor == 'postgresql':
+        sql, params = queryset.order_by().query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    return queryset.order_by()[:limit + 1].count()  # type: ignore[no-any-return]
+
+
+def get_drilldown_timezone(cl: Any) -> Any:
+    """Get the timezone to narrow the drill-down queries to a year or month in.
+
+    The current timezone, as in the date hierarchy of the change list and
+    QuerySet.datetimes. None when USE_TZ is disabled, and for a DateField,
+    which converts aware datetimes to dates in the default timezone, so its
+    range bounds must be naive.
+    """
+    if not settings.USE_TZ or not get_date_hierarchy_metadata(cl.model_admin).is_datetime:
+        return None
+    return timezone.get_current_timezone()
+
+
+def get_local_date(value: Optional[datetime.date], tz: Any = None) -> Optional[datetime.date]:
+    """Get the date of a date or datetime value in tz (default: the default timezone)."""
+    if isinstance(value, datetime.datetime):
+        if settings.USE_TZ and timezone.is_aware(value):
+            local_value: datetime.datetime = timezone.localtime(value, tz or timezone.get_default_timezone())
+            return local_value.date()
+        return value.date()
+
+    return value
+
+
+def get_local_date_expression(model: Any, field_name: str) -> Any:
+    """Get an expression of the date of a date hierarchy field in the default timezone."""
+    field = get_fields_from_path(model, field_name)[-1]
+    if isinstance(field, models.DateTimeField):
+        tz = timezone.get_default_timezone() if settings.USE_TZ else None
+        return TruncDate(field_name, tzinfo=tz)
+
+    return models.F(field_name)
+
+
+def get_drilldown_using(cl: Any) -> Optional[str]:
+    """Get the database alias of the date hierarchy queries of a change list.
+
+    Set date_hierarchy_drilldown_using on the model admin to send the date hierarchy
+    queries to another database, for example a read replica. None to use the
+    database of the change list.
+    """
+    using: Optional[str] = getattr(cl.model_admin, 'date_hierarchy_drilldown_using', None)
+    return using
+
+
+def get_drilldown_queryset(cl: Any) -> QuerySet:
+    """Get the filtered queryset of a change list on the database of the date hierarchy queries."""
+    using = get_drilldown_using(cl)
+    return cl.queryset if using is None else cl.queryset.using(using)
+
+
+def get_drilldown_level(
+    year_lookup: Optional[int] = None,
+    month_lookup: Optional[int] = None,
+) -> Tuple[str, Optional[DateHierarchy]]:
+    """Get the kind of dates to drill-down to from a level of the hierarchy.
+
+    Returns:
+        [0] kind - "year", "month" or "day"
+        [1] date hierarchy of the level - None when no lookup
+    """
+    if year_lookup is None:
+        return 'year', None
+
+    date_hierarchy: DateHierarchy = {'year': year_lookup}
+    if month_lookup is None:
+        return 'month', date_hierarchy
+
+    date_hierarchy['month'] = month_lookup
+    return 'day', date_hierarchy
+
+
+def query_date_hierarchy_drilldown(
+    cl: Any,
+    year_lookup: Optional[int] = None,
+    month_lookup: Optional[int] = None,
+) -> List[datetime.date]:
+    """Query the dates to drill-down to for any level of the hierarchy.
+
+    Performs a query on the filtered queryset of the change list to find
+    the dates for which there is data in the selected level.
+
+    year_lookup:
+        Year lookup.
+        None when no lookup.
+    month_lookup:
+        Month lookup (1-12).
+        None when lookup by year or when no lookup.
+
+    Returns:
+        Dates to drill-down to.
+    """
+    field_name: str = cl.date_hierarchy
+    dates_or_datetimes = 'datetimes' if get_date_hierarchy_metadata(cl.model_admin).is_datetime else 'dates'
+
+    kind, date_hierarchy = get_drilldown_level(year_lookup, month_lookup)
+
+    queryset = get_drilldown_queryset(cl)
+    if date_hierarchy is not None:
+        tz = get_drilldown_timezone(cl)
+        queryset = queryset.filter(**get_date_range_lookups_for_hierarchy(field_name, date_hierarchy, tz))
+
+    return list(getattr(queryset, dates_or_datetimes)(field_name, kind))
+
+
+def query_count_drilldown(
+    cl: Any,
+    year_lookup: Optional[int] = None,
+    month_lookup: Optional[int] = None,
+) -> Dict[datetime.date, int]:
+    """Query the dates to drill-down to and the number of rows in each.
+
+    Like query_date_hierarchy_drilldown, in a single query grouped by the
+    date truncated to the level of the hierarchy.
+
+    Returns:
+        Number of rows in each date to drill-down to, ordered by date.
+    """
+    field_name: str = cl.date_hierarchy
+
+    kind, date_hierarchy = get_drilldown_level(year_lookup, month_lookup)
+
+    queryset = get_drilldown_queryset(cl)
+    if date_hierarchy is not None:
+        tz = get_drilldown_timezone(cl)
+        queryset = queryset.filter(**get_date_range_lookups_for_hierarchy(field_name, date_hierarchy, tz))
+
+    if get_date_hierarchy_metadata(cl.model_admin).is_datetime:
+        # Same as QuerySet.datetimes.
+        trunc = Trunc(field_name, kind, output_field=models.DateTimeField(), tzinfo=get_drilldown_timezone(cl))
+    else:
+        trunc = Trunc(field_name, kind, output_field=models.DateField())
+
+    counts = (
+        queryset
+        .filter(**{f'{field_name}__isnull': False})
+        .order_by()
+        .annotate(ldh_date=trunc)
+        .values('ldh_date')
+        .annotate(ldh_count=models.Count('pk'))
+        .order_by('ldh_date')
+        .values_list('ldh_date', 'ldh_count')
+    )
+
+    return dict(counts)
+
+
+def query_skip_scan_years(cl: Any) -> List[datetime.date]:
+    """Query the years to drill-down to by skipping from one year to the next.
+
+    Finds the first date in the filtered queryset, and then the first date
+    from the start of the following year, until there are no more dates.
+    With an index on the field, each query is a single index lookup, so
+    the number of lookups is the number of years, regardless of the number
+    of rows.
+
+    Returns:
+        First day of each year with data.
+    """
+    field_name: str = cl.date_hierarchy
+    is_datetime = get_date_hierarchy_metadata(cl.model_admin).is_datetime
+    tz = get_drilldown_timezone(cl)
+
+    dates = (
+        get_drilldown_queryset(cl)
+        .filter(**{f'{field_name}__isnull': False})
+        .order_by(field_name)
+        .values_list(field_name, flat=True)
+    )
+
+    years: List[datetime.date] = []
+    first = get_local_date(dates.first(), tz)
+    while first is not None:
+        if years and first.year <= years[-1].year:
+            # The next year bound did not move past the year, stop instead of looping forever.
+            break
+
+        years.append(datetime.date(first.year, 1, 1))
+
+        next_year: datetime.date
+        if is_datetime:
+            _, next_year = get_date_range_for_hierarchy({'year': first.year}, tz)
+        else:
+            next_year = datetime.date(first.year + 1, 1, 1)
+        first = get_local_date(dates.filter(**{f'{field_name}__gte': next_year}).first(), tz)
+
+    return years
+
+
+def query_exists_drilldown(
+    cl: Any,
+    year_lookup: int,
+    month_lookup: Optional[int],
+    candidates: Iterable[datetime.date],
+) -> List[datetime.date]:
+    """Query which of the candidate dates to drill-down to have data.
+
+    Each candidate is checked using an EXISTS subquery on its range, and all
+    the subqueries are executed in a single query. Each subquery can be
+    satisfied by a single index lookup, instead of finding the distinct
+    dates of all the rows in the selected level.
+
+    candidates:
+        Dates to check in the selected level, see default_date_hierarchy_drilldown.
+
+    Returns:
+        Candidate dates with data.
+    """
+    field_name: str = cl.date_hierarchy
+    kind, _ = get_drilldown_level(year_lookup, month_lookup)
+    tz = get_drilldown_timezone(cl)
+
+    candidates = list(candidates)
+    if not candidates:
+        return []
+
+    queryset = get_drilldown_queryset(cl)
+
+    probes = {}
+    for i, candidate in enumerate(candidates):
+        date_hierarchy: DateHierarchy = {'year': candidate.year, 'month': candidate.month}
+        if kind == 'day':
+            date_hierarchy['day'] = candidate.day
+
+        probes[f'drilldown_{i}'] = models.Exists(
+            queryset.filter(**get_date_range_lookups_for_hierarchy(field_name, date_hierarchy, tz)),
+        )
+
+    # The probes are evaluated once, using the first row of the table.
+    results = list(
+        cl.model._base_manager
+        .using(queryset.db)
+        .order_by()
+        .annotate(**probes)
+        .values_list(*probes)[:1]
+    )
+    if not results:
+        return []
+
+    return [candidate for candidate, exists in zip(candidates, results[0]) if exists]
+
+
+def sample_dates(
+    queryset: QuerySet,
+    field_name: str,
+    kind: str,
+    percent: float,
+    date_range: Optional[Tuple[datetime.datetime, datetime.datetime]] = None,
+) -> List[datetime.date]:
+    """Find the dates of a sample of the rows in a queryset.
+
+    In PostgreSQL, the rows are sampled using TABLESAMPLE SYSTEM. In other databases,
+    the rows are sampled from SAMPLE_PROBES primary key ranges at random positions
+    between the first and last primary keys of date_range, covering percent of them.
+    Like get_pk_range_lookups_for_hierarchy, the bounds are found with a single lookup
+    each, assuming the primary key increases with the field. Models with a non-integer
+    primary key are not sampled.
+
+    kind:
+        "year", "month" or "day", see QuerySet.dates.
+    percent:
+        Percent of the rows to sample (0-100).
+    date_range:
+        Range of the field the queryset is narrowed to, see get_date_range_for_hierarchy.
+        None when the queryset is not narrowed.
+    """
+    dates = queryset.dates(field_name, kind)
+    if percent >= 100:
+        return list(dates)
+
+    model = queryset.model
+    connection = connections[queryset.db]
+
+    if connection.vendor == 'postgresql':
+        table = connection.ops.quote_name(model._meta.db_table)
+        sql, params = dates.query.sql_with_params()
+        sampled_sql = sql.replace(f'FROM {table}', f'FROM {table} TABLESAMPLE SYSTEM ({float(percent)!r})', 1)
+        if sampled_sql != sql:
+            with connection.cursor() as cursor:
+                cursor.execute(sampled_sql, params)
+                return [
+                    value.date() if isinstance(value, datetime.datetime) else value
+                    for value, in cursor.fetchall()
+                ]
+
+    if not isinstance(model._meta.pk, models.IntegerField):
+        return list(dates)
+
+    # The range of the primary keys of the selected period.
+    pks = model._base_manager.db_manager(queryset.db).values_list('pk', flat=True)
+    if date_range is None:
+        first = pks.order_by('pk').first()
+        end = None
+    else:
+        first = get_first_pk_from_date(model, field_name, date_range[0], queryset.db)
+        end = get_first_pk_from_date(model, field_name, date_range[1], queryset.db)
+
+    last = end - 1 if end is not None else pks.order_by('-pk').first()
+    if first is None or last is None or last < first:
+        return []
+
+    width = max(1, int((last - first + 1) * percent / 100 / SAMPLE_PROBES))
+    probes = models.Q()
+    for _ in range(SAMPLE_PROBES):
+        start = random.randint(first, max(first, last - width + 1))
+        probes |= models.Q(pk__gte=start, pk__lt=start + width)
+
+    return list(dates.filter(probes))
+
+
+def query_sample_drilldown(
+    cl: Any,
+    year_lookup: Optional[int],
+    month_lookup: Optional[int],
+    candidates: Iterable[datetime.date],
+) -> List[datetime.date]:
+    """Query the dates to drill-down to from a sample of the rows.
+
+    The sampled dates are merged with the candidates between the first and last
+    sampled dates, so sparse periods missed by the sample are not left out. When
+    the sample is empty, for example when the filtered queryset is small, the
+    dates are queried using query_date_hierarchy_drilldown.
+
+    The size of the sample is set by date_hierarchy_drilldown_sample_percent
+    on the model admin (default 1).
+
+    candidates:
+        Dates generated for the selected level, see default_date_hierarchy_drilldown.
+
+    Returns:
+        Dates to drill-down to.
+    """
+    field_name: str = cl.date_hierarchy
+    percent: float = getattr(cl.model_admin, 'date_hierarchy_drilldown_sample_percent', 1)
+
+    kind, date_hierarchy = get_drilldown_level(year_lookup, month_lookup)
+
+    queryset = get_drilldown_queryset(cl)
+    date_range = None
+    if date_hierarchy is not None:
+        date_range = get_date_range_for_hierarchy(date_hierarchy, get_drilldown_timezone(cl))
+        queryset = queryset.filter(**{f'{field_name}__gte': date_range[0], f'{field_name}__lt': date_range[1]})
+
+    sampled = sample_dates(queryset, field_name, kind, percent, date_range)
+    if not sampled:
+        return query_date_hierarchy_drilldown(cl, year_lookup, month_lookup)
+
+    first, last = min(sampled), max(sampled)
+    return sorted(set(sampled) | {candidate for candidate in candidates if first <= candidate <= last})
+
+
+def query_date_hierarchy_bounds(
+    cl: Any,
+    strategy: str,
+) -> Tuple[Optional[datetime.date], Optional[datetime.date]]:
+    """Query the first and last dates in the filtered queryset of the change list.
+
+    strategy:
+        "aggregate" - a single Min/Max aggregate query.
+        "limit" - two queries ordered by the field with LIMIT 1. When the filtered
+            queryset is large, the database can stop at the first matching row
+            of an index on the field instead of scanning all matching rows.
+
+    Returns:
+        [0] first - None if there is no data
+        [1] last - None if there is no data
+    """
+    field_name: str = cl.date_hierarchy
+    queryset = get_drilldown_queryset(cl)
+
+    if strategy == 'aggregate':
+        date_range = queryset.aggregate(first=models.Min(field_name), last=models.Max(field_name))
+        return date_range['first'], date_range['last']
+
+    elif strategy == 'limit':
+        dates = queryset.filter(**{f'{field_name}__isnull': False}).values_list(field_name, flat=True)
+        return dates.order_by(field_name).first(), dates.order_by(f'-{field_name}').first()
+
+    else:
+        raise ImproperlyConfigured(f'Unknown date hierarchy start level strategy "{strategy}"')
@@ -0,0 +1,53 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+import contextvars
+import threading
+
+from django.db import close_old_connections
+from django.utils import timezone, translation
+
+
+T = TypeVar('T')
+
+# Number of threads computing date hierarchies concurrently with the change lists.
+MAX_WORKERS = 4
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Get the thread pool shared by all change lists, created on first use."""
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='ldh')
+        return _executor
+
+
+def submit(fn: Callable[..., T], *args: Any) -> 'Future[T]':
+    """Call fn in a thread of the executor.
+
+    fn is called with the language, the current timezone and the context
+    variables of the calling thread. Its queries are executed using the
+    database connections of the thread, which are reused by the next calls
+    in the thread, and closed when they are unusable or older than
+    CONN_MAX_AGE, as at the start and end of a request.
+    """
+    language = translation.get_language()
+    tz = timezone.get_current_timezone()
+    context = contextvars.copy_context()
+
+    def call() -> T:
+        with translation.override(language), timezone.override(tz):
+            return fn(*args)
+
+    def run() -> T:
+        close_old_connections()
+        try:
+            return context.run(call)
+        finally:
+            close_old_connections()
+
+    return get_executor().submit(run)
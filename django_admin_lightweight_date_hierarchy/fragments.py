@@ -0,0 +1,112 @@
+from typing import Any, Callable, Optional
+import collections
+import datetime
+import functools
+import hashlib
+import threading
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.utils import translation
+from django.utils.safestring import SafeString, mark_safe
+
+from .cache import CACHE_KEY_PREFIX
+from .instrumentation import record
+from .metadata import get_date_hierarchy_metadata
+
+
+class FragmentLRU:
+    """In-process LRU of rendered fragments, safe to use from multiple threads."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.fragments: 'collections.OrderedDict[str, str]' = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self.lock:
+            fragment = self.fragments.get(key)
+            if fragment is not None:
+                self.fragments.move_to_end(key)
+            return fragment
+
+    def set(self, key: str, fragment: str) -> None:
+        with self.lock:
+            self.fragments[key] = fragment
+            self.fragments.move_to_end(key)
+            while len(self.fragments) > self.maxsize:
+                self.fragments.popitem(last=False)
+
+
+@functools.lru_cache(maxsize=None)
+def get_fragment_lru(model_admin: Any) -> FragmentLRU:
+    """Get the LRU of the rendered date hierarchies of a model admin."""
+    return FragmentLRU(model_admin.date_hierarchy_fragment_cache_size)
+
+
+def is_fragment_cache_enabled(model_admin: Any) -> bool:
+    """Check if the rendered date hierarchy of a model admin can be cached.
+
+    Caching is enabled by setting date_hierarchy_fragment_cache_size on the
+    model admin. Only the date hierarchy without drill-down queries is cached
+    (date_hierarchy_drilldown = False), because it does not depend on the data.
+    """
+    if getattr(model_admin, 'date_hierarchy_fragment_cache_size', None) is None:
+        return False
+
+    return get_date_hierarchy_metadata(model_admin).drilldown is False
+
+
+def get_fragment_cache_key(cl: Any, today: datetime.date) -> str:
+    """Generate a cache key for the rendered date hierarchy of a change list.
+
+    Without drill-down queries, the fragment depends only on the model admin,
+    the query string (which includes the level), the language and the current
+    date (the years around it are the choices of the top level).
+    """
+    model_admin = type(cl.model_admin)
+    digest = hashlib.md5('|'.join((
+        f'{model_admin.__module__}.{model_admin.__qualname__}',
+        cl.get_query_string(),
+        translation.get_language() or '',
+        today.isoformat(),
+    )).encode()).hexdigest()
+
+    return ':'.join((
+        CACHE_KEY_PREFIX,
+        'fragment',
+        cl.model._meta.label_lower,
+        digest,
+    ))
+
+
+def get_or_render_fragment(cl: Any, today: datetime.date, render: Callable[[], str]) -> SafeString:
+    """Get the rendered date hierarchy of a change list from the caches, render it on a miss.
+
+    The fragment is looked up in the in-process LRU, and when
+    date_hierarchy_fragment_cache_timeout (seconds) is set on the model admin,
+    in the cache set by date_hierarchy_drilldown_cache_alias.
+    """
+    model_admin = cl.model_admin
+    lru = get_fragment_lru(model_admin)
+    key = get_fragment_cache_key(cl, today)
+
+    fragment = lru.get(key)
+    if fragment is not None:
+        record(strategy='cached')
+        return mark_safe(fragment)
+
+    timeout: Optional[int] = getattr(model_admin, 'date_hierarchy_fragment_cache_timeout', None)
+    cache = caches[getattr(model_admin, 'date_hierarchy_drilldown_cache_alias', DEFAULT_CACHE_ALIAS)]
+
+    if timeout is not None:
+        fragment = cache.get(key)
+
+    if fragment is None:
+        fragment = render()
+        if timeout is not None:
+            cache.set(key, fragment, timeout)
+    else:
+        record(strategy='cached')
+
+    lru.set(key, fragment)
+    return mark_safe(fragment)
@@ -0,0 +1,175 @@
+from typing import Any, Iterator, List, Optional, Sequence, Tuple, Type
+
+from django.contrib.admin.utils import NotRelationField, get_fields_from_path
+from django.core import checks
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections, models, router
+
+from .admin import iter_date_hierarchy_model_admins
+
+
+# Model and field names of an index, for example (Order, ["status", "created"]).
+MissingIndex = Tuple[Type[models.Model], List[str]]
+
+
+def get_index_columns(model: Type[models.Model], using: str) -> Optional[List[List[str]]]:
+    """Introspect the columns of the indexes on the table of model.
+
+    Unique and primary key constraints are included, expressions are not.
+
+    Returns:
+        Columns of each index, in order. None if the table does not exist.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+
+    with connection.cursor() as cursor:
+        if table not in connection.introspection.table_names(cursor):
+            return None
+        constraints = connection.introspection.get_constraints(cursor, table)
+
+    index_columns = []
+    for constraint in constraints.values():
+        if not any(constraint[kind] for kind in ('index', 'unique', 'primary_key')):
+            continue
+        if constraint['columns'] and None not in constraint['columns']:
+            index_columns.append(constraint['columns'])
+
+    return index_columns
+
+
+def is_covered(index_columns: List[List[str]], columns: Sequence[str]) -> bool:
+    """Check if an index starts with columns."""
+    return any(index[:len(columns)] == list(columns) for index in index_columns)
+
+
+def get_list_filter_fields(model_admin: Any, date_field: models.Field) -> List[models.Field]:
+    """Get the fields of list_filter on the model of the date hierarchy field.
+
+    Filters by other models, many-to-many fields, reverse relations and
+    unique fields are excluded. Such filters gain nothing from an index
+    combined with the date hierarchy field.
+    """
+    fields = []
+
+    for list_filter in model_admin.list_filter:
+        if isinstance(list_filter, (tuple, list)):
+            list_filter = list_filter[0]
+        if not isinstance(list_filter, str):
+            continue
+
+        try:
+            field = get_fields_from_path(model_admin.model, list_filter)[-1]
+        except (FieldDoesNotExist, NotRelationField):
+            continue
+
+        if not getattr(field, 'concrete', False) or field.many_to_many or field.unique:
+            continue
+
+        if field.model._meta.concrete_model is not date_field.model._meta.concrete_model:
+            continue
+
+        if field == date_field or field in fields:
+            continue
+
+        fields.append(field)
+
+    return fields
+
+
+def get_missing_date_hierarchy_indexes(model_admin: Any, using: str) -> Optional[List[MissingIndex]]:
+    """Find the indexes missing for the date hierarchy of a model admin.
+
+    The date hierarchy field is resolved across relations, for example
+    "order__created" is the field "created" of the model of "order". An index
+    is missing when no index starts with:
+        - The date hierarchy field.
+        - A field of list_filter on the same model followed by the date
+          hierarchy field (see get_list_filter_fields).
+
+    Returns:
+        Missing indexes. None if the table of the date hierarchy field does not exist.
+    """
+    date_field = get_fields_from_path(model_admin.model, model_admin.date_hierarchy)[-1]
+    model = date_field.model._meta.concrete_model
+
+    index_columns = get_index_columns(model, using)
+    if index_columns is None:
+        return None
+
+    missing: List[MissingIndex] = []
+
+    if not is_covered(index_columns, [date_field.column]):
+        missing.append((model, [date_field.name]))
+
+    for field in get_list_filter_fields(model_admin, date_field):
+        if not is_covered(index_columns, [field.column, date_field.column]):
+            missing.append((model, [field.name, date_field.name]))
+
+    return missing
+
+
+def iter_missing_date_hierarchy_indexes(databases: Sequence[str]) -> Iterator[Tuple[str, Any, MissingIndex]]:
+    """Find the indexes missing for the date hierarchies of model admins in databases.
+
+    Each index is reported once, for the first model admin missing it.
+
+    Yields:
+        [0] database alias
+        [1] model admin
+        [2] missing index
+    """
+    reported = set()
+
+    for using in databases:
+        for model_admin in iter_date_hierarchy_model_admins():
+            try:
+                date_field = get_fields_from_path(model_admin.model, model_admin.date_hierarchy)[-1]
+            except (FieldDoesNotExist, NotRelationField):
+                # Reported by the checks of the admin.
+                continue
+
+            if not router.allow_migrate_model(using, date_field.model):
+                continue
+
+            for model, field_names in get_missing_date_hierarchy_indexes(model_admin, using) or []:
+                key = (using, model, tuple(field_names))
+                if key in reported:
+                    continue
+                reported.add(key)
+
+                yield using, model_admin, (model, field_names)
+
+
+def check_date_hierarchy_indexes(
+    app_configs: Any = None,
+    databases: Optional[Sequence[str]] = None,
+    **kwargs: Any,
+) -> List[checks.CheckMessage]:
+    """Check the indexes of the date hierarchies of model admins.
+
+    A database check, executed only for the databases passed to the check
+    (for example `manage.py check --database default`).
+    """
+    messages: List[checks.CheckMessage] = []
+
+    for using, model_admin, (model, field_names) in iter_missing_date_hierarchy_indexes(databases or []):
+        hint = f'Add models.Index(fields={field_names!r}) to the indexes of {model._meta.label}.'
+        if len(field_names) == 1:
+            messages.append(checks.Warning(
+                f"The date hierarchy field '{model._meta.label}.{field_names[0]}' "
+                f"is not indexed in database '{using}'.",
+                hint=hint,
+                obj=type(model_admin),
+                id='django_admin_lightweight_date_hierarchy.W001',
+            ))
+        else:
+            messages.append(checks.Info(
+                f"The list filter '{field_names[0]}' and the date hierarchy field '{field_names[1]}' "
+                f"of '{model._meta.label}' are not indexed together in database '{using}'.",
+                hint=hint,
+                obj=type(model_admin),
+                id='django_admin_lightweight_date_hierarchy.I001',
+            ))
+
+    return messages
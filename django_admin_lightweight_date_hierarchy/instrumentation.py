@@ -0,0 +1,60 @@
+from typing import Any, Callable, Dict, Iterator, Optional
+import contextlib
+import contextvars
+import time
+
+from django.contrib.admin import ModelAdmin
+from django.db import connections
+
+from .signals import date_hierarchy_measured
+
+
+_current_measurement: 'contextvars.ContextVar[Optional[Dict[str, Any]]]' = contextvars.ContextVar(
+    'ldh_current_measurement',
+    default=None,
+)
+
+
+def record(**info: Any) -> None:
+    """Record information, such as the strategy, in the current measurement (if any)."""
+    measurement = _current_measurement.get()
+    if measurement is not None:
+        measurement.update(info)
+
+
+@contextlib.contextmanager
+def measure(source: str, model_admin: ModelAdmin, using: str) -> Iterator[Dict[str, Any]]:
+    """Measure the queries and wall time of the block, and send date_hierarchy_measured.
+
+    source:
+        "drilldown" or "filter".
+    using:
+        Alias of the database to count queries in.
+
+    Yields:
+        The measurement, to be updated using record().
+    """
+    measurement: Dict[str, Any] = {
+        'source': source,
+        'model_admin': model_admin,
+        'level': None,
+        'strategy': None,
+        'queries': 0,
+        'duration': 0.0,
+        'choices': None,
+    }
+
+    def count_queries(execute: Callable[..., Any], *args: Any) -> Any:
+        measurement['queries'] += 1
+        return execute(*args)
+
+    token = _current_measurement.set(measurement)
+    start = time.perf_counter()
+    try:
+        with connections[using].execute_wrapper(count_queries):
+            yield measurement
+    finally:
+        measurement['duration'] = time.perf_counter() - start
+        _current_measurement.reset(token)
+
+    date_hierarchy_measured.send(sender=type(model_admin), **measurement)
@@ -0,0 +1,152 @@
+from typing import Any, Iterable, Optional, Set, Type
+import datetime
+import functools
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.db import DEFAULT_DB_ALIAS, models, transaction
+from django.utils import timezone
+
+from .admin import get_date_range_lookups_for_hierarchy, iter_date_hierarchy_model_admins
+from .cache import GENERATION_BUCKET, bump_date_hierarchy_cache_version, get_day_buckets, get_filtered_bucket
+from .tracking import DayChangedHandler
+
+
+def has_rows_on_day(
+    model: Type[models.Model],
+    field_name: str,
+    day: datetime.date,
+    limit: int,
+    using: str = DEFAULT_DB_ALIAS,
+) -> bool:
+    """Check if there are more than limit rows of model on day (in the default timezone) in database using."""
+    tz = timezone.get_default_timezone() if settings.USE_TZ else None
+    lookups = get_date_range_lookups_for_hierarchy(field_name, {
+        'year': day.year,
+        'month': day.month,
+        'day': day.day,
+    }, tz)
+
+    rows: int = model._base_manager.db_manager(using).filter(**lookups)[:limit + 1].count()
+    return rows > limit
+
+
+def invalidate_buckets(
+    using: str,
+    model: Type[models.Model],
+    field_name: str,
+    buckets: Iterable[str],
+    db: str = DEFAULT_DB_ALIAS,
+) -> None:
+    """Invalidate the cached levels of the buckets when the transaction of database db is committed.
+
+    Invalidating after the commit prevents caching the levels again from data
+    that is about to change.
+
+    using:
+        Cache alias.
+    """
+    cache = caches[using]
+    buckets = list(buckets)
+
+    def invalidate() -> None:
+        for bucket in buckets:
+            bump_date_hierarchy_cache_version(cache, model, field_name, bucket)
+
+    transaction.on_commit(invalidate, using=db)
+
+
+def invalidate_date_hierarchy_cache(
+    model: Type[models.Model],
+    days: Optional[Iterable[datetime.date]] = None,
+    using: str = DEFAULT_DB_ALIAS,
+) -> None:
+    """Invalidate the cached date hierarchy of model after a bulk operation.
+
+    Signals are not sent by bulk_create, update and raw SQL, so call this after
+    them for the model admins with date_hierarchy_drilldown_cache_invalidation.
+
+    days:
+        The days (in the default timezone) of the changed rows.
+        None to invalidate all the levels.
+    using:
+        Alias of the database of the bulk operation. The levels are invalidated
+        when its transaction is committed.
+    """
+    model = model._meta.concrete_model
+    days = list(days) if days is not None else None
+    invalidated = set()
+
+    for model_admin in iter_date_hierarchy_model_admins():
+        if not getattr(model_admin, 'date_hierarchy_drilldown_cache_invalidation', False):
+            continue
+        if model_admin.model._meta.concrete_model is not model or '__' in model_admin.date_hierarchy:
+            continue
+
+        cache_alias = getattr(model_admin, 'date_hierarchy_drilldown_cache_alias', DEFAULT_CACHE_ALIAS)
+        key = (cache_alias, model_admin.date_hierarchy)
+        if key in invalidated:
+            continue
+        invalidated.add(key)
+
+        buckets: Set[str] = set()
+        if days is None:
+            buckets.add(GENERATION_BUCKET)
+        else:
+            for day in days:
+                for bucket in get_day_buckets(day):
+                    buckets.update((bucket, get_filtered_bucket(bucket)))
+
+        invalidate_buckets(cache_alias, model, model_admin.date_hierarchy, buckets, using)
+
+
+def _on_cache_day_changed(
+    model: Type[models.Model],
+    field_name: str,
+    previous_day: Optional[datetime.date],
+    day: Optional[datetime.date],
+    db: str,
+    using: str,
+    counts: bool,
+) -> None:
+    buckets: Set[str] = set()
+
+    if previous_day == day:
+        # The days of the change lists without filters are unchanged.
+        if day is not None:
+            buckets.update(get_filtered_bucket(bucket) for bucket in get_day_buckets(day))
+        invalidate_buckets(using, model, field_name, buckets, db)
+        return
+
+    # The levels of filtered change lists may change on any change of the rows.
+    # Unless counted, the levels without filters change only when a day gains
+    # its first row or loses its last row.
+    if previous_day is not None:
+        day_buckets = get_day_buckets(previous_day)
+        buckets.update(get_filtered_bucket(bucket) for bucket in day_buckets)
+        if counts or not has_rows_on_day(model, field_name, previous_day, 0, db):
+            buckets.update(day_buckets)
+
+    if day is not None:
+        day_buckets = get_day_buckets(day)
+        buckets.update(get_filtered_bucket(bucket) for bucket in day_buckets)
+        if counts or not has_rows_on_day(model, field_name, day, 1, db):
+            buckets.update(day_buckets)
+
+    invalidate_buckets(using, model, field_name, buckets, db)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_cache_day_changed_handler(using: str, counts: bool) -> DayChangedHandler:
+    return functools.partial(_on_cache_day_changed, using=using, counts=counts)
+
+
+def get_cache_day_changed_handler(model_admin: Any) -> DayChangedHandler:
+    """Get the handler invalidating the cached date hierarchy of model_admin (see tracking.get_tracked_fields).
+
+    Only the levels of the year and month of the changed days are invalidated.
+    """
+    return _get_cache_day_changed_handler(
+        getattr(model_admin, 'date_hierarchy_drilldown_cache_alias', DEFAULT_CACHE_ALIAS),
+        getattr(model_admin, 'date_hierarchy_drilldown', True) == 'count',
+    )
@@ -0,0 +1,34 @@
+from typing import Any, Dict, List
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import DEFAULT_DB_ALIAS
+
+from ...indexes import iter_missing_date_hierarchy_indexes
+
+
+class Command(BaseCommand):
+    help = 'Find the indexes missing for the date hierarchies of model admins.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='Database to introspect. Defaults to the "default" database.',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        missing: Dict[str, List[str]] = {}
+
+        for _, model_admin, (model, field_names) in iter_missing_date_hierarchy_indexes([options['database']]):
+            missing.setdefault(model._meta.label, []).append(
+                f'models.Index(fields={field_names!r}),  # {type(model_admin).__qualname__}'
+            )
+
+        if not missing:
+            self.stdout.write('No missing indexes.')
+            return
+
+        for label, indexes in missing.items():
+            self.stdout.write(f'{label}.Meta.indexes:')
+            for index in indexes:
+                self.stdout.write(f'    {index}')
@@ -0,0 +1,43 @@
+from typing import Any
+
+from django.core.cache import DEFAULT_CACHE_ALIAS
+from django.db import DEFAULT_DB_ALIAS
+from django.core.management.base import BaseCommand, CommandParser
+
+from ...admin import iter_date_hierarchy_model_admins
+from ...bitmap import rebuild_bitmaps
+
+
+class Command(BaseCommand):
+    help = "Rebuild the bitmaps of model admins with date_hierarchy_drilldown = 'bitmap'."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            'models',
+            nargs='*',
+            metavar='app_label.ModelName',
+            help='Rebuild only the bitmaps of these models.',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        labels = {label.lower() for label in options['models']}
+        rebuilt = set()
+
+        for model_admin in iter_date_hierarchy_model_admins():
+            if getattr(model_admin, 'date_hierarchy_drilldown', True) != 'bitmap':
+                continue
+
+            model = model_admin.model._meta.concrete_model
+            if labels and not {model._meta.label_lower, model_admin.model._meta.label_lower} & labels:
+                continue
+
+            using = getattr(model_admin, 'date_hierarchy_drilldown_cache_alias', DEFAULT_CACHE_ALIAS)
+            key = (model, model_admin.date_hierarchy, using)
+            if key in rebuilt:
+                continue
+            rebuilt.add(key)
+
+            db = getattr(model_admin, 'date_hierarchy_drilldown_using', None) or DEFAULT_DB_ALIAS
+            bitmaps = rebuild_bitmaps(model, model_admin.date_hierarchy, using, db)
+            days = sum(bin(int.from_bytes(bitmap, 'little')).count('1') for bitmap in bitmaps.values())
+            self.stdout.write(f'{model._meta.label}.{model_admin.date_hierarchy}: {days} days')
@@ -0,0 +1,38 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from ...admin import iter_date_hierarchy_model_admins
+from ...rollup import rebuild_rollup
+
+
+class Command(BaseCommand):
+    help = "Rebuild the rollup of model admins with date_hierarchy_drilldown = 'rollup'."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            'models',
+            nargs='*',
+            metavar='app_label.ModelName',
+            help='Rebuild only the rollup of these models.',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        labels = {label.lower() for label in options['models']}
+        rebuilt = set()
+
+        for model_admin in iter_date_hierarchy_model_admins():
+            if getattr(model_admin, 'date_hierarchy_drilldown', True) != 'rollup':
+                continue
+
+            model = model_admin.model._meta.concrete_model
+            if labels and not {model._meta.label_lower, model_admin.model._meta.label_lower} & labels:
+                continue
+
+            key = (model, model_admin.date_hierarchy)
+            if key in rebuilt:
+                continue
+            rebuilt.add(key)
+
+            days = rebuild_rollup(model, model_admin.date_hierarchy)
+            self.stdout.write(f'{model._meta.label}.{model_admin.date_hierarchy}: {days} days')
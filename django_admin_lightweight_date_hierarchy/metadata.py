@@ -0,0 +1,47 @@
+from typing import Any, Dict
+import functools
+import re
+
+from django.contrib.admin.utils import get_fields_from_path
+from django.db import models
+
+
+class DateHierarchyMetadata:
+    """Metadata of the date hierarchy of a model admin.
+
+    Resolved once per model admin, see get_date_hierarchy_metadata.
+
+    field_name:
+        The date_hierarchy of the model admin, for example "order__created".
+    field:
+        The model field of field_name, resolved across relations.
+    is_datetime:
+        True if the field is a DateTimeField, False if it is a DateField.
+    lookups:
+        Query string parameter of each period, for example {"year": "created__year"}.
+    param_re:
+        Matches the query string parameters of the periods, group 1 is the period.
+    drilldown:
+        The date_hierarchy_drilldown of the model admin.
+    """
+
+    def __init__(self, model_admin: Any) -> None:
+        self.field_name: str = model_admin.date_hierarchy
+        self.field: models.Field = get_fields_from_path(model_admin.model, self.field_name)[-1]
+        self.is_datetime = isinstance(self.field, models.DateTimeField)
+        self.lookups: Dict[str, str] = {
+            period: f'{self.field_name}__{period}'
+            for period in ('year', 'month', 'day')
+        }
+        self.param_re = re.compile(fr'^{re.escape(self.field_name)}__(day|month|year)$')
+        self.drilldown: Any = getattr(model_admin, 'date_hierarchy_drilldown', True)
+
+
+@functools.lru_cache(maxsize=None)
+def get_date_hierarchy_metadata(model_admin: Any) -> DateHierarchyMetadata:
+    """Get the metadata of the date hierarchy of a model admin.
+
+    Computed on first use and kept for the lifetime of the model admin, so
+    the date hierarchy must not change after the model admin is registered.
+    """
+    return DateHierarchyMetadata(model_admin)
@@ -0,0 +1,66 @@
+from typing import Any, Callable, Dict, List, Optional
+import contextvars
+
+from django.http import HttpRequest, HttpResponse
+
+from .signals import date_hierarchy_measured
+
+
+_request_measurements: 'contextvars.ContextVar[Optional[List[Dict[str, Any]]]]' = contextvars.ContextVar(
+    'ldh_request_measurements',
+    default=None,
+)
+
+
+def _collect_measurement(sender: Any, **measurement: Any) -> None:
+    measurements = _request_measurements.get()
+    if measurements is not None:
+        measurements.append(measurement)
+
+
+date_hierarchy_measured.connect(_collect_measurement, dispatch_uid='ldh_server_timing')
+
+
+class DateHierarchyServerTimingMiddleware:
+    """Add the measurements of the date hierarchy to the Server-Timing header.
+
+    For example:
+
+        Server-Timing: ldh-drilldown;dur=12.3;desc="query month, 1 queries, 12 choices"
+
+    Usage:
+        MIDDLEWARE = [
+            ...
+            'django_admin_lightweight_date_hierarchy.middleware.DateHierarchyServerTimingMiddleware',
+        ]
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        measurements: List[Dict[str, Any]] = []
+        token = _request_measurements.set(measurements)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_measurements.reset(token)
+
+        if measurements:
+            server_timing = ', '.join(
+                self.format_measurement(measurement)
+                for measurement in measurements
+            )
+            if response.has_header('Server-Timing'):
+                server_timing = f'{response["Server-Timing"]}, {server_timing}'
+            response['Server-Timing'] = server_timing
+
+        return response
+
+    def format_measurement(self, measurement: Dict[str, Any]) -> str:
+        description = ' '.join(str(info) for info in (measurement['strategy'], measurement['level']) if info)
+        description += f', {measurement["queries"]} queries'
+        if measurement['choices'] is not None:
+            description += f', {measurement["choices"]} choices'
+
+        return f'ldh-{measurement["source"]};dur={measurement["duration"] * 1000:.1f};desc="{description}"'
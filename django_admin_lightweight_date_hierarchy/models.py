@@ -0,0 +1,22 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+
+
+class DateHierarchyRollup(models.Model):
+    """Number of rows per day in a date hierarchy field of a model.
+
+    Used by date_hierarchy_drilldown = 'rollup' to find the dates to drill-down to
+    without querying the model's table.
+    """
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    field_name = models.CharField(max_length=255)
+    day = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = (
+            ('content_type', 'field_name', 'day'),
+        )
+
+    def __str__(self) -> str:
+        return f'{self.content_type} {self.field_name} {self.day:%Y-%m-%d}: {self.count}'
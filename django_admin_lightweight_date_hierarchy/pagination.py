@@ -0,0 +1,382 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type
+import datetime
+
+from django.contrib.admin import ModelAdmin
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ERROR_FLAG, IGNORED_PARAMS, PAGE_VAR, SEARCH_VAR, ChangeList
+from django.core.exceptions import ValidationError
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections, models
+from django.http import HttpRequest
+from django.utils.translation import gettext as _
+
+from .metadata import get_date_hierarchy_metadata
+
+
+AFTER_VAR = '_after'
+BEFORE_VAR = '_before'
+EXACT_COUNT_VAR = '_exact_count'
+
+
+def encode_cursor(value: datetime.date, pk: Any) -> str:
+    """Encode the position of a row in the change list."""
+    return f'{value.isoformat()}_{pk}'
+
+
+def decode_cursor(model: Type[models.Model], field_name: str, cursor: str) -> Tuple[datetime.date, Any]:
+    """Decode a position encoded by encode_cursor.
+
+    Raises:
+        IncorrectLookupParameters - The cursor is invalid.
+    """
+    value, _, pk = cursor.partition('_')
+
+    try:
+        return model._meta.get_field(field_name).to_python(value), model._meta.pk.to_python(pk)
+    except ValidationError as e:
+        raise IncorrectLookupParameters(e)
+
+
+def get_keyset_ordering(
+    ordering: Sequence[Any],
+    field_name: str,
+    model: Type[models.Model],
+) -> Optional[Tuple[bool, bool]]:
+    """Check if a change list ordering can be paginated using a keyset.
+
+    The ordering must be the date hierarchy field followed by the primary key,
+    for example ["-created", "-pk"].
+
+    Returns:
+        [0] True if the field is descending
+        [1] True if the primary key is descending
+        None if the ordering is not supported.
+    """
+    if not all(isinstance(o, str) for o in ordering):
+        return None
+
+    pk_names = ('pk', model._meta.pk.name, model._meta.pk.attname)
+
+    # Repeated fields don't affect the ordering.
+    directions: Dict[str, bool] = {}
+    for o in ordering:
+        name = o.lstrip('-')
+        directions.setdefault('pk' if name in pk_names else name, o.startswith('-'))
+
+    if list(directions) != [field_name, 'pk']:
+        return None
+
+    field_descending, pk_descending = directions.values()
+
+    return field_descending, pk_descending
+
+
+def get_seek_filter(
+    field_name: str,
+    keyset_ordering: Tuple[bool, bool],
+    value: datetime.date,
+    pk: Any,
+    after: bool,
+) -> models.Q:
+    """Generate a filter of the rows after (or before) the position (value, pk) in the ordering."""
+    field_descending, pk_descending = keyset_ordering
+    field_lookup = 'lt' if field_descending == after else 'gt'
+    pk_lookup = 'lt' if pk_descending == after else 'gt'
+
+    return models.Q(**{f'{field_name}__{field_lookup}': value}) | models.Q(**{
+        field_name: value,
+        f'pk__{pk_lookup}': pk,
+    })
+
+
+def get_keyset_changelist_class(changelist_class: Type[ChangeList]) -> Type[ChangeList]:
+    """Get a subclass of changelist_class paginated using a keyset on (date hierarchy field, pk).
+
+    Instead of OFFSET, the pages following the first are found by seeking past
+    the last row of the previous page (the _after parameter), or before the
+    first row of the next page (the _before parameter). The cost of a page
+    does not depend on how deep it is.
+
+    The keyset is used only when the change list is ordered by the date hierarchy
+    field and then the primary key, the field is a non-nullable field of the model
+    and the page is not selected using the page number. Otherwise, the change list
+    is paginated using OFFSET.
+    """
+
+    class KeysetChangeList(changelist_class):
+        result_list: Any
+        can_show_all: bool
+        multi_page: bool
+        keyset_pagination = False
+        keyset_previous_url: Optional[str] = None
+        keyset_next_url: Optional[str] = None
+
+        def get_filters_params(self, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+            lookup_params: Dict[str, Any] = super().get_filters_params(params)
+            lookup_params.pop(AFTER_VAR, None)
+            lookup_params.pop(BEFORE_VAR, None)
+            return lookup_params
+
+        def get_query_string(
+            self,
+            new_params: Optional[Dict[str, Any]] = None,
+            remove: Optional[List[str]] = None,
+        ) -> str:
+            # Links to other filters and orderings start from the first page.
+            new_params = new_params or {}
+            if AFTER_VAR not in new_params and BEFORE_VAR not in new_params:
+                remove = [*(remove or []), AFTER_VAR, BEFORE_VAR]
+            query_string: str = super().get_query_string(new_params, remove)
+            return query_string
+
+        def get_cursor_url(self, var: str, row: models.Model) -> str:
+            cursor = encode_cursor(getattr(row, self.date_hierarchy), row.pk)
+            return self.get_query_string({var: cursor}, [AFTER_VAR, BEFORE_VAR, PAGE_VAR])
+
+        def get_keyset_ordering(self, request: HttpRequest) -> Optional[Tuple[bool, bool]]:
+            if not self.date_hierarchy or '__' in self.date_hierarchy or PAGE_VAR in request.GET:
+                return None
+
+            if self.model._meta.get_field(self.date_hierarchy).null:
+                return None
+
+            return get_keyset_ordering(self.get_ordering(request, self.queryset), self.date_hierarchy, self.model)
+
+        def get_results(self, request: HttpRequest) -> None:
+            keyset_ordering = self.get_keyset_ordering(request)
+            after = request.GET.get(AFTER_VAR)
+            before = request.GET.get(BEFORE_VAR)
+
+            if keyset_ordering is None or self.show_all or not (after or before):
+                super().get_results(request)
+
+                if keyset_ordering is not None and self.multi_page and not (self.show_all and self.can_show_all):
+                    self.keyset_pagination = True
+                    self.result_list = list(self.result_list)
+                    if self.result_list:
+                        self.keyset_next_url = self.get_cursor_url(AFTER_VAR, self.result_list[-1])
+                return
+
+            value, pk = decode_cursor(self.model, self.date_hierarchy, after or before)
+            seek = get_seek_filter(self.date_hierarchy, keyset_ordering, value, pk, after=bool(after))
+            queryset = self.queryset.filter(seek)
+            if before:
+                queryset = queryset.reverse()
+            rows = list(queryset[:self.list_per_page + 1])
+
+            has_more = len(rows) > self.list_per_page
+            rows = rows[:self.list_per_page]
+            if before:
+                rows.reverse()
+
+            if rows and (before or has_more):
+                self.keyset_next_url = self.get_cursor_url(AFTER_VAR, rows[-1])
+            if rows and (after or has_more):
+                self.keyset_previous_url = self.get_cursor_url(BEFORE_VAR, rows[0])
+
+            paginator = self.model_admin.get_paginator(request, self.queryset, self.list_per_page)
+            self.result_count = paginator.count
+            self.show_full_result_count = self.model_admin.show_full_result_count
+            self.full_result_count = self.root_queryset.count() if self.show_full_result_count else None
+            self.show_admin_actions = not self.show_full_result_count or bool(self.full_result_count)
+            self.result_list = rows
+            self.can_show_all = False
+            self.multi_page = True
+            self.paginator = paginator
+            self.keyset_pagination = True
+
+    return KeysetChangeList
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator counting the objects using an estimate.
+
+    The estimate is only displayed, it does not bound the pages. Pages past
+    the estimate are served as long as they have objects, and a full page is
+    followed by another one, so an estimate that is too low (for example from
+    a stale rollup) does not hide objects.
+
+    estimate:
+        Called to estimate the number of objects. Returns None when there is no
+        estimate.
+    threshold:
+        Estimates up to threshold are replaced by an exact count. Counting a
+        small number of objects is cheap. The threshold should be at least the
+        number of objects that can be shown in a single page, so an estimate
+        that is too low never shows all the objects in a single page.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        estimate: Optional[Callable[[], Optional[int]]] = None,
+        threshold: int = 0,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.estimate = estimate
+        self.threshold = threshold
+        self._count: Optional[int] = None
+        self._estimated = False
+        self._last_page = 1
+
+    def _count_objects(self) -> int:
+        if self._count is None:
+            estimate = self.estimate() if self.estimate is not None else None
+            if estimate is not None and estimate > self.threshold:
+                self._estimated = True
+                self._count = estimate
+            else:
+                self._count = super().count
+        return self._count
+
+    @property
+    def count(self) -> int:
+        return self._count_objects()
+
+    @property
+    def estimated(self) -> bool:
+        """True if count is an estimate."""
+        self._count_objects()
+        return self._estimated
+
+    @property
+    def num_pages(self) -> int:
+        num_pages: int = super().num_pages
+        if self.estimated:
+            return max(num_pages, self._last_page)
+        return num_pages
+
+    def validate_number(self, number: Any) -> int:
+        if not self.estimated:
+            validated: int = super().validate_number(number)
+            return validated
+
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            page_number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(_('That page number is not an integer'))
+        if page_number < 1:
+            raise EmptyPage(_('That page number is less than 1'))
+        return page_number
+
+    def page(self, number: Any) -> Page:
+        if not self.estimated:
+            return super().page(number)
+
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        object_list = list(self.object_list[bottom:bottom + self.per_page])
+        if not object_list and number > 1:
+            raise EmptyPage(_('That page contains no results'))
+
+        self._last_page = max(self._last_page, number + 1 if len(object_list) == self.per_page else number)
+        page: Page = self._get_page(object_list, number, self)
+        return page
+
+
+def get_date_hierarchy_only_filter(model_admin: ModelAdmin, request: HttpRequest) -> Optional[Dict[str, int]]:
+    """Get the date hierarchy of a change list request filtered only by the date hierarchy.
+
+    Returns:
+        Date hierarchy, for example {"year": 2017, "month": 1}. Empty for no filter.
+        None if the change list is searched or filtered by other params.
+    """
+    if request.GET.get(SEARCH_VAR):
+        return None
+
+    date_hierarchy_field_re = get_date_hierarchy_metadata(model_admin).param_re
+    not_filters = (*IGNORED_PARAMS, PAGE_VAR, ERROR_FLAG, AFTER_VAR, BEFORE_VAR, EXACT_COUNT_VAR)
+
+    date_hierarchy: Dict[str, int] = {}
+    for param, value in request.GET.items():
+        if param in not_filters:
+            continue
+
+        match = date_hierarchy_field_re.match(param)
+        if not match:
+            return None
+
+        try:
+            date_hierarchy[match.group(1)] = int(value)
+        except ValueError:
+            return None
+
+    if date_hierarchy:
+        try:
+            datetime.date(date_hierarchy['year'], date_hierarchy.get('month', 1), date_hierarchy.get('day', 1))
+        except (KeyError, ValueError):
+            return None
+
+        if 'day' in date_hierarchy and 'month' not in date_hierarchy:
+            return None
+
+    return date_hierarchy
+
+
+def estimate_result_count(model_admin: ModelAdmin, request: HttpRequest, queryset: models.QuerySet) -> Optional[int]:
+    """Estimate the number of rows in the change list of a request.
+
+    When the date hierarchy drill-down uses the rollup and the change list is
+    filtered only by the date hierarchy, the rows in the selected range are
+    counted from the rollup. The rollup counts all the rows of the model, so
+    filters applied in get_queryset are not taken into account.
+
+    Otherwise, in PostgreSQL the estimate of the planner is used.
+
+    Returns:
+        Estimated number of rows, None if there is no estimate.
+    """
+    from .drilldown import estimate_count
+    from .rollup import query_rollup_count
+
+    if get_date_hierarchy_metadata(model_admin).drilldown == 'rollup':
+        date_hierarchy = get_date_hierarchy_only_filter(model_admin, request)
+        if date_hierarchy is not None:
+            return query_rollup_count(model_admin.model, model_admin.date_hierarchy, date_hierarchy, queryset.db)
+
+    if connections[queryset.db].vendor == 'postgresql':
+        return estimate_count(queryset, 0)
+
+    return None
+
+
+def get_estimated_count_changelist_class(changelist_class: Type[ChangeList]) -> Type[ChangeList]:
+    """Get a subclass of changelist_class that flags estimated result counts.
+
+    The count is estimated by the paginator (see EstimatedCountPaginator),
+    and an exact count is requested using the _exact_count parameter.
+    """
+
+    class EstimatedCountChangeList(changelist_class):
+        paginator: Any
+        result_count_estimated = False
+        exact_count_url: Optional[str] = None
+
+        def get_filters_params(self, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+            lookup_params: Dict[str, Any] = super().get_filters_params(params)
+            lookup_params.pop(EXACT_COUNT_VAR, None)
+            return lookup_params
+
+        def get_query_string(
+            self,
+            new_params: Optional[Dict[str, Any]] = None,
+            remove: Optional[List[str]] = None,
+        ) -> str:
+            # Links to other pages keep counting exactly, links to other filters are estimated again.
+            new_params = new_params or {}
+            if not {EXACT_COUNT_VAR, PAGE_VAR, AFTER_VAR, BEFORE_VAR} & set(new_params):
+                remove = [*(remove or []), EXACT_COUNT_VAR]
+            query_string: str = super().get_query_string(new_params, remove)
+            return query_string
+
+        def get_results(self, request: HttpRequest) -> None:
+            super().get_results(request)
+
+            if getattr(self.paginator, 'estimated', False):
+                self.result_count_estimated = True
+                self.exact_count_url = self.get_query_string({EXACT_COUNT_VAR: 1})
+
+    return EstimatedCountChangeList
@@ -0,0 +1,147 @@
+from typing import Any, Dict, List, Optional, Tuple, Type
+import datetime
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, models, transaction
+
+from .admin import get_date_range_for_hierarchy
+from .drilldown import get_drilldown_level, get_drilldown_using, get_local_date_expression
+from .models import DateHierarchyRollup
+
+
+def update_rollup(
+    model: Type[models.Model],
+    field_name: str,
+    day: Optional[datetime.date],
+    delta: int,
+    using: str = DEFAULT_DB_ALIAS,
+) -> None:
+    """Add delta to the number of rows of model in day, in the rollup of database using."""
+    if day is None or delta == 0:
+        return
+
+    content_type = ContentType.objects.get_for_model(model)
+    rollup = DateHierarchyRollup.objects.using(using).filter(content_type=content_type, field_name=field_name, day=day)
+
+    if delta > 0:
+        if rollup.update(count=models.F('count') + delta):
+            return
+
+        try:
+            with transaction.atomic(using=using):
+                DateHierarchyRollup.objects.using(using).create(
+                    content_type=content_type,
+                    field_name=field_name,
+                    day=day,
+                    count=delta,
+                )
+        except IntegrityError:
+            # Created concurrently.
+            rollup.update(count=models.F('count') + delta)
+
+    else:
+        if not rollup.filter(count__lte=-delta).delete()[0]:
+            rollup.update(count=models.F('count') + delta)
+
+
+def rebuild_rollup(model: Type[models.Model], field_name: str) -> int:
+    """Rebuild the rollup of a date hierarchy field from the model's table.
+
+    Returns:
+        Number of days in the rollup.
+    """
+    model = model._meta.concrete_model
+    content_type = ContentType.objects.get_for_model(model)
+
+    days = (
+        model._base_manager
+        .filter(**{f'{field_name}__isnull': False})
+        .order_by()
+        .annotate(rollup_day=get_local_date_expression(model, field_name))
+        .values('rollup_day')
+        .annotate(rollup_count=models.Count('pk'))
+        .values_list('rollup_day', 'rollup_count')
+    )
+
+    with transaction.atomic():
+        DateHierarchyRollup.objects.filter(content_type=content_type, field_name=field_name).delete()
+        rollups = DateHierarchyRollup.objects.bulk_create([
+            DateHierarchyRollup(content_type=content_type, field_name=field_name, day=day, count=count)
+            for day, count in days
+        ], batch_size=1000)
+
+    return len(rollups)
+
+
+def query_rollup_drilldown(
+    cl: Any,
+    year_lookup: Optional[int] = None,
+    month_lookup: Optional[int] = None,
+) -> List[datetime.date]:
+    """Query the dates to drill-down to from the rollup.
+
+    The rollup counts all the rows of the model, so filters applied to the
+    change list are not taken into account.
+    """
+    field_name: str = cl.date_hierarchy
+    content_type = ContentType.objects.get_for_model(cl.model)
+
+    rollup = DateHierarchyRollup.objects.db_manager(get_drilldown_using(cl)).filter(
+        content_type=content_type,
+        field_name=field_name,
+    )
+
+    kind, date_hierarchy = get_drilldown_level(year_lookup, month_lookup)
+    if date_hierarchy is not None:
+        from_date, to_date = get_date_range_for_hierarchy(date_hierarchy, None)
+        rollup = rollup.filter(day__gte=from_date.date(), day__lt=to_date.date())
+
+    return list(rollup.dates('day', kind))
+
+
+def query_rollup_bounds(cl: Any) -> Tuple[Optional[datetime.date], Optional[datetime.date]]:
+    """Query the first and last days in the rollup."""
+    content_type = ContentType.objects.get_for_model(cl.model)
+    date_range = DateHierarchyRollup.objects.db_manager(get_drilldown_using(cl)).filter(
+        content_type=content_type,
+        field_name=cl.date_hierarchy,
+    ).aggregate(first=models.Min('day'), last=models.Max('day'))
+
+    return date_range['first'], date_range['last']
+
+
+def query_rollup_count(
+    model: Type[models.Model],
+    field_name: str,
+    date_hierarchy: Dict[str, int],
+    using: str,
+) -> int:
+    """Count the rows of model in a date hierarchy from the rollup.
+
+    date_hierarchy:
+        For example {"year": 2017, "month": 1}. Empty to count all the rows.
+    """
+    content_type = ContentType.objects.get_for_model(model)
+    rollup = DateHierarchyRollup.objects.db_manager(using).filter(content_type=content_type, field_name=field_name)
+
+    if date_hierarchy:
+        from_date, to_date = get_date_range_for_hierarchy(date_hierarchy, None)  # type: ignore[arg-type]
+        rollup = rollup.filter(day__gte=from_date.date(), day__lt=to_date.date())
+
+    count: Optional[int] = rollup.aggregate(count=models.Sum('count'))['count']
+    return count or 0
+
+
+def on_rollup_day_changed(
+    model: Type[models.Model],
+    field_name: str,
+    previous_day: Optional[datetime.date],
+    day: Optional[datetime.date],
+    using: str,
+) -> None:
+    """Move a row between days in the rollup (see tracking.get_tracked_fields)."""
+    if previous_day == day:
+        return
+
+    update_rollup(model, field_name, previous_day, -1, using)
+    update_rollup(model, field_name, day, 1, using)
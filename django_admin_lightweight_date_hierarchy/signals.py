@@ -0,0 +1,17 @@
+from django.dispatch import Signal
+
+
+# Sent after the date hierarchy of a change list is rendered, and after
+# RangeBasedDateHierarchyListFilter filters the queryset.
+#
+# sender: Model admin class.
+# Arguments:
+#   source - "drilldown" or "filter".
+#   model_admin - Model admin instance.
+#   level - Level of the hierarchy: "all", "year", "month" or "day".
+#   strategy - How the dates were found: "static", "cached", "coalesced", "query", "count", "exists", "rollup",
+#       "bitmap", "sample", "skip_scan" or "fallback" (timeout exceeded). None for the filter.
+#   queries - Number of queries executed.
+#   duration - Wall time in seconds.
+#   choices - Number of choices rendered. None for the filter.
+date_hierarchy_measured = Signal()
@@ -0,0 +1,98 @@
+from typing import Any, Callable, Dict, Optional, TypeVar
+import threading
+import time
+
+from django.core.cache import BaseCache
+
+from .instrumentation import record
+
+
+T = TypeVar('T')
+
+# Seconds between checks of the cache while another process holds the lock.
+LOCK_POLL_INTERVAL = 0.05
+
+_MISSING = object()
+
+
+class _Flight:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.exception: Optional[BaseException] = None
+
+
+_flights: Dict[str, _Flight] = {}
+_flights_lock = threading.Lock()
+
+
+def coalesce(key: str, compute: Callable[[], T]) -> T:
+    """Coalesce identical computations in flight in this process.
+
+    The first thread to compute key computes it, and threads computing the
+    same key meanwhile wait for its result (or exception) instead of
+    computing it again.
+    """
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if flight is None:
+            flight = _flights[key] = _Flight()
+
+    if not leader:
+        flight.done.wait()
+        record(strategy='coalesced')
+        if flight.exception is not None:
+            raise flight.exception
+        result: T = flight.result
+        return result
+
+    try:
+        flight.result = compute()
+        return flight.result  # type: ignore[no-any-return]
+    except BaseException as e:
+        flight.exception = e
+        raise
+    finally:
+        with _flights_lock:
+            del _flights[key]
+        flight.done.set()
+
+
+def compute_with_cache_lock(
+    cache: BaseCache,
+    key: str,
+    compute: Callable[[], T],
+    timeout: Any,
+    lock_timeout: float,
+) -> T:
+    """Compute a value and set it in the cache, while holding a lock in the cache.
+
+    Processes computing the same key meanwhile wait for the value to be set
+    in the cache instead of computing it again. When the lock is not released
+    within lock_timeout (seconds), for example when its holder died, the value
+    is computed without the lock.
+    """
+    lock_key = f'{key}:lock'
+    deadline = time.monotonic() + lock_timeout
+
+    locked = cache.add(lock_key, 1, lock_timeout)
+    while not locked:
+        value = cache.get(key, _MISSING)
+        if value is not _MISSING:
+            record(strategy='cached')
+            return value  # type: ignore[no-any-return]
+
+        if time.monotonic() >= deadline:
+            break
+
+        time.sleep(LOCK_POLL_INTERVAL)
+        locked = cache.add(lock_key, 1, lock_timeout)
+
+    try:
+        value = compute()
+        cache.set(key, value, timeout)
+        return value
+    finally:
+        if locked:
+            cache.delete(lock_key)
@@ -0,0 +1,19 @@
+'use strict';
+{
+    // Replace the placeholders rendered by the date_hierarchy tag with the date hierarchy.
+    document.querySelectorAll('[data-date-hierarchy-url]').forEach(function(placeholder) {
+        fetch(placeholder.dataset.dateHierarchyUrl, {credentials: 'same-origin', headers: {Accept: 'application/json'}})
+            .then(function(response) {
+                if (!response.ok) {
+                    throw new Error(response.status + ' ' + response.statusText);
+                }
+                return response.json();
+            })
+            .then(function(data) {
+                placeholder.outerHTML = data.html;
+            })
+            .catch(function(error) {
+                console.error('Failed to load the date hierarchy:', error);
+            });
+    });
+}
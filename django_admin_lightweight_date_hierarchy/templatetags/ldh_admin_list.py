@@ -1,13 +1,34 @@
-from typing import Any, Dict, Iterable, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 import datetime
 import calendar
 
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import DatabaseError
 from django.utils.translation import gettext_lazy as _
 from django.contrib.admin.templatetags.admin_list import register
+from django.template.loader import render_to_string
+from django.urls import reverse
 from django.utils.text import capfirst
 from django.utils import formats
-from django.db import models
-from django.contrib.admin.utils import get_fields_from_path
+
+from ..bitmap import query_bitmap_bounds, query_bitmap_drilldown
+from ..cache import get_or_set_date_hierarchy_cache
+from ..fragments import get_or_render_fragment, is_fragment_cache_enabled
+from ..instrumentation import measure, record
+from ..drilldown import (
+    estimate_count,
+    get_drilldown_queryset,
+    is_statement_timeout,
+    query_count_drilldown,
+    query_date_hierarchy_bounds,
+    query_date_hierarchy_drilldown,
+    query_exists_drilldown,
+    query_sample_drilldown,
+    query_skip_scan_years,
+    statement_timeout,
+)
+from ..metadata import get_date_hierarchy_metadata
+from ..rollup import query_rollup_bounds, query_rollup_drilldown
 
 
 def get_today() -> datetime.date:
@@ -57,54 +78,227 @@ def default_date_hierarchy_drilldown(
         assert False, 'date hierarchy drilldown makes no sense.'
 
 
-@register.inclusion_tag('admin/date_hierarchy.html')  # type: ignore[misc]
-def date_hierarchy(cl: Any) -> Optional[Dict[str, Any]]:
-    """Displays the date hierarchy for date drill-down functionality.
+def get_drilldown_counts(
+    cl: Any,
+    year_lookup: Optional[int] = None,
+    month_lookup: Optional[int] = None,
+) -> Dict[datetime.date, Optional[int]]:
+    """Get the dates to drill-down to and the number of rows in each for any level of the hierarchy.
+
+    The dates are queried according to date_hierarchy_drilldown on the model admin:
+        True - query_date_hierarchy_drilldown
+        "count" - query_count_drilldown
+        "rollup" - query_rollup_drilldown
+        "bitmap" - query_bitmap_drilldown, or the dates generated by
+            get_date_hierarchy_drilldown when the bitmaps are not built.
+        "sample" - query_sample_drilldown
+        "exists" - query_exists_drilldown for the months of a year and the days
+            of a month, query_date_hierarchy_drilldown for the years.
+
+    The number of rows is counted only when date_hierarchy_drilldown = "count",
+    otherwise it is None.
+
+    When date_hierarchy_year_strategy = "skip_scan" on the model admin, the years
+    are queried using query_skip_scan_years (except for "count", "rollup", "bitmap"
+    and "sample").
+
+    The result is cached when caching is enabled on the model admin.
+
+    When date_hierarchy_drilldown_timeout_ms is set on the model admin and the
+    query exceeds it, the dates generated by get_date_hierarchy_drilldown are
+    used instead (see statement_timeout).
+    """
+    date_hierarchy_drilldown = get_date_hierarchy_metadata(cl.model_admin).drilldown
+    date_hierarchy_drilldown_fn = getattr(
+        cl.model_admin,
+        'get_date_hierarchy_drilldown',
+        default_date_hierarchy_drilldown,
+    )
+    date_hierarchy_year_strategy = getattr(cl.model_admin, 'date_hierarchy_year_strategy', 'distinct')
+    timeout_ms: Optional[int] = getattr(cl.model_admin, 'date_hierarchy_drilldown_timeout_ms', None)
+
+    def query() -> Dict[datetime.date, Optional[int]]:
+        with statement_timeout(get_drilldown_queryset(cl).db, timeout_ms):
+            if date_hierarchy_drilldown == 'count':
+                record(strategy='count')
+                counts: Dict[datetime.date, Optional[int]] = {**query_count_drilldown(cl, year_lookup, month_lookup)}
+                return counts
+
+            return dict.fromkeys(query_drilldown())
+
+    def query_drilldown() -> List[datetime.date]:
+        if date_hierarchy_drilldown == 'rollup':
+            record(strategy='rollup')
+            return query_rollup_drilldown(cl, year_lookup, month_lookup)
+
+        elif date_hierarchy_drilldown == 'bitmap':
+            dates = query_bitmap_drilldown(cl, year_lookup, month_lookup)
+            if dates is not None:
+                record(strategy='bitmap')
+                return dates
+
+            # The bitmaps are not built, fall back to drill-down without a query.
+            record(strategy='static')
+            return list(date_hierarchy_drilldown_fn(year_lookup, month_lookup))
+
+        elif date_hierarchy_drilldown == 'sample':
+            record(strategy='sample')
+            candidates = date_hierarchy_drilldown_fn(year_lookup, month_lookup)
+            return query_sample_drilldown(cl, year_lookup, month_lookup, candidates)
+
+        elif year_lookup is None and date_hierarchy_year_strategy == 'skip_scan':
+            record(strategy='skip_scan')
+            return query_skip_scan_years(cl)
+
+        elif date_hierarchy_drilldown == 'exists' and year_lookup is not None:
+            record(strategy='exists')
+            candidates = date_hierarchy_drilldown_fn(year_lookup, month_lookup)
+            return query_exists_drilldown(cl, year_lookup, month_lookup, candidates)
 
-    This tag overrides Django Admin date_hierarchy template tag at
-    django/contrib/admin/templatetags/admin_list.py -> date_hierarchy
+        else:
+            record(strategy='query')
+            return query_date_hierarchy_drilldown(cl, year_lookup, month_lookup)
 
-    The tag prevents additional queries used for generating the date hierarchy.
-    The default tag performs a query on the filtered queryset to find the dates
-    for which there is data for the level in the hierarchy. On large tables
-    this query can be very expensive.
+    level = '-'.join(str(lookup) for lookup in (year_lookup, month_lookup) if lookup is not None)
 
-    The additional query is prevented by setting date_hierarchy_drilldown = False
-    on the model admin. When drilldown is disabled the tag will generate a default
-    range of dates based only on the selected hierarchy level without performing a
-    query.
+    try:
+        return get_or_set_date_hierarchy_cache(cl, level or 'all', query)
 
-    Hierarchy levels:
-        Month - all days of the month.
-        Year - All months of year.
-        None - +-3 years from current year.
+    except DatabaseError as e:
+        if timeout_ms is None or not is_statement_timeout(e):
+            raise
 
-    When date_hierarchy_drilldown = True or when not set the default behaviour
-    is preserved.
+        # Exceeded the timeout, fall back to drill-down without a query.
+        record(strategy='fallback')
+        return dict.fromkeys(date_hierarchy_drilldown_fn(year_lookup, month_lookup))
 
-    Usage:
-        class MyModelAdmin(admin.ModelAdmin):
-            date_hierarchy = 'created'
-            date_hierarchy_drilldown = False
+
+def get_date_hierarchy_bounds(cl: Any) -> Tuple[Optional[datetime.date], Optional[datetime.date]]:
+    """Get the first and last dates used to select the start level of the hierarchy.
+
+    When date_hierarchy_drilldown = "rollup", the dates are queried from the rollup.
+    When date_hierarchy_drilldown = "bitmap", the dates are found in the bitmaps.
+    Otherwise, the strategy is set by date_hierarchy_start_level on the model admin:
+        "aggregate" (default) - Min/Max aggregate, cached when caching is enabled.
+        "limit" - Two LIMIT 1 queries, cached when caching is enabled.
+        "cached" - Same as "limit", always cached. When date_hierarchy_drilldown_cache_timeout
+            is not set, the default timeout of the cache is used.
+        None - Don't select a start level.
+
+    Returns:
+        [0] first - None if there is no data or no start level
+        [1] last - None if there is no data or no start level
     """
-    if not cl.date_hierarchy:
-        return None
+    strategy: Optional[str] = getattr(cl.model_admin, 'date_hierarchy_start_level', 'aggregate')
+    timeout_ms: Optional[int] = getattr(cl.model_admin, 'date_hierarchy_drilldown_timeout_ms', None)
+    default_timeout = None
+
+    if strategy is None:
+        return None, None
+
+    elif get_date_hierarchy_metadata(cl.model_admin).drilldown == 'rollup':
+        def query_bounds() -> Tuple[Optional[datetime.date], Optional[datetime.date]]:
+            return query_rollup_bounds(cl)
+
+    elif get_date_hierarchy_metadata(cl.model_admin).drilldown == 'bitmap':
+        def query_bounds() -> Tuple[Optional[datetime.date], Optional[datetime.date]]:
+            return query_bitmap_bounds(cl)
+
+    elif strategy == 'cached':
+        default_timeout = DEFAULT_TIMEOUT
+
+        def query_bounds() -> Tuple[Optional[datetime.date], Optional[datetime.date]]:
+            return query_date_hierarchy_bounds(cl, 'limit')
+
+    else:
+        def query_bounds() -> Tuple[Optional[datetime.date], Optional[datetime.date]]:
+            return query_date_hierarchy_bounds(cl, strategy)
+
+    def query() -> Tuple[Optional[datetime.date], Optional[datetime.date]]:
+        with statement_timeout(get_drilldown_queryset(cl).db, timeout_ms):
+            return query_bounds()
+
+    try:
+        return get_or_set_date_hierarchy_cache(cl, 'bounds', query, default_timeout=default_timeout)
+
+    except DatabaseError as e:
+        if timeout_ms is None or not is_statement_timeout(e):
+            raise
+
+        # Exceeded the timeout, start from the top level.
+        return None, None
+
+
+def resolve_date_hierarchy_drilldown(cl: Any) -> Any:
+    """Resolve date_hierarchy_drilldown of the model admin for the change list.
 
-    field_name: str = cl.date_hierarchy
-    field = get_fields_from_path(cl.model, field_name)[-1]
-    dates_or_datetimes = 'datetimes' if isinstance(field, models.DateTimeField) else 'dates'
-    year_field = '%s__year' % field_name
-    month_field = '%s__month' % field_name
-    day_field = '%s__day' % field_name
-    field_generic = '%s__' % field_name
+    When date_hierarchy_drilldown = "auto", drill-down is enabled only when the
+    estimated number of rows in the filtered queryset is at most
+    date_hierarchy_drilldown_auto_threshold (default 10,000) on the model admin.
+    The estimate is cached when caching is enabled on the model admin.
+
+    When date_hierarchy_drilldown_timeout_ms is set on the model admin and the
+    estimate exceeds it, drill-down is disabled.
+
+    Returns:
+        Value of date_hierarchy_drilldown. When "auto", True or False.
+    """
+    date_hierarchy_drilldown = get_date_hierarchy_metadata(cl.model_admin).drilldown
+    if date_hierarchy_drilldown != 'auto':
+        return date_hierarchy_drilldown
+
+    threshold: int = getattr(cl.model_admin, 'date_hierarchy_drilldown_auto_threshold', 10000)
+    timeout_ms: Optional[int] = getattr(cl.model_admin, 'date_hierarchy_drilldown_timeout_ms', None)
+
+    def query() -> int:
+        queryset = get_drilldown_queryset(cl)
+        with statement_timeout(queryset.db, timeout_ms):
+            return estimate_count(queryset, threshold)
+
+    try:
+        estimate = get_or_set_date_hierarchy_cache(cl, 'estimate', query)
+
+    except DatabaseError as e:
+        if timeout_ms is None or not is_statement_timeout(e):
+            raise
+
+        # Exceeded the timeout, too many rows to drill-down.
+        return False
+
+    return estimate <= threshold
+
+
+def with_count(title: str, count: Optional[int]) -> str:
+    """Add the number of rows to the title of a choice, for example "March 2024 (12,301)"."""
+    if count is None:
+        return title
+
+    return f'{title} ({formats.number_format(count, force_grouping=True)})'
+
+
+def get_date_hierarchy_context(cl: Any) -> Dict[str, Any]:
+    """Get the context of the date hierarchy template for a change list.
+
+    See date_hierarchy.
+    """
+    metadata = get_date_hierarchy_metadata(cl.model_admin)
+    year_field = metadata.lookups['year']
+    month_field = metadata.lookups['month']
+    day_field = metadata.lookups['day']
+    field_generic = '%s__' % metadata.field_name
     year_lookup: Optional[str] = cl.params.get(year_field)
     month_lookup: Optional[str] = cl.params.get(month_field)
     day_lookup: Optional[str] = cl.params.get(day_field)
 
-    def link(filters: Dict[str, str]) -> str:
+    def link(filters: Dict[str, Any]) -> str:
         return cl.get_query_string(filters, [field_generic])  # type: ignore[no-any-return]
 
-    date_hierarchy_drilldown = getattr(cl.model_admin, 'date_hierarchy_drilldown', True)
+    # No drill-down when a day is selected.
+    date_hierarchy_drilldown = (
+        resolve_date_hierarchy_drilldown(cl)
+        if not (year_lookup and month_lookup and day_lookup)
+        else False
+    )
     date_hierarchy_drilldown_fn = getattr(
         cl.model_admin,
         'get_date_hierarchy_drilldown',
@@ -115,12 +309,25 @@ def date_hierarchy(cl: Any) -> Optional[Dict[str, Any]]:
 
         # Select appropriate start level.
         if date_hierarchy_drilldown:
-            date_range = cl.queryset.aggregate(first=models.Min(field_name), last=models.Max(field_name))
-            if date_range['first'] and date_range['last']:
-                if date_range['first'].year == date_range['last'].year:
-                    year_lookup = date_range['first'].year
-                    if date_range['first'].month == date_range['last'].month:
-                        month_lookup = date_range['first'].month
+            first, last = get_date_hierarchy_bounds(cl)
+            if first and last:
+                if first.year == last.year:
+                    year_lookup = first.year  # type: ignore[assignment]
+                    if first.month == last.month:
+                        month_lookup = first.month  # type: ignore[assignment]
+
+    if year_lookup and month_lookup and day_lookup:
+        level = 'day'
+    elif year_lookup and month_lookup:
+        level = 'month'
+    elif year_lookup:
+        level = 'year'
+    else:
+        level = 'all'
+    record(level=level)
+
+    if not date_hierarchy_drilldown:
+        record(strategy='static')
 
     if year_lookup and month_lookup and day_lookup:
         day = datetime.date(int(year_lookup), int(month_lookup), int(day_lookup))
@@ -136,11 +343,10 @@ def date_hierarchy(cl: Any) -> Optional[Dict[str, Any]]:
     elif year_lookup and month_lookup:
 
         if date_hierarchy_drilldown:
-            days = cl.queryset.filter(**{year_field: year_lookup, month_field: month_lookup})
-            days = getattr(days, dates_or_datetimes)(field_name, 'day')
+            days = get_drilldown_counts(cl, int(year_lookup), int(month_lookup))
 
         else:
-            days = date_hierarchy_drilldown_fn(int(year_lookup), int(month_lookup))
+            days = dict.fromkeys(date_hierarchy_drilldown_fn(int(year_lookup), int(month_lookup)))
 
         return {
             'show': True,
@@ -150,18 +356,17 @@ def date_hierarchy(cl: Any) -> Optional[Dict[str, Any]]:
             },
             'choices': [{
                 'link': link({year_field: year_lookup, month_field: month_lookup, day_field: day.day}),
-                'title': capfirst(formats.date_format(day, 'MONTH_DAY_FORMAT'))
-            } for day in days]
+                'title': with_count(capfirst(formats.date_format(day, 'MONTH_DAY_FORMAT')), count),
+            } for day, count in days.items()]
         }
 
     elif year_lookup:
 
         if date_hierarchy_drilldown:
-            months = cl.queryset.filter(**{year_field: year_lookup})
-            months = getattr(months, dates_or_datetimes)(field_name, 'month')
+            months = get_drilldown_counts(cl, int(year_lookup))
 
         else:
-            months = date_hierarchy_drilldown_fn(int(year_lookup), None)
+            months = dict.fromkeys(date_hierarchy_drilldown_fn(int(year_lookup), None))
 
         return {
             'show': True,
@@ -171,22 +376,148 @@ def date_hierarchy(cl: Any) -> Optional[Dict[str, Any]]:
             },
             'choices': [{
                 'link': link({year_field: year_lookup, month_field: month.month}),
-                'title': capfirst(formats.date_format(month, 'YEAR_MONTH_FORMAT'))
-            } for month in months]
+                'title': with_count(capfirst(formats.date_format(month, 'YEAR_MONTH_FORMAT')), count),
+            } for month, count in months.items()]
         }
 
     else:
 
         if date_hierarchy_drilldown:
-            years = getattr(cl.queryset, dates_or_datetimes)(field_name, 'year')
+            years = get_drilldown_counts(cl)
 
         else:
-            years = date_hierarchy_drilldown_fn(None, None)
+            years = dict.fromkeys(date_hierarchy_drilldown_fn(None, None))
 
         return {
             'show': True,
             'choices': [{
                 'link': link({year_field: str(year.year)}),
-                'title': str(year.year),
-            } for year in years]
+                'title': with_count(str(year.year), count),
+            } for year, count in years.items()]
         }
+
+
+def measure_date_hierarchy_context(cl: Any) -> Dict[str, Any]:
+    """Get the context of the date hierarchy template and send the date_hierarchy_measured signal."""
+    with measure('drilldown', cl.model_admin, get_drilldown_queryset(cl).db):
+        context = get_date_hierarchy_context(cl)
+        record(choices=len(context['choices']))
+
+    return context
+
+
+def render_date_hierarchy(cl: Any) -> str:
+    """Render the date hierarchy template of a change list."""
+    context = get_date_hierarchy_context(cl)
+    record(choices=len(context['choices']))
+    html: str = render_to_string('admin/date_hierarchy.html', context)
+    return html
+
+
+def get_date_hierarchy_url(cl: Any) -> str:
+    """Get the URL of the date hierarchy view of a change list (see LazyDateHierarchyMixin)."""
+    opts = cl.model._meta
+    url: str = reverse(
+        'admin:%s_%s_date_hierarchy' % (opts.app_label, opts.model_name),
+        current_app=cl.model_admin.admin_site.name,
+    )
+    query_string: str = cl.get_query_string()
+    return url + query_string
+
+
+@register.inclusion_tag('django_admin_lightweight_date_hierarchy/date_hierarchy.html')  # type: ignore[misc]
+def date_hierarchy(cl: Any) -> Optional[Dict[str, Any]]:
+    """Displays the date hierarchy for date drill-down functionality.
+
+    This tag overrides Django Admin date_hierarchy template tag at
+    django/contrib/admin/templatetags/admin_list.py -> date_hierarchy
+
+    The tag prevents additional queries used for generating the date hierarchy.
+    The default tag performs a query on the filtered queryset to find the dates
+    for which there is data for the level in the hierarchy. On large tables
+    this query can be very expensive.
+
+    The additional query is prevented by setting date_hierarchy_drilldown = False
+    on the model admin. When drilldown is disabled the tag will generate a default
+    range of dates based only on the selected hierarchy level without performing a
+    query.
+
+    Hierarchy levels:
+        Month - all days of the month.
+        Year - All months of year.
+        None - +-3 years from current year.
+
+    When date_hierarchy_drilldown = True or when not set the default behaviour
+    is preserved. The drill-down queries are narrowed using range lookups
+    (see get_date_range_lookups_for_hierarchy) so they can use an index on
+    the field.
+
+    To cache the results of the drill-down queries, set
+    date_hierarchy_drilldown_cache_timeout (seconds) on the model admin.
+
+    To check only the candidate months or days generated by get_date_hierarchy_drilldown
+    using a single query of EXISTS subqueries, set date_hierarchy_drilldown = 'exists'
+    on the model admin.
+
+    To show the number of rows in each choice, counted in the same single query
+    grouped by the date, set date_hierarchy_drilldown = 'count' on the model admin.
+
+    To drill-down using a daily rollup table maintained by signals and the
+    rebuild_date_hierarchy_rollup management command, set
+    date_hierarchy_drilldown = 'rollup' on the model admin.
+
+    To drill-down without queries using per-day bitmaps kept in the cache and
+    maintained by signals and the rebuild_date_hierarchy_bitmap management
+    command, set date_hierarchy_drilldown = 'bitmap' on the model admin.
+
+    To find the dates from a sample of the rows, merged with the dates generated by
+    get_date_hierarchy_drilldown, set date_hierarchy_drilldown = 'sample' on the
+    model admin (see query_sample_drilldown).
+
+    To decide per request, set date_hierarchy_drilldown = 'auto' on the model
+    admin (see resolve_date_hierarchy_drilldown).
+
+    To limit the time of the drill-down queries, set date_hierarchy_drilldown_timeout_ms
+    on the model admin. When the drill-down query exceeds the timeout, the tag falls
+    back to the drill-down without a query.
+
+    To send the drill-down queries to another database, such as a read replica,
+    set date_hierarchy_drilldown_using to the database alias on the model admin.
+
+    When no level is selected, the start level is selected using the first
+    and last dates in the queryset. To control how they are found, set
+    date_hierarchy_start_level on the model admin (see get_date_hierarchy_bounds).
+
+    To render a placeholder and load the date hierarchy after the change list
+    is rendered, use LazyDateHierarchyMixin in the model admin. To compute the
+    date hierarchy in a thread while the results of the change list are queried,
+    use ConcurrentDateHierarchyMixin in the model admin.
+
+    To cache the rendered date hierarchy when date_hierarchy_drilldown = False, set
+    date_hierarchy_fragment_cache_size (number of fragments kept in process) on the
+    model admin, and optionally date_hierarchy_fragment_cache_timeout (seconds) to
+    share them using the cache (see get_or_render_fragment).
+
+    The queries and time of the tag are sent using the date_hierarchy_measured signal.
+
+    Usage:
+        class MyModelAdmin(admin.ModelAdmin):
+            date_hierarchy = 'created'
+            date_hierarchy_drilldown = False
+    """
+    if not cl.date_hierarchy:
+        return None
+
+    if getattr(cl.model_admin, 'date_hierarchy_lazy', False):
+        return {'lazy_url': get_date_hierarchy_url(cl)}
+
+    future = getattr(cl, 'date_hierarchy_future', None)
+    if future is not None:
+        context: Dict[str, Any] = future.result()
+        return context
+
+    if is_fragment_cache_enabled(cl.model_admin):
+        with measure('drilldown', cl.model_admin, get_drilldown_queryset(cl).db):
+            return {'html': get_or_render_fragment(cl, get_today(), lambda: render_date_hierarchy(cl))}
+
+    return measure_date_hierarchy_context(cl)
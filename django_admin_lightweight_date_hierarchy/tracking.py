@@ -0,0 +1,102 @@
+from typing import Any, Callable, Dict, List, Optional, Type
+import datetime
+import functools
+
+from django.db import models
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from .admin import iter_date_hierarchy_model_admins
+from .drilldown import get_local_date
+
+
+# Called with the model, the date hierarchy field, the previous day and the new day of a row,
+# and the alias of the database the row was saved to or deleted from.
+# previous_day is None for new rows, day is None for deleted rows, and previous_day is day
+# for rows saved without changing their day.
+DayChangedHandler = Callable[[Type[models.Model], str, Optional[datetime.date], Optional[datetime.date], str], None]
+
+
+def get_day_changed_handlers(model_admin: Any) -> List[DayChangedHandler]:
+    """Get the handlers to call when the day of a row in the date hierarchy of model_admin changes."""
+    from .bitmap import get_bitmap_day_changed_handler
+    from .invalidation import get_cache_day_changed_handler
+    from .rollup import on_rollup_day_changed
+
+    handlers: List[DayChangedHandler] = []
+
+    date_hierarchy_drilldown = getattr(model_admin, 'date_hierarchy_drilldown', True)
+    if date_hierarchy_drilldown == 'rollup':
+        handlers.append(on_rollup_day_changed)
+    elif date_hierarchy_drilldown == 'bitmap':
+        handlers.append(get_bitmap_day_changed_handler(model_admin))
+
+    if getattr(model_admin, 'date_hierarchy_drilldown_cache_invalidation', False):
+        handlers.append(get_cache_day_changed_handler(model_admin))
+
+    return handlers
+
+
+@functools.lru_cache(maxsize=None)
+def get_tracked_fields() -> Dict[Type[models.Model], Dict[str, List[DayChangedHandler]]]:
+    """Map concrete models to their date hierarchy fields tracked by signals and the handlers of each field.
+
+    Date hierarchies on related fields are not tracked.
+    """
+    tracked_fields: Dict[Type[models.Model], Dict[str, List[DayChangedHandler]]] = {}
+
+    for model_admin in iter_date_hierarchy_model_admins():
+        if '__' in model_admin.date_hierarchy:
+            continue
+
+        handlers = get_day_changed_handlers(model_admin)
+        if not handlers:
+            continue
+
+        model = model_admin.model._meta.concrete_model
+        field_handlers = tracked_fields.setdefault(model, {}).setdefault(model_admin.date_hierarchy, [])
+        field_handlers.extend(handler for handler in handlers if handler not in field_handlers)
+
+    return tracked_fields
+
+
+def _on_pre_save(sender: Type[models.Model], instance: models.Model, **kwargs: Any) -> None:
+    model = sender._meta.concrete_model
+    field_handlers = get_tracked_fields().get(model)
+    if not field_handlers or instance._state.adding or instance.pk is None:
+        return
+
+    # Keep the previous days to move the row between days in post_save.
+    previous = model._base_manager.db_manager(kwargs['using']).filter(pk=instance.pk).values(*field_handlers).first()
+    instance._ldh_previous = previous
+
+
+def _on_post_save(sender: Type[models.Model], instance: models.Model, **kwargs: Any) -> None:
+    model = sender._meta.concrete_model
+    field_handlers = get_tracked_fields().get(model)
+    if not field_handlers:
+        return
+
+    previous = getattr(instance, '_ldh_previous', None)
+    instance.__dict__.pop('_ldh_previous', None)
+
+    for field_name, handlers in field_handlers.items():
+        day = get_local_date(getattr(instance, field_name))
+        previous_day = get_local_date(previous[field_name]) if previous is not None else None
+
+        for handler in handlers:
+            handler(model, field_name, previous_day, day, kwargs['using'])
+
+
+def _on_post_delete(sender: Type[models.Model], instance: models.Model, **kwargs: Any) -> None:
+    model = sender._meta.concrete_model
+    for field_name, handlers in get_tracked_fields().get(model, {}).items():
+        day = get_local_date(getattr(instance, field_name))
+        for handler in handlers:
+            handler(model, field_name, day, None, kwargs['using'])
+
+
+def connect_tracking_signals() -> None:
+    """Track the days of rows in the date hierarchies of model admins on save and delete."""
+    pre_save.connect(_on_pre_save, dispatch_uid='ldh_tracking_pre_save')
+    post_save.connect(_on_post_save, dispatch_uid='ldh_tracking_post_save')
+    post_delete.connect(_on_post_delete, dispatch_uid='ldh_tracking_post_delete')
@@ -3,8 +3,14 @@ import datetime
 
 from django.contrib import admin
 
-from django_admin_lightweight_date_hierarchy.admin import RangeBasedDateHierarchyListFilter
-from .models import Foo
+from django_admin_lightweight_date_hierarchy.admin import (
+    ConcurrentDateHierarchyMixin,
+    EstimatedCountMixin,
+    KeysetPaginationMixin,
+    LazyDateHierarchyMixin,
+    RangeBasedDateHierarchyListFilter,
+)
+from .models import Bar, Baz, Foo
 
 
 class FooNoDrilldown(Foo):
@@ -90,3 +96,327 @@ class FooWithRangeBasedDateHierarchyListFilterAdmin(admin.ModelAdmin):
     list_filter = (
         RangeBasedDateHierarchyListFilter,
     )
+
+
+class FooWithPkRangeBasedDateHierarchyListFilter(Foo):
+    class Meta:
+        proxy = True
+
+
+@admin.register(FooWithPkRangeBasedDateHierarchyListFilter)
+class FooWithPkRangeBasedDateHierarchyListFilterAdmin(admin.ModelAdmin):
+    date_hierarchy = 'created'
+    date_hierarchy_pk_range = True
+    date_hierarchy_drilldown_cache_timeout = 60
+
+    list_filter = (
+        RangeBasedDateHierarchyListFilter,
+    )
+
+
+class FooCachedDrilldown(Foo):
+    class Meta:
+        proxy = True
+
+
+@admin.register(FooCachedDrilldown)
+class FooCachedDrilldownAdmin(admin.ModelAdmin):
+    date_hierarchy = 'created'
+    date_hierarchy_drilldown = True
+    date_hierarchy_drilldown_cache_timeout = 60
+    list_filter = ('id',)
+
+
+class FooLimitStartLevel(Foo):
+    class Meta:
+        proxy = True
+
+
+@admin.register(FooLimitStartLevel)
+class FooLimitStartLevelAdmin(admin.ModelAdmin):
+    date_hierarchy = 'created'
+    date_hierarchy_start_level = 'limit'
+
+
+class FooCachedStartLevel(Foo):
+    class Meta:
+        proxy = True
+
+
+@admin.register(FooCachedStartLevel)
+class FooCachedStartLevelAdmin(admin.ModelAdmin):
+    date_hierarchy = 'created'
+    date_hierarchy_start_level = 'cached'
+
+
+class FooNoStartLevel(Foo):
+    class Meta:
+        proxy = True
+
+
+@admin.register(FooNoStartLevel)
+class FooNoStartLevelAdmin(admin.ModelAdmin):
+    date_hierarchy = 'created'
+    date_hierarchy_start_level = None
+
+
+class FooRollup(Foo):
+    class Meta:
+        proxy = True
+
+
+@admin.register(FooRollup)
+class FooRollupAdmin(admin.ModelAdmin):
+    date_hierarchy = 'created'
+    date_hierarchy_drilldown = 'rollup'
+
+
+class FooBitmap(Foo):
+    class Meta:
+        proxy = True
+
+
+@admin.register(FooBitmap)
+class FooBitmapAdmin(admin.ModelAdmin):
+    date_hierarchy = 'created'
+    date_hierarchy_drilldown = 'bitmap'
+
+
+class FooExists(Foo):
+    class Meta:
+        proxy = True
+
+
+@admin.register(FooExists)
+class FooExistsAdmin(admin.ModelAdmin):
+    date_hierarchy = 'created'
+    date_hierarchy_drilldown = 'exists'
+    list_filter = ('id',)
+
+
+class FooCount(Foo):
+    class Meta:
+        proxy = True
+
+
+@admin.register(FooCount)
+class FooCountAdmin(admin.ModelAdmin):
+    date_hierarchy = 'created'
+    date_hierarchy_drilldown = 'count'
+    list_filter = ('id',)
+
+
+class FooSkipScanYears(Foo):
+    class Meta:
+        proxy = True
+
+
+@admin.register(FooSkipScanYears)
+class FooSkipScanYearsAdmin(admin.ModelAdmin):
+    date_hierarchy = 'created'
+    date_hierarchy_year_strategy = 'skip_scan'
+    date_hierarchy_start_level = None
+
+
+class FooDrilldownTimeout(Foo):
+    class Meta:
+        proxy = True
+
+
+@admin.register(FooDrilldownTimeout)
+class FooDrilldownTimeoutAdmin(admin.ModelAdmin):
+    date_hierarchy = 'created'
+    date_hierarchy_drilldown_timeout_ms = 100
+
+
+class FooAutoDrilldown(Foo):
+    class Meta:
+        proxy = True
+
+
+@admin.register(FooAutoDrilldown)
+class FooAutoDrilldownAdmin(admin.ModelAdmin):
+    date_hierarchy = 'created'
+    date_hierarchy_drilldown = 'auto'
+    date_hierarchy_drilldown_auto_threshold = 2
+    list_filter = ('id',)
+
+
+class FooLazy(Foo):
+    class Meta:
+        proxy = True
+
+
+@admin.register(FooLazy)
+class FooLazyAdmin(LazyDateHierarchyMixin, admin.ModelAdmin):
+    date_hierarchy = 'created'
+    date_hierarchy_drilldown_cache_timeout = 60
+
+
+class FooReplica(Foo):
+    class Meta:
+        proxy = True
+
+
+@admin.register(FooReplica)
+class FooReplicaAdmin(admin.ModelAdmin):
+    date_hierarchy = 'created'
+    date_hierarchy_drilldown_using = 'replica'
+
+
+class FooConcurrent(Foo):
+    class Meta:
+        proxy = True
+
+
+@admin.register(FooConcurrent)
+class FooConcurrentAdmin(ConcurrentDateHierarchyMixin, admin.ModelAdmin):
+    date_hierarchy = 'created'
+
+
+class FooSample(Foo):
+    class Meta:
+        proxy = True
+
+
+@admin.register(FooSample)
+class FooSampleAdmin(admin.ModelAdmin):
+    date_hierarchy = 'created'
+    date_hierarchy_drilldown = 'sample'
+    date_hierarchy_drilldown_sample_percent = 10
+
+
+class FooKeyset(Foo):
+    class Meta:
+        proxy = True
+
+
+@admin.register(FooKeyset)
+class FooKeysetAdmin(KeysetPaginationMixin, admin.ModelAdmin):
+    date_hierarchy = 'created'
+    ordering = ('-created',)
+    list_display = ('id', 'created')
+    list_per_page = 2
+
+
+class FooEstimatedCount(Foo):
+    class Meta:
+        proxy = True
+
+
+@admin.register(FooEstimatedCount)
+class FooEstimatedCountAdmin(EstimatedCountMixin, admin.ModelAdmin):
+    date_hierarchy = 'created'
+    date_hierarchy_drilldown = 'rollup'
+    date_hierarchy_estimated_count_threshold = 2
+    list_filter = ('id',)
+    list_per_page = 1
+    list_max_show_all = 2
+
+
+class FooFragmentCache(Foo):
+    class Meta:
+        proxy = True
+
+
+@admin.register(FooFragmentCache)
+class FooFragmentCacheAdmin(admin.ModelAdmin):
+    date_hierarchy = 'created'
+    date_hierarchy_drilldown = False
+    date_hierarchy_fragment_cache_size = 2
+    date_hierarchy_fragment_cache_timeout = 60
+
+
+class FooCacheInvalidation(Foo):
+    class Meta:
+        proxy = True
+
+
+@admin.register(FooCacheInvalidation)
+class FooCacheInvalidationAdmin(admin.ModelAdmin):
+    date_hierarchy = 'created'
+    date_hierarchy_drilldown_cache_timeout = 60
+    date_hierarchy_drilldown_cache_invalidation = True
+
+
+class BarCacheInvalidation(Bar):
+    class Meta:
+        proxy = True
+
+
+@admin.register(BarCacheInvalidation)
+class BarCacheInvalidationAdmin(admin.ModelAdmin):
+    date_hierarchy = 'created'
+    date_hierarchy_drilldown_cache_timeout = 60
+    date_hierarchy_drilldown_cache_invalidation = True
+    list_filter = ('status',)
+
+
+class FooSingleFlight(Foo):
+    class Meta:
+        proxy = True
+
+
+@admin.register(FooSingleFlight)
+class FooSingleFlightAdmin(admin.ModelAdmin):
+    date_hierarchy = 'created'
+    date_hierarchy_drilldown_cache_timeout = 60
+    date_hierarchy_drilldown_single_flight = True
+    date_hierarchy_drilldown_lock_timeout = 0.2
+
+
+class BazDrilldown(Baz):
+    class Meta:
+        proxy = True
+
+
+@admin.register(BazDrilldown)
+class BazDrilldownAdmin(admin.ModelAdmin):
+    date_hierarchy = 'created'
+    date_hierarchy_drilldown = True
+
+
+class BazCount(Baz):
+    class Meta:
+        proxy = True
+
+
+@admin.register(BazCount)
+class BazCountAdmin(admin.ModelAdmin):
+    date_hierarchy = 'created'
+    date_hierarchy_drilldown = 'count'
+
+
+class BazExists(Baz):
+    class Meta:
+        proxy = True
+
+
+@admin.register(BazExists)
+class BazExistsAdmin(admin.ModelAdmin):
+    date_hierarchy = 'created'
+    date_hierarchy_drilldown = 'exists'
+
+
+class BazSample(Baz):
+    class Meta:
+        proxy = True
+
+
+@admin.register(BazSample)
+class BazSampleAdmin(admin.ModelAdmin):
+    date_hierarchy = 'created'
+    date_hierarchy_drilldown = 'sample'
+    date_hierarchy_drilldown_sample_percent = 100
+
+
+class BazSkipScanYears(Baz):
+    class Meta:
+        proxy = True
+
+
+@admin.register(BazSkipScanYears)
+class BazSkipScanYearsAdmin(admin.ModelAdmin):
+    date_hierarchy = 'created'
+    date_hierarchy_year_strategy = 'skip_scan'
+    date_hierarchy_start_level = None
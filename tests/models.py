@@ -3,3 +3,18 @@ from django.db import models
 
 class Foo(models.Model):
     created = models.DateTimeField()
+
+
+class Bar(models.Model):
+    foo = models.ForeignKey(Foo, on_delete=models.CASCADE)
+    status = models.CharField(max_length=10)
+    created = models.DateTimeField(db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'created']),
+        ]
+
+
+class Baz(models.Model):
+    created = models.DateField(db_index=True)
@@ -0,0 +1,52 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from django_admin_lightweight_date_hierarchy.drilldown import estimate_count
+from ..models import Foo
+
+
+class TestAutoDrilldown(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        Foo.objects.bulk_create([
+            Foo(id=id, created=datetime.datetime(*t, tzinfo=datetime.timezone.utc))
+            for id, t in [
+                (1, (2017, 1, 15, 15)),
+                (2, (2017, 2, 15, 15)),
+                (3, (2017, 3, 15, 15)),
+            ]
+        ])
+
+        cls.superuser = User.objects.create_superuser(
+            username='foo',
+            email='foo@bar.bax',
+            password='a321321321',
+        )
+
+    def setUp(self) -> None:
+        self.client.force_login(self.superuser)
+
+    def test_should_estimate_count_up_to_limit(self) -> None:
+        self.assertEqual(estimate_count(Foo.objects.all(), 10), 3)
+        self.assertEqual(estimate_count(Foo.objects.all(), 1), 2)
+
+    def test_should_not_drilldown_above_threshold(self) -> None:
+        response = self.client.get('/admin/tests/fooautodrilldown/?created__year=2017')
+
+        for month in range(1, 13):
+            self.assertContains(response, f'?created__month={month}&amp;created__year=2017')
+
+    def test_should_drilldown_below_threshold(self) -> None:
+        response = self.client.get('/admin/tests/fooautodrilldown/?created__year=2017&id__in=1,2')
+
+        for month in range(1, 13):
+            link = f'?created__month={month}&amp;created__year=2017&amp;id__in=1%2C2'
+            if month in (1, 2):
+                self.assertContains(response, link)
+            else:
+                self.assertNotContains(response, link)
@@ -0,0 +1,206 @@
+from typing import List
+from unittest import mock
+import datetime
+import threading
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DatabaseError, connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from django_admin_lightweight_date_hierarchy.bitmap import (
+    BITMAP_BYTES_PER_YEAR,
+    apply_bitmaps_update,
+    build_bitmaps,
+    get_bitmap_cache_key,
+    get_bitmaps,
+    rebuild_bitmaps,
+)
+from ..models import Foo
+
+
+def utc(year: int, month: int, day: int, hour: int) -> datetime.datetime:
+    return datetime.datetime(year, month, day, hour, tzinfo=datetime.timezone.utc)
+
+
+class TestDateHierarchyBitmap(TestCase):
+    databases = {'default', 'replica'}
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        for t in [
+            (2017, 1, 15, 15),
+            (2017, 1, 15, 16),
+            (2017, 2, 15, 15),
+            (2018, 3, 15, 15),
+        ]:
+            Foo.objects.create(created=utc(*t))
+
+        cls.superuser = User.objects.create_superuser(
+            username='foo',
+            email='foo@bar.bax',
+            password='a321321321',
+        )
+
+    def setUp(self) -> None:
+        cache.clear()
+        rebuild_bitmaps(Foo, 'created')
+        self.client.force_login(self.superuser)
+
+    def get_days(self) -> List[datetime.date]:
+        bitmaps = get_bitmaps(Foo, 'created')
+        assert bitmaps is not None
+        return sorted(
+            datetime.date(year, 1, 1) + datetime.timedelta(days=bit)
+            for year, bitmap in bitmaps.items()
+            for bit in range(BITMAP_BYTES_PER_YEAR * 8)
+            if bitmap[bit // 8] & 1 << (bit % 8)
+        )
+
+    def test_should_build_bitmaps(self) -> None:
+        bitmaps = build_bitmaps([datetime.date(2016, 1, 1), datetime.date(2016, 12, 31), datetime.date(2017, 1, 2)])
+
+        self.assertEqual(set(bitmaps), {2016, 2017})
+        self.assertEqual(len(bitmaps[2016]), 46)
+        self.assertEqual(bitmaps[2016][0], 0b1)
+        self.assertEqual(bitmaps[2016][365 // 8], 1 << (365 % 8))
+        self.assertEqual(bitmaps[2017][0], 0b10)
+
+    def test_should_maintain_bitmaps_on_save(self) -> None:
+        self.assertEqual(self.get_days(), [
+            datetime.date(2017, 1, 15),
+            datetime.date(2017, 2, 15),
+            datetime.date(2018, 3, 15),
+        ])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Foo.objects.create(created=utc(2019, 1, 1, 15))
+            foo = Foo.objects.get(created=utc(2018, 3, 15, 15))
+            foo.created = utc(2018, 3, 16, 15)
+            foo.save()
+
+        self.assertEqual(self.get_days(), [
+            datetime.date(2017, 1, 15),
+            datetime.date(2017, 2, 15),
+            datetime.date(2018, 3, 16),
+            datetime.date(2019, 1, 1),
+        ])
+
+    def test_should_maintain_bitmaps_on_delete(self) -> None:
+        self.get_days()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Foo.objects.get(created=utc(2017, 1, 15, 15)).delete()
+            Foo.objects.get(created=utc(2017, 2, 15, 15)).delete()
+
+        self.assertEqual(self.get_days(), [
+            datetime.date(2017, 1, 15),
+            datetime.date(2018, 3, 15),
+        ])
+
+    def test_should_not_update_bitmaps_on_rollback(self) -> None:
+        self.get_days()
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    Foo.objects.get(created=utc(2018, 3, 15, 15)).delete()
+                    raise DatabaseError
+            except DatabaseError:
+                pass
+
+        self.assertEqual(callbacks, [])
+        self.assertIn(datetime.date(2018, 3, 15), self.get_days())
+
+    def test_should_wait_for_lock_of_bitmaps(self) -> None:
+        self.get_days()
+        lock_key = f'{get_bitmap_cache_key(Foo, "created")}:lock'
+        cache.add(lock_key, 1, 5)
+        timer = threading.Timer(0.1, cache.delete, args=(lock_key,))
+        timer.start()
+
+        Foo.objects.create(created=utc(2019, 1, 1, 15))
+        apply_bitmaps_update(Foo, 'created', None, datetime.date(2019, 1, 1))
+        timer.join()
+
+        self.assertIn(datetime.date(2019, 1, 1), self.get_days())
+        self.assertIsNone(cache.get(lock_key))
+
+    def test_should_delete_bitmaps_when_lock_is_not_released(self) -> None:
+        self.get_days()
+        cache.add(f'{get_bitmap_cache_key(Foo, "created")}:lock', 1, 5)
+
+        Foo.objects.create(created=utc(2019, 1, 1, 15))
+        with mock.patch('django_admin_lightweight_date_hierarchy.bitmap.BITMAP_LOCK_TIMEOUT', 0.1):
+            apply_bitmaps_update(Foo, 'created', None, datetime.date(2019, 1, 1))
+
+        self.assertIsNone(get_bitmaps(Foo, 'created'))
+
+    def test_should_rebuild_bitmaps(self) -> None:
+        Foo.objects.bulk_create([Foo(created=utc(2019, 1, 1, 15))])
+
+        out = StringIO()
+        call_command('rebuild_date_hierarchy_bitmap', 'tests.foobitmap', stdout=out)
+
+        self.assertIn('tests.Foo.created: 4 days', out.getvalue())
+        self.assertIn(datetime.date(2019, 1, 1), self.get_days())
+
+    def test_should_rebuild_bitmaps_from_database(self) -> None:
+        Foo.objects.using('replica').create(created=utc(2019, 1, 1, 15))
+
+        rebuild_bitmaps(Foo, 'created', db='replica')
+
+        self.assertEqual(self.get_days(), [datetime.date(2019, 1, 1)])
+
+    def test_should_drilldown_from_bitmaps_without_queries(self) -> None:
+        for endpoint, expected_links in (
+            ('/admin/tests/foobitmap/', ['?created__year=2017', '?created__year=2018']),
+            ('/admin/tests/foobitmap/?created__year=2017', [
+                '?created__month=1&amp;created__year=2017',
+                '?created__month=2&amp;created__year=2017',
+            ]),
+            ('/admin/tests/foobitmap/?created__year=2017&created__month=1', [
+                '?created__day=15&amp;created__month=1&amp;created__year=2017',
+            ]),
+        ):
+            with self.subTest(endpoint=endpoint):
+                with CaptureQueriesContext(connection) as context:
+                    response = self.client.get(endpoint)
+
+                for link in expected_links:
+                    self.assertContains(response, link)
+
+                self.assertNotContains(response, 'created__day=16')
+                self.assertNotContains(response, 'created__month=3&amp;created__year=2017')
+
+                for query in context.captured_queries:
+                    self.assertNotIn('django_datetime_trunc', query['sql'])
+                    self.assertNotIn('django_datetime_cast_date', query['sql'])
+                    self.assertNotIn('MIN("tests_foo"', query['sql'])
+
+    def test_should_select_start_level_from_bitmaps(self) -> None:
+        Foo.objects.exclude(created__year=2017, created__month=1).delete()
+        rebuild_bitmaps(Foo, 'created')
+
+        response = self.client.get('/admin/tests/foobitmap/')
+
+        self.assertContains(response, '?created__day=15&amp;created__month=1&amp;created__year=2017')
+
+    def test_should_fall_back_to_static_drilldown_when_bitmaps_are_not_built(self) -> None:
+        cache.clear()
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/admin/tests/foobitmap/?created__year=2017')
+
+        for month in range(1, 13):
+            self.assertContains(response, f'?created__month={month}&amp;created__year=2017')
+
+        for query in context.captured_queries:
+            self.assertNotIn('django_datetime_cast_date', query['sql'])
+
+        self.assertIsNone(get_bitmaps(Foo, 'created'))
@@ -0,0 +1,63 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from ..models import Foo
+
+
+class TestDateHierarchyDrilldownCache(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        Foo.objects.bulk_create([
+            Foo(id=id, created=datetime.datetime(*t, tzinfo=datetime.timezone.utc))
+            for id, t in [
+                (1, (2017, 1, 15, 15)),
+                (2, (2017, 2, 15, 15)),
+                (3, (2018, 3, 15, 15)),
+            ]
+        ])
+
+        cls.superuser = User.objects.create_superuser(
+            username='foo',
+            email='foo@bar.bax',
+            password='a321321321',
+        )
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client.force_login(self.superuser)
+
+    def test_should_not_query_drilldown_when_cached(self) -> None:
+        for endpoint, expected_link in (
+            ('/admin/tests/foocacheddrilldown/', '?created__year=2018'),
+            ('/admin/tests/foocacheddrilldown/?created__year=2017', '?created__month=2&amp;created__year=2017'),
+            (
+                '/admin/tests/foocacheddrilldown/?created__year=2017&created__month=1',
+                '?created__day=15&amp;created__month=1&amp;created__year=2017',
+            ),
+        ):
+            with self.subTest(endpoint=endpoint):
+                self.client.get(endpoint)
+
+                with CaptureQueriesContext(connection) as context:
+                    cached_response = self.client.get(endpoint)
+
+                for query in context.captured_queries:
+                    self.assertNotIn('django_datetime_trunc', query['sql'])
+                    self.assertNotIn('MIN(', query['sql'])
+
+                self.assertContains(cached_response, expected_link)
+
+    def test_should_cache_per_filters(self) -> None:
+        response = self.client.get('/admin/tests/foocacheddrilldown/?created__year=2017')
+        self.assertContains(response, '?created__month=2&amp;created__year=2017')
+
+        response = self.client.get('/admin/tests/foocacheddrilldown/?created__year=2017&id__exact=1')
+        self.assertNotContains(response, 'created__month=2')
@@ -0,0 +1,173 @@
+from typing import Any, Tuple
+import datetime
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from django_admin_lightweight_date_hierarchy.cache import get_level_bucket
+from django_admin_lightweight_date_hierarchy.invalidation import has_rows_on_day, invalidate_date_hierarchy_cache
+from ..models import Bar, Foo
+
+
+def utc(year: int, month: int, day: int, hour: int) -> datetime.datetime:
+    return datetime.datetime(year, month, day, hour, tzinfo=datetime.timezone.utc)
+
+
+class TestCacheInvalidation(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        Foo.objects.bulk_create([
+            Foo(created=utc(*t))
+            for t in [
+                (2017, 1, 15, 15),
+                (2017, 2, 15, 15),
+                (2018, 3, 15, 15),
+            ]
+        ])
+
+        cls.superuser = User.objects.create_superuser(
+            username='foo',
+            email='foo@bar.bax',
+            password='a321321321',
+        )
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client.force_login(self.superuser)
+
+        # Cache the levels.
+        for query_string in ('', 'created__year=2017', 'created__year=2018'):
+            self.get_changelist(query_string)
+
+    def get_changelist(self, query_string: str) -> Tuple[Any, bool]:
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(f'/admin/tests/foocacheinvalidation/?{query_string}')
+
+        queried = any('django_datetime_trunc' in query['sql'] for query in context.captured_queries)
+        return response, queried
+
+    def test_should_keep_levels_when_day_has_rows(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            Foo.objects.create(created=utc(2017, 1, 15, 16))
+
+        for query_string in ('', 'created__year=2017', 'created__year=2018'):
+            with self.subTest(query_string=query_string):
+                _, queried = self.get_changelist(query_string)
+                self.assertFalse(queried)
+
+    def test_should_invalidate_levels_of_new_day(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            Foo.objects.create(created=utc(2017, 3, 15, 15))
+
+        response, queried = self.get_changelist('created__year=2017')
+        self.assertTrue(queried)
+        self.assertContains(response, '?created__month=3&amp;created__year=2017')
+
+        # Other years are still cached.
+        _, queried = self.get_changelist('created__year=2018')
+        self.assertFalse(queried)
+
+    def test_should_invalidate_levels_of_deleted_day(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            Foo.objects.get(created=utc(2017, 2, 15, 15)).delete()
+
+        response, queried = self.get_changelist('created__year=2017')
+        self.assertTrue(queried)
+        self.assertNotContains(response, '?created__month=2&amp;created__year=2017')
+
+    def test_should_invalidate_filtered_levels_on_any_change(self) -> None:
+        january = Foo.objects.get(created=utc(2017, 1, 15, 15))
+        query_string = f'created__year=2017&id__gt={january.pk}'
+
+        response, queried = self.get_changelist(query_string)
+        self.assertTrue(queried)
+        self.assertNotContains(response, '?created__month=1&amp;created__year=2017')
+
+        # The day already has rows.
+        with self.captureOnCommitCallbacks(execute=True):
+            Foo.objects.create(created=utc(2017, 1, 15, 16))
+
+        response, queried = self.get_changelist(query_string)
+        self.assertTrue(queried)
+        self.assertContains(response, '?created__month=1&amp;created__year=2017')
+
+        # Levels without filters are kept.
+        _, queried = self.get_changelist('created__year=2017')
+        self.assertFalse(queried)
+
+    def test_should_invalidate_filtered_levels_when_day_is_unchanged(self) -> None:
+        foo = Foo.objects.get(created=utc(2017, 1, 15, 15))
+        january = Bar.objects.create(foo=foo, status='A', created=utc(2017, 1, 15, 15))
+        Bar.objects.create(foo=foo, status='B', created=utc(2017, 2, 15, 15))
+
+        url = '/admin/tests/barcacheinvalidation/?created__year=2017&status__exact=B'
+        response = self.client.get(url)
+        self.assertNotContains(response, '?created__month=1&amp;created__year=2017&amp;status__exact=B')
+
+        january.status = 'B'
+        with self.captureOnCommitCallbacks(execute=True):
+            january.save()
+
+        response = self.client.get(url)
+        self.assertContains(response, '?created__month=1&amp;created__year=2017&amp;status__exact=B')
+
+    def test_should_invalidate_after_commit(self) -> None:
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            Foo.objects.create(created=utc(2017, 3, 15, 15))
+
+            _, queried = self.get_changelist('created__year=2017')
+            self.assertFalse(queried)
+
+        for callback in callbacks:
+            callback()
+
+        _, queried = self.get_changelist('created__year=2017')
+        self.assertTrue(queried)
+
+    def test_should_invalidate_days_after_bulk_operation(self) -> None:
+        Foo.objects.bulk_create([Foo(created=utc(2017, 3, 15, 15))])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_date_hierarchy_cache(Foo, days=[datetime.date(2017, 3, 15)])
+
+        response, queried = self.get_changelist('created__year=2017')
+        self.assertTrue(queried)
+        self.assertContains(response, '?created__month=3&amp;created__year=2017')
+
+        _, queried = self.get_changelist('created__year=2018')
+        self.assertFalse(queried)
+
+    def test_should_invalidate_all_after_bulk_operation(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_date_hierarchy_cache(Foo)
+
+        _, queried = self.get_changelist('created__year=2018')
+        self.assertTrue(queried)
+
+
+class TestHasRowsOnDay(TestCase):
+    databases = {'default', 'replica'}
+
+    def test_should_check_rows_in_database(self) -> None:
+        Foo.objects.using('replica').bulk_create([Foo(created=utc(2017, 1, 15, 15))])
+        day = datetime.date(2017, 1, 15)
+
+        self.assertTrue(has_rows_on_day(Foo, 'created', day, 0, 'replica'))
+        self.assertFalse(has_rows_on_day(Foo, 'created', day, 1, 'replica'))
+        self.assertFalse(has_rows_on_day(Foo, 'created', day, 0))
+
+
+class TestGetLevelBucket(SimpleTestCase):
+
+    def test_should_get_level_bucket(self) -> None:
+        self.assertEqual(get_level_bucket('all'), 'all')
+        self.assertEqual(get_level_bucket('bounds'), 'all')
+        self.assertEqual(get_level_bucket('2017'), '2017')
+        self.assertEqual(get_level_bucket('2017-1'), '2017-1')
+        self.assertIsNone(get_level_bucket('estimate'))
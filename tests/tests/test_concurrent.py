@@ -0,0 +1,88 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Tuple
+from unittest import mock
+import datetime
+import threading
+
+from django.contrib.auth.models import User
+from django.db import connections
+from django.test import SimpleTestCase, TransactionTestCase
+from django.utils import timezone, translation
+
+from django_admin_lightweight_date_hierarchy import executor
+from django_admin_lightweight_date_hierarchy.executor import submit
+from django_admin_lightweight_date_hierarchy.signals import date_hierarchy_measured
+from ..models import Foo
+
+
+class TestSubmit(SimpleTestCase):
+
+    def test_should_call_in_thread_with_language_and_timezone(self) -> None:
+        def get_state() -> Tuple[str, str, str]:
+            return threading.current_thread().name, translation.get_language(), timezone.get_current_timezone_name()
+
+        with translation.override('fr'), timezone.override(datetime.timezone(datetime.timedelta(hours=9), 'Tokyo')):
+            future = submit(get_state)
+
+        thread_name, language, tz = future.result()
+        self.assertNotEqual(thread_name, threading.current_thread().name)
+        self.assertEqual(language, 'fr')
+        self.assertEqual(tz, 'Tokyo')
+
+
+class TestConcurrentDateHierarchy(TransactionTestCase):
+
+    def setUp(self) -> None:
+        # Committed, so they are visible to the connection of the executor thread.
+        Foo.objects.bulk_create([
+            Foo(created=datetime.datetime(*t, tzinfo=datetime.timezone.utc))
+            for t in [
+                (2017, 1, 15, 15),
+                (2017, 2, 15, 15),
+                (2018, 3, 15, 15),
+            ]
+        ])
+
+        superuser = User.objects.create_superuser(
+            username='foo',
+            email='foo@bar.bax',
+            password='a321321321',
+        )
+        self.client.force_login(superuser)
+
+        self.threads: List[str] = []
+
+        def receiver(sender: Any, **measurement: Any) -> None:
+            self.threads.append(threading.current_thread().name)
+
+        date_hierarchy_measured.connect(receiver, weak=False, dispatch_uid='test_concurrent')
+        self.addCleanup(date_hierarchy_measured.disconnect, dispatch_uid='test_concurrent')
+
+    def test_should_compute_date_hierarchy_in_thread(self) -> None:
+        response = self.client.get('/admin/tests/fooconcurrent/?created__year=2017')
+
+        self.assertContains(response, '?created__month=1&amp;created__year=2017')
+        self.assertContains(response, '?created__month=2&amp;created__year=2017')
+        self.assertNotContains(response, '?created__month=3&amp;created__year=2017')
+
+        [thread_name] = self.threads
+        self.assertTrue(thread_name.startswith('ldh'))
+
+    def test_should_keep_connection_of_thread_open(self) -> None:
+        pool = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(pool.shutdown)
+
+        with mock.patch.object(executor, '_executor', pool), \
+                mock.patch.dict(connections.settings['default'], CONN_MAX_AGE=None), \
+                mock.patch.object(type(connections['default']), 'close', autospec=True) as close:
+            self.assertTrue(submit(Foo.objects.exists).result())
+            self.assertTrue(submit(Foo.objects.exists).result())
+
+        # Persistent connections are reused by the next calls in the thread.
+        close.assert_not_called()
+
+    def test_should_select_start_level_in_thread(self) -> None:
+        response = self.client.get('/admin/tests/fooconcurrent/')
+
+        self.assertContains(response, '?created__year=2017')
+        self.assertContains(response, '?created__year=2018')
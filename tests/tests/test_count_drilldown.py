@@ -0,0 +1,80 @@
+from typing import List
+import datetime
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from django_admin_lightweight_date_hierarchy.templatetags.ldh_admin_list import with_count
+from ..models import Foo
+
+
+class TestCountDrilldown(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        Foo.objects.bulk_create([
+            Foo(id=id, created=datetime.datetime(*t, tzinfo=datetime.timezone.utc))
+            for id, t in [
+                (1, (2017, 1, 15, 15)),
+                (2, (2017, 1, 15, 16)),
+                (3, (2017, 1, 16, 15)),
+                (4, (2017, 3, 15, 15)),
+                (5, (2018, 3, 15, 15)),
+            ]
+        ])
+
+        cls.superuser = User.objects.create_superuser(
+            username='foo',
+            email='foo@bar.bax',
+            password='a321321321',
+        )
+
+    def setUp(self) -> None:
+        self.client.force_login(self.superuser)
+
+    def get_choices(self, endpoint: str) -> List[str]:
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(endpoint)
+
+        # A single grouped query, instead of the query of the distinct dates.
+        drilldown_queries = [
+            query['sql'] for query in context.captured_queries
+            if 'django_datetime_trunc' in query['sql']
+        ]
+        self.assertEqual(len(drilldown_queries), 1)
+        self.assertIn('GROUP BY', drilldown_queries[0])
+        self.assertNotIn('DISTINCT', drilldown_queries[0])
+
+        return [choice['title'] for choice in response.context['choices']]
+
+    def test_should_count_years(self) -> None:
+        self.assertEqual(self.get_choices('/admin/tests/foocount/'), ['2017 (4)', '2018 (1)'])
+
+    def test_should_count_months(self) -> None:
+        self.assertEqual(
+            self.get_choices('/admin/tests/foocount/?created__year=2017'),
+            ['January 2017 (3)', 'March 2017 (1)'],
+        )
+
+    def test_should_count_days(self) -> None:
+        self.assertEqual(
+            self.get_choices('/admin/tests/foocount/?created__year=2017&created__month=1'),
+            ['January 15 (2)', 'January 16 (1)'],
+        )
+
+    def test_should_apply_filters(self) -> None:
+        self.assertEqual(
+            self.get_choices('/admin/tests/foocount/?created__year=2017&id__gte=2'),
+            ['January 2017 (2)', 'March 2017 (1)'],
+        )
+
+
+class TestWithCount(SimpleTestCase):
+
+    def test_should_add_count_to_title(self) -> None:
+        self.assertEqual(with_count('March 2024', 12301), 'March 2024 (12,301)')
+        self.assertEqual(with_count('March 2024', None), 'March 2024')
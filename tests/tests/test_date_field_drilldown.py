@@ -0,0 +1,49 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from ..models import Baz
+
+
+class TestDateFieldDrilldown(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        Baz.objects.bulk_create([
+            Baz(created=datetime.date(*t))
+            for t in [
+                (2018, 12, 31),
+                (2019, 1, 15),
+            ]
+        ])
+
+        cls.superuser = User.objects.create_superuser(
+            username='foo',
+            email='foo@bar.bax',
+            password='a321321321',
+        )
+
+    def setUp(self) -> None:
+        self.client.force_login(self.superuser)
+
+    def test_should_drilldown_to_dates_in_non_default_timezone(self) -> None:
+        for model in ('bazdrilldown', 'bazcount', 'bazexists', 'bazsample'):
+            with self.subTest(model=model), timezone.override(datetime.timezone.utc):
+                response = self.client.get(f'/admin/tests/{model}/?created__year=2019')
+                self.assertContains(response, '?created__month=1&amp;created__year=2019')
+                self.assertNotContains(response, '?created__month=12&amp;created__year=2019')
+
+                response = self.client.get(f'/admin/tests/{model}/?created__year=2019&created__month=1')
+                self.assertContains(response, '?created__day=15&amp;created__month=1&amp;created__year=2019')
+                self.assertNotContains(response, 'created__day=31')
+
+    def test_should_skip_scan_years_in_non_default_timezone(self) -> None:
+        with timezone.override(datetime.timezone.utc):
+            response = self.client.get('/admin/tests/bazskipscanyears/')
+
+        self.assertContains(response, '?created__year=2018')
+        self.assertContains(response, '?created__year=2019')
@@ -2,7 +2,10 @@ import datetime
 from unittest import mock
 
 from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
 from ..models import Foo
 
@@ -113,6 +116,28 @@ class TestDateHierarchyDrilldown(TestCase):
             with self.assertNumQueries(4):
                 self.client.get(endpoint)
 
+    def test_should_drilldown_using_range_lookups(self) -> None:
+        for endpoint in (
+            '/admin/tests/foodrilldown/?created__year=2017',
+            '/admin/tests/foodrilldown/?created__year=2017&created__month=1',
+        ):
+            with CaptureQueriesContext(connection) as context:
+                self.client.get(endpoint)
+
+            for query in context.captured_queries:
+                self.assertNotIn('extract', query['sql'].lower())
+
+    def test_should_drilldown_in_current_timezone(self) -> None:
+        # 2018-12-31 in the default timezone (America/Chicago).
+        Foo.objects.create(created=datetime.datetime(2019, 1, 1, 3, tzinfo=datetime.timezone.utc))
+
+        with timezone.override(datetime.timezone.utc):
+            response = self.client.get('/admin/tests/foodrilldown/?created__year=2019')
+            self.assertContains(response, '?created__month=1&amp;created__year=2019')
+
+            response = self.client.get('/admin/tests/foodrilldown/?created__year=2019&created__month=1')
+            self.assertContains(response, '?created__day=1&amp;created__month=1&amp;created__year=2019')
+
     def test_should_apply_custom_drilldown_when_no_filter(self) -> None:
         response = self.client.get('/admin/tests/foocustomhierarchy/')
         self.assertContains(response, '?created__year=2018')
@@ -0,0 +1,133 @@
+import datetime
+import itertools
+import sqlite3
+from unittest import mock
+
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.db import DatabaseError, OperationalError
+from django.test import SimpleTestCase, TestCase
+
+from django_admin_lightweight_date_hierarchy.drilldown import is_statement_timeout
+
+from ..admin import FooAutoDrilldown
+from ..models import Foo
+
+
+class TestDrilldownTimeout(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        Foo.objects.bulk_create([
+            Foo(created=datetime.datetime(*t, tzinfo=datetime.timezone.utc))
+            for t in [
+                (2017, 1, 15, 15),
+                (2017, 2, 15, 15),
+                (2018, 3, 15, 15),
+            ]
+        ])
+
+        cls.superuser = User.objects.create_superuser(
+            username='foo',
+            email='foo@bar.bax',
+            password='a321321321',
+        )
+
+    def setUp(self) -> None:
+        self.client.force_login(self.superuser)
+
+        # Check the timeout on every instruction.
+        patcher = mock.patch(
+            'django_admin_lightweight_date_hierarchy.drilldown.SQLITE_PROGRESS_HANDLER_STEPS',
+            1,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @mock.patch('django_admin_lightweight_date_hierarchy.drilldown.time.monotonic')
+    def test_should_drilldown_within_timeout(self, mock_monotonic: mock.Mock) -> None:
+        mock_monotonic.return_value = 0
+
+        response = self.client.get('/admin/tests/foodrilldowntimeout/?created__year=2017')
+
+        for month in (1, 2):
+            self.assertContains(response, f'?created__month={month}&amp;created__year=2017')
+        self.assertNotContains(response, '?created__month=3&amp;created__year=2017')
+
+    @mock.patch('django_admin_lightweight_date_hierarchy.drilldown.time.monotonic')
+    def test_should_fall_back_when_timeout_exceeded(self, mock_monotonic: mock.Mock) -> None:
+        # Every check is a second later.
+        mock_monotonic.side_effect = itertools.count()
+
+        response = self.client.get('/admin/tests/foodrilldowntimeout/?created__year=2017')
+
+        for month in range(1, 13):
+            self.assertContains(response, f'?created__month={month}&amp;created__year=2017')
+
+    @mock.patch('django_admin_lightweight_date_hierarchy.templatetags.ldh_admin_list.get_today')
+    @mock.patch('django_admin_lightweight_date_hierarchy.drilldown.time.monotonic')
+    def test_should_start_from_top_level_when_timeout_exceeded(
+        self,
+        mock_monotonic: mock.Mock,
+        mock_today: mock.Mock,
+    ) -> None:
+        mock_monotonic.side_effect = itertools.count()
+        mock_today.return_value = datetime.date(2017, 1, 1)
+
+        response = self.client.get('/admin/tests/foodrilldowntimeout/')
+
+        for year in range(2014, 2021):
+            self.assertContains(response, f'?created__year={year}')
+
+    def test_should_raise_errors_other_than_timeout(self) -> None:
+        with mock.patch(
+            'django_admin_lightweight_date_hierarchy.templatetags.ldh_admin_list.query_date_hierarchy_drilldown',
+            side_effect=OperationalError('no such column: created'),
+        ):
+            with self.assertRaises(OperationalError):
+                self.client.get('/admin/tests/foodrilldowntimeout/?created__year=2017')
+
+    @mock.patch('django_admin_lightweight_date_hierarchy.drilldown.time.monotonic')
+    def test_should_disable_auto_drilldown_when_estimate_exceeds_timeout(self, mock_monotonic: mock.Mock) -> None:
+        mock_monotonic.side_effect = itertools.count()
+        model_admin = admin.site._registry[FooAutoDrilldown]
+        ids = ','.join(str(pk) for pk in Foo.objects.filter(created__year=2017).values_list('pk', flat=True))
+
+        # Below the threshold of 2 rows, drill-down would be enabled.
+        with mock.patch.object(model_admin, 'date_hierarchy_drilldown_timeout_ms', 100, create=True):
+            response = self.client.get(f'/admin/tests/fooautodrilldown/?created__year=2017&id__in={ids}')
+
+        for month in range(1, 13):
+            self.assertContains(response, f'?created__month={month}&amp;created__year=2017')
+
+
+class TestIsStatementTimeout(SimpleTestCase):
+
+    def wrap(self, cause: Exception) -> DatabaseError:
+        error = OperationalError(*cause.args)
+        error.__cause__ = cause
+        return error
+
+    def test_should_detect_statement_timeout(self) -> None:
+        postgresql_error = Exception('canceling statement due to statement timeout')
+        postgresql_error.pgcode = '57014'  # type: ignore[attr-defined]
+
+        for cause in (
+            postgresql_error,
+            sqlite3.OperationalError('interrupted'),
+            Exception(3024, 'Query execution was interrupted, maximum statement execution time exceeded'),
+            Exception(1969, 'Query execution was interrupted (max_statement_time exceeded)'),
+        ):
+            with self.subTest(cause=cause):
+                self.assertTrue(is_statement_timeout(self.wrap(cause)))
+
+    def test_should_not_detect_other_errors(self) -> None:
+        for cause in (
+            sqlite3.OperationalError('no such column: created'),
+            Exception(1054, "Unknown column 'created'"),
+            Exception('relation "foo" does not exist'),
+        ):
+            with self.subTest(cause=cause):
+                self.assertFalse(is_statement_timeout(self.wrap(cause)))
@@ -0,0 +1,51 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from ..models import Foo
+
+
+class TestDateHierarchyDrilldownUsing(TestCase):
+    databases = {'default', 'replica'}
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        Foo.objects.create(created=datetime.datetime(2017, 1, 15, 15, tzinfo=datetime.timezone.utc))
+
+        # The replica is not replicated in tests, so its dates are different.
+        Foo.objects.using('replica').bulk_create([
+            Foo(created=datetime.datetime(*t, tzinfo=datetime.timezone.utc))
+            for t in [
+                (2019, 1, 15, 15),
+                (2019, 2, 15, 15),
+                (2020, 3, 15, 15),
+            ]
+        ])
+
+        cls.superuser = User.objects.create_superuser(
+            username='foo',
+            email='foo@bar.bax',
+            password='a321321321',
+        )
+
+    def setUp(self) -> None:
+        self.client.force_login(self.superuser)
+
+    def test_should_query_drilldown_using_database(self) -> None:
+        response = self.client.get('/admin/tests/fooreplica/')
+
+        self.assertContains(response, '?created__year=2019')
+        self.assertContains(response, '?created__year=2020')
+        self.assertNotContains(response, '?created__year=2017')
+
+        # The results are queried from the default database.
+        self.assertEqual(response.context['cl'].result_count, 1)
+
+    def test_should_query_drilldown_levels_using_database(self) -> None:
+        response = self.client.get('/admin/tests/fooreplica/?created__year=2019')
+
+        self.assertContains(response, '?created__month=1&amp;created__year=2019')
+        self.assertContains(response, '?created__month=2&amp;created__year=2019')
@@ -0,0 +1,143 @@
+from typing import List
+import datetime
+
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from django_admin_lightweight_date_hierarchy.pagination import get_date_hierarchy_only_filter
+from ..admin import FooEstimatedCount
+from ..models import Foo
+
+
+def utc(year: int, month: int, day: int, hour: int) -> datetime.datetime:
+    return datetime.datetime(year, month, day, hour, tzinfo=datetime.timezone.utc)
+
+
+class TestEstimatedCount(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        # Maintained in the rollup.
+        for t in [
+            (2017, 1, 15, 15),
+            (2017, 1, 15, 16),
+            (2017, 2, 15, 15),
+            (2018, 3, 15, 15),
+        ]:
+            Foo.objects.create(created=utc(*t))
+
+        # Not in the rollup, so estimates and exact counts differ.
+        Foo.objects.bulk_create([Foo(created=utc(2017, 3, 15, 15))])
+
+        cls.superuser = User.objects.create_superuser(
+            username='foo',
+            email='foo@bar.bax',
+            password='a321321321',
+        )
+
+    def setUp(self) -> None:
+        self.client.force_login(self.superuser)
+
+    def get_count_queries(self, context: CaptureQueriesContext) -> List[str]:
+        return [
+            query['sql'] for query in context.captured_queries
+            if 'COUNT(' in query['sql'] and 'tests_foo' in query['sql']
+        ]
+
+    def test_should_estimate_count_from_rollup(self) -> None:
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/admin/tests/fooestimatedcount/?created__year=2017')
+
+        cl = response.context['cl']
+        self.assertEqual(cl.result_count, 3)
+        self.assertTrue(cl.result_count_estimated)
+        self.assertContains(response, 'The number of results is approximate.')
+        self.assertContains(response, 'href="?_exact_count=1&amp;created__year=2017"')
+        self.assertEqual(self.get_count_queries(context), [])
+
+    def test_should_estimate_count_of_all_rows_from_rollup(self) -> None:
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/admin/tests/fooestimatedcount/')
+
+        self.assertEqual(response.context['cl'].result_count, 4)
+        self.assertEqual(self.get_count_queries(context), [])
+
+    def test_should_serve_pages_past_estimate(self) -> None:
+        # The estimate (3) is missing the row created in bulk.
+        response = self.client.get('/admin/tests/fooestimatedcount/?created__year=2017&p=3')
+        cl = response.context['cl']
+        self.assertEqual(cl.result_count, 3)
+        self.assertTrue(cl.result_count_estimated)
+        self.assertEqual(len(cl.result_list), 1)
+        self.assertTrue(cl.paginator.page(3).has_next())
+
+        rows = set()
+        for page in range(1, 5):
+            response = self.client.get(f'/admin/tests/fooestimatedcount/?created__year=2017&p={page}')
+            rows.update(response.context['cl'].result_list)
+        self.assertEqual(rows, set(Foo.objects.filter(created__year=2017)))
+
+        response = self.client.get('/admin/tests/fooestimatedcount/?created__year=2017&p=5')
+        self.assertRedirects(response, '/admin/tests/fooestimatedcount/?e=1', fetch_redirect_response=False)
+
+    def test_should_not_show_all_rows_using_estimate(self) -> None:
+        response = self.client.get('/admin/tests/fooestimatedcount/?created__year=2017&all=')
+
+        cl = response.context['cl']
+        self.assertTrue(cl.result_count_estimated)
+        self.assertFalse(cl.can_show_all)
+        self.assertTrue(cl.multi_page)
+        self.assertEqual(len(cl.result_list), 1)
+
+    def test_should_count_exactly_on_request(self) -> None:
+        response = self.client.get('/admin/tests/fooestimatedcount/?created__year=2017&_exact_count=1')
+
+        cl = response.context['cl']
+        self.assertEqual(cl.result_count, 4)
+        self.assertFalse(cl.result_count_estimated)
+        self.assertNotContains(response, 'The number of results is approximate.')
+
+        # Links to other filters are estimated again.
+        self.assertContains(response, 'href="?created__month=1&amp;created__year=2017"')
+
+    def test_should_count_exactly_below_threshold(self) -> None:
+        response = self.client.get('/admin/tests/fooestimatedcount/?created__year=2018')
+
+        cl = response.context['cl']
+        self.assertEqual(cl.result_count, 1)
+        self.assertFalse(cl.result_count_estimated)
+
+    def test_should_count_exactly_when_filtered(self) -> None:
+        # There is no estimate of the planner in SQLite.
+        response = self.client.get('/admin/tests/fooestimatedcount/?created__year=2017&id__gte=0')
+
+        cl = response.context['cl']
+        self.assertEqual(cl.result_count, 4)
+        self.assertFalse(cl.result_count_estimated)
+
+
+class TestGetDateHierarchyOnlyFilter(SimpleTestCase):
+
+    def test_should_get_date_hierarchy_only_filter(self) -> None:
+        model_admin = admin.site._registry[FooEstimatedCount]
+
+        for query_string, expected in (
+            ('', {}),
+            ('created__year=2017&o=1&p=2&_exact_count=1', {'year': 2017}),
+            ('created__year=2017&created__month=2', {'year': 2017, 'month': 2}),
+            ('created__year=2017&created__month=2&created__day=3', {'year': 2017, 'month': 2, 'day': 3}),
+            ('created__year=2017&q=foo', None),
+            ('created__year=2017&id__gte=0', None),
+            ('created__year=2017&created__month=13', None),
+            ('created__year=2017&created__day=3', None),
+            ('created__month=2', None),
+            ('created__year=nope', None),
+        ):
+            with self.subTest(query_string=query_string):
+                request = RequestFactory().get(f'/?{query_string}')
+                self.assertEqual(get_date_hierarchy_only_filter(model_admin, request), expected)
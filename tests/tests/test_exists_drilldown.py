@@ -0,0 +1,71 @@
+from typing import List
+import datetime
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from ..models import Foo
+
+
+class TestExistsDrilldown(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        Foo.objects.bulk_create([
+            Foo(id=id, created=datetime.datetime(*t, tzinfo=datetime.timezone.utc))
+            for id, t in [
+                (1, (2017, 1, 15, 15)),
+                (2, (2017, 1, 16, 15)),
+                (3, (2017, 2, 15, 15)),
+                (4, (2017, 3, 15, 15)),
+                (5, (2018, 3, 15, 15)),
+            ]
+        ])
+
+        cls.superuser = User.objects.create_superuser(
+            username='foo',
+            email='foo@bar.bax',
+            password='a321321321',
+        )
+
+    def setUp(self) -> None:
+        self.client.force_login(self.superuser)
+
+    def get_drilldown_queries(self, endpoint: str) -> List[str]:
+        with CaptureQueriesContext(connection) as context:
+            self.response = self.client.get(endpoint)
+
+        return [query['sql'] for query in context.captured_queries if 'EXISTS' in query['sql']]
+
+    def test_should_show_months_with_data(self) -> None:
+        queries = self.get_drilldown_queries('/admin/tests/fooexists/?created__year=2017')
+
+        for month in (1, 2, 3):
+            self.assertContains(self.response, f'?created__month={month}&amp;created__year=2017')
+        for month in range(4, 13):
+            self.assertNotContains(self.response, f'?created__month={month}&amp;created__year=2017')
+
+        # All months are checked in a single query.
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('django_datetime_trunc', queries[0])
+
+    def test_should_show_days_with_data(self) -> None:
+        queries = self.get_drilldown_queries('/admin/tests/fooexists/?created__year=2017&created__month=1')
+
+        for day in range(1, 32):
+            link = f'?created__day={day}&amp;created__month=1&amp;created__year=2017'
+            if day in (15, 16):
+                self.assertContains(self.response, link)
+            else:
+                self.assertNotContains(self.response, link)
+
+        self.assertEqual(len(queries), 1)
+
+    def test_should_apply_filters(self) -> None:
+        self.get_drilldown_queries('/admin/tests/fooexists/?created__year=2017&id__exact=3')
+        self.assertContains(self.response, '?created__month=2&amp;created__year=2017&amp;id__exact=3')
+        self.assertNotContains(self.response, '?created__month=1&amp;created__year=2017&amp;id__exact=3')
@@ -0,0 +1,100 @@
+from typing import Any
+from unittest import mock
+import datetime
+
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.utils import translation
+
+from django_admin_lightweight_date_hierarchy.fragments import (
+    FragmentLRU,
+    get_fragment_cache_key,
+    get_fragment_lru,
+    is_fragment_cache_enabled,
+)
+from django_admin_lightweight_date_hierarchy.templatetags import ldh_admin_list
+from ..admin import FooCount, FooFragmentCache
+
+
+class TestFragmentCache(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        cls.superuser = User.objects.create_superuser(
+            username='foo',
+            email='foo@bar.bax',
+            password='a321321321',
+        )
+
+    def setUp(self) -> None:
+        cache.clear()
+        get_fragment_lru.cache_clear()
+        self.client.force_login(self.superuser)
+
+    def get_changelist(self, query_string: str) -> Any:
+        with mock.patch.object(
+            ldh_admin_list,
+            'get_date_hierarchy_context',
+            wraps=ldh_admin_list.get_date_hierarchy_context,
+        ) as get_date_hierarchy_context:
+            response = self.client.get(f'/admin/tests/foofragmentcache/?{query_string}')
+
+        self.rendered = get_date_hierarchy_context.called
+        return response
+
+    def test_should_render_once(self) -> None:
+        first = self.get_changelist('created__year=2017')
+        self.assertTrue(self.rendered)
+
+        second = self.get_changelist('created__year=2017')
+        self.assertFalse(self.rendered)
+
+        for response in (first, second):
+            self.assertContains(response, '<a href="?created__month=12&amp;created__year=2017">December 2017</a>')
+
+    def test_should_render_each_level(self) -> None:
+        self.get_changelist('created__year=2017')
+
+        response = self.get_changelist('created__year=2017&created__month=2')
+        self.assertTrue(self.rendered)
+        self.assertContains(response, 'February 28')
+
+    def test_should_share_fragments_using_cache(self) -> None:
+        self.get_changelist('created__year=2017')
+        get_fragment_lru.cache_clear()
+
+        self.get_changelist('created__year=2017')
+        self.assertFalse(self.rendered)
+
+    def test_should_key_on_language_and_today(self) -> None:
+        cl = self.get_changelist('created__year=2017').context['cl']
+        today = datetime.date(2017, 1, 1)
+
+        key = get_fragment_cache_key(cl, today)
+        self.assertEqual(key, get_fragment_cache_key(cl, today))
+        self.assertNotEqual(key, get_fragment_cache_key(cl, datetime.date(2017, 1, 2)))
+        with translation.override('fr'):
+            self.assertNotEqual(key, get_fragment_cache_key(cl, today))
+
+    def test_should_cache_only_without_drilldown(self) -> None:
+        self.assertTrue(is_fragment_cache_enabled(admin.site._registry[FooFragmentCache]))
+        self.assertFalse(is_fragment_cache_enabled(admin.site._registry[FooCount]))
+
+
+class TestFragmentLRU(SimpleTestCase):
+
+    def test_should_evict_least_recently_used(self) -> None:
+        lru = FragmentLRU(2)
+        lru.set('a', 'A')
+        lru.set('b', 'B')
+        self.assertEqual(lru.get('a'), 'A')
+
+        lru.set('c', 'C')
+
+        self.assertEqual(lru.get('a'), 'A')
+        self.assertIsNone(lru.get('b'))
+        self.assertEqual(lru.get('c'), 'C')
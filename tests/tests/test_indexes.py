@@ -0,0 +1,57 @@
+from typing import Any, List, Optional, Type
+from io import StringIO
+
+from django.contrib import admin
+from django.core.management import call_command
+from django.db import models
+from django.test import TestCase
+
+from django_admin_lightweight_date_hierarchy.indexes import (
+    MissingIndex,
+    check_date_hierarchy_indexes,
+    get_missing_date_hierarchy_indexes,
+)
+from ..models import Bar, Foo
+
+
+class TestDateHierarchyIndexes(TestCase):
+
+    def get_missing(self, model: Type[models.Model], **options: Any) -> Optional[List[MissingIndex]]:
+        model_admin = type('Admin', (admin.ModelAdmin,), options)(model, admin.site)
+        return get_missing_date_hierarchy_indexes(model_admin, 'default')
+
+    def test_should_find_missing_index(self) -> None:
+        self.assertEqual(self.get_missing(Foo, date_hierarchy='created'), [(Foo, ['created'])])
+
+    def test_should_find_index(self) -> None:
+        self.assertEqual(self.get_missing(Bar, date_hierarchy='created'), [])
+
+    def test_should_resolve_related_field(self) -> None:
+        self.assertEqual(self.get_missing(Bar, date_hierarchy='foo__created'), [(Foo, ['created'])])
+
+    def test_should_find_missing_composite_index_of_list_filter(self) -> None:
+        missing = self.get_missing(
+            Bar,
+            date_hierarchy='created',
+            list_filter=('status', ('foo', admin.RelatedOnlyFieldListFilter), 'id', 'foo__created'),
+        )
+
+        # status is indexed with created, id is unique and foo__created is on another model.
+        self.assertEqual(missing, [(Bar, ['foo', 'created'])])
+
+    def test_should_check_only_databases(self) -> None:
+        self.assertEqual(check_date_hierarchy_indexes(), [])
+
+    def test_should_warn_once_per_missing_index(self) -> None:
+        messages = check_date_hierarchy_indexes(databases=['default'])
+
+        [message] = [m for m in messages if m.id == 'django_admin_lightweight_date_hierarchy.W001']
+        self.assertIn("'tests.Foo.created' is not indexed in database 'default'", message.msg)
+        self.assertEqual(message.hint, "Add models.Index(fields=['created']) to the indexes of tests.Foo.")
+
+    def test_should_print_missing_indexes(self) -> None:
+        out = StringIO()
+        call_command('date_hierarchy_indexes', stdout=out)
+
+        self.assertIn('tests.Foo.Meta.indexes:\n', out.getvalue())
+        self.assertIn("    models.Index(fields=['created']),", out.getvalue())
@@ -0,0 +1,94 @@
+from typing import Any, Dict, List
+import datetime
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+
+from django_admin_lightweight_date_hierarchy.signals import date_hierarchy_measured
+from ..models import Foo
+from .. import admin
+
+
+class TestInstrumentation(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        Foo.objects.bulk_create([
+            Foo(created=datetime.datetime(*t, tzinfo=datetime.timezone.utc))
+            for t in [
+                (2017, 1, 15, 15),
+                (2017, 2, 15, 15),
+                (2018, 3, 15, 15),
+            ]
+        ])
+
+        cls.superuser = User.objects.create_superuser(
+            username='foo',
+            email='foo@bar.bax',
+            password='a321321321',
+        )
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client.force_login(self.superuser)
+
+        self.measurements: List[Dict[str, Any]] = []
+
+        def receiver(sender: Any, **measurement: Any) -> None:
+            self.measurements.append(measurement)
+
+        date_hierarchy_measured.connect(receiver, weak=False, dispatch_uid='test_instrumentation')
+        self.addCleanup(date_hierarchy_measured.disconnect, dispatch_uid='test_instrumentation')
+
+    def test_should_measure_drilldown_query(self) -> None:
+        self.client.get('/admin/tests/foodrilldown/?created__year=2017')
+
+        [measurement] = self.measurements
+        self.assertEqual(measurement['source'], 'drilldown')
+        self.assertIsInstance(measurement['model_admin'], admin.FooDrilldownAdmin)
+        self.assertEqual(measurement['level'], 'year')
+        self.assertEqual(measurement['strategy'], 'query')
+        self.assertEqual(measurement['queries'], 1)
+        self.assertEqual(measurement['choices'], 2)
+        self.assertGreater(measurement['duration'], 0)
+
+    def test_should_measure_static_drilldown(self) -> None:
+        self.client.get('/admin/tests/foonodrilldown/?created__year=2017&created__month=1')
+
+        [measurement] = self.measurements
+        self.assertEqual(measurement['level'], 'month')
+        self.assertEqual(measurement['strategy'], 'static')
+        self.assertEqual(measurement['queries'], 0)
+        self.assertEqual(measurement['choices'], 31)
+
+    def test_should_measure_cached_drilldown(self) -> None:
+        self.client.get('/admin/tests/foocacheddrilldown/?created__year=2017')
+        self.client.get('/admin/tests/foocacheddrilldown/?created__year=2017')
+
+        self.assertEqual([m['strategy'] for m in self.measurements], ['query', 'cached'])
+        self.assertEqual([m['queries'] for m in self.measurements], [1, 0])
+
+    def test_should_measure_filter(self) -> None:
+        self.client.get('/admin/tests/foowithrangebaseddatehierarchylistfilter/?created__year=2017')
+
+        self.assertEqual(
+            [(m['source'], m['level']) for m in self.measurements],
+            [('filter', 'year'), ('drilldown', 'year')],
+        )
+
+    def test_should_add_server_timing_header(self) -> None:
+        with self.settings(MIDDLEWARE=[
+            'django_admin_lightweight_date_hierarchy.middleware.DateHierarchyServerTimingMiddleware',
+            'django.contrib.sessions.middleware.SessionMiddleware',
+            'django.contrib.auth.middleware.AuthenticationMiddleware',
+            'django.contrib.messages.middleware.MessageMiddleware',
+        ]):
+            response = self.client.get('/admin/tests/foodrilldown/?created__year=2017')
+
+        self.assertRegex(
+            response['Server-Timing'],
+            r'^ldh-drilldown;dur=\d+\.\d;desc="query year, 1 queries, 2 choices"$',
+        )
@@ -0,0 +1,102 @@
+from typing import List, Optional
+import datetime
+import html
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from ..models import Foo
+
+
+class TestKeysetPagination(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        Foo.objects.bulk_create([
+            Foo(id=id, created=datetime.datetime(*t, tzinfo=datetime.timezone.utc))
+            for id, t in [
+                (1, (2017, 1, 15, 15)),
+                (2, (2017, 1, 16, 15)),
+                (3, (2017, 1, 16, 15)),
+                (4, (2017, 1, 17, 15)),
+                (5, (2017, 1, 18, 15)),
+                (6, (2018, 1, 18, 15)),
+            ]
+        ])
+
+        cls.superuser = User.objects.create_superuser(
+            username='foo',
+            email='foo@bar.bax',
+            password='a321321321',
+        )
+
+    def setUp(self) -> None:
+        self.client.force_login(self.superuser)
+
+    def get_page(self, url: str) -> List[int]:
+        self.response = self.client.get(url)
+        self.assertEqual(self.response.status_code, 200)
+        return [foo.pk for foo in self.response.context['cl'].result_list]
+
+    def get_link(self, name: str) -> Optional[str]:
+        url: Optional[str] = getattr(self.response.context['cl'], f'keyset_{name}_url')
+        return None if url is None else f'/admin/tests/fookeyset/{url}'
+
+    def test_should_paginate_forwards_and_backwards(self) -> None:
+        self.assertEqual(self.get_page('/admin/tests/fookeyset/?created__year=2017'), [5, 4])
+        self.assertIsNone(self.get_link('previous'))
+
+        next_link = self.get_link('next')
+        assert next_link is not None
+        self.assertIn('_after=', next_link)
+        self.assertContains(self.response, html.escape(self.response.context['cl'].keyset_next_url))
+
+        self.assertEqual(self.get_page(next_link), [3, 2])
+        next_link = self.get_link('next')
+        assert next_link is not None
+
+        self.assertEqual(self.get_page(next_link), [1])
+        self.assertIsNone(self.get_link('next'))
+        previous_link = self.get_link('previous')
+        assert previous_link is not None
+
+        self.assertEqual(self.get_page(previous_link), [3, 2])
+        previous_link = self.get_link('previous')
+        assert previous_link is not None
+
+        self.assertEqual(self.get_page(previous_link), [5, 4])
+        self.assertIsNone(self.get_link('previous'))
+
+    def test_should_seek_without_offset(self) -> None:
+        self.get_page('/admin/tests/fookeyset/?created__year=2017')
+        next_link = self.get_link('next')
+        assert next_link is not None
+
+        with CaptureQueriesContext(connection) as context:
+            self.get_page(next_link)
+
+        [results_query] = [query['sql'] for query in context.captured_queries if 'LIMIT 3' in query['sql']]
+        self.assertNotIn('OFFSET', results_query)
+
+    def test_should_not_keep_cursor_in_other_links(self) -> None:
+        self.get_page('/admin/tests/fookeyset/?created__year=2017')
+        next_link = self.get_link('next')
+        assert next_link is not None
+        self.get_page(next_link)
+
+        cl = self.response.context['cl']
+        self.assertNotIn('_after', cl.get_query_string({'o': '1'}))
+
+    def test_should_paginate_using_offset_when_not_ordered_by_date_hierarchy(self) -> None:
+        self.assertEqual(self.get_page('/admin/tests/fookeyset/?o=1'), [1, 2])
+        self.assertFalse(self.response.context['cl'].keyset_pagination)
+        self.assertContains(self.response, '?o=1&amp;p=2')
+
+    def test_should_reject_invalid_cursor(self) -> None:
+        response = self.client.get('/admin/tests/fookeyset/?_after=nope_1')
+
+        self.assertRedirects(response, '/admin/tests/fookeyset/?e=1', fetch_redirect_response=False)
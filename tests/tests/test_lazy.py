@@ -0,0 +1,94 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from ..models import Foo
+
+
+class TestLazyDateHierarchy(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        Foo.objects.bulk_create([
+            Foo(created=datetime.datetime(*t, tzinfo=datetime.timezone.utc))
+            for t in [
+                (2017, 1, 15, 15),
+                (2017, 2, 15, 15),
+                (2018, 3, 15, 15),
+            ]
+        ])
+
+        cls.superuser = User.objects.create_superuser(
+            username='foo',
+            email='foo@bar.bax',
+            password='a321321321',
+        )
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client.force_login(self.superuser)
+
+    def test_should_render_placeholder_without_drilldown_queries(self) -> None:
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/admin/tests/foolazy/?created__year=2017')
+
+        self.assertContains(
+            response,
+            'data-date-hierarchy-url="/admin/tests/foolazy/date_hierarchy/?created__year=2017"',
+        )
+        self.assertContains(response, 'django_admin_lightweight_date_hierarchy/date_hierarchy.js')
+        self.assertNotContains(response, '?created__month=2&amp;created__year=2017')
+
+        for query in context.captured_queries:
+            self.assertNotIn('django_datetime_trunc', query['sql'])
+
+    def test_should_get_date_hierarchy_from_view(self) -> None:
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/admin/tests/foolazy/date_hierarchy/?created__year=2017')
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['back'], {'link': '?', 'title': 'All dates'})
+        self.assertEqual(data['choices'], [
+            {'link': '?created__month=1&created__year=2017', 'title': 'January 2017'},
+            {'link': '?created__month=2&created__year=2017', 'title': 'February 2017'},
+        ])
+        self.assertIn('href="?created__month=2&amp;created__year=2017"', data['html'])
+
+        # The results of the change list are not queried.
+        foo_queries = [query['sql'] for query in context.captured_queries if 'tests_foo' in query['sql']]
+        self.assertEqual(len(foo_queries), 1)
+        self.assertIn('django_datetime_trunc', foo_queries[0])
+
+    def test_should_select_start_level_in_view(self) -> None:
+        Foo.objects.exclude(created__year=2017, created__month=1).delete()
+
+        response = self.client.get('/admin/tests/foolazy/date_hierarchy/')
+
+        self.assertEqual(response.json()['choices'], [
+            {'link': '?created__day=15&created__month=1&created__year=2017', 'title': 'January 15'},
+        ])
+
+    def test_should_cache_view_response(self) -> None:
+        response = self.client.get('/admin/tests/foolazy/date_hierarchy/')
+
+        self.assertIn('private', response['Cache-Control'])
+        self.assertIn('max-age=60', response['Cache-Control'])
+
+    def test_should_reject_incorrect_lookup_parameters(self) -> None:
+        response = self.client.get('/admin/tests/foolazy/date_hierarchy/?nope=1')
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_should_require_login(self) -> None:
+        self.client.logout()
+
+        response = self.client.get('/admin/tests/foolazy/date_hierarchy/')
+
+        self.assertEqual(response.status_code, 302)
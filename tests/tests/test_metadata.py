@@ -0,0 +1,50 @@
+from unittest import mock
+
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from django_admin_lightweight_date_hierarchy import metadata
+from django_admin_lightweight_date_hierarchy.metadata import get_date_hierarchy_metadata
+from ..admin import FooCount, FooNoDrilldown
+from ..models import Foo
+
+
+class TestDateHierarchyMetadata(TestCase):
+
+    def test_should_resolve_metadata(self) -> None:
+        model_admin = admin.site._registry[FooCount]
+        date_hierarchy_metadata = get_date_hierarchy_metadata(model_admin)
+
+        self.assertEqual(date_hierarchy_metadata.field_name, 'created')
+        self.assertEqual(date_hierarchy_metadata.field, Foo._meta.get_field('created'))
+        self.assertTrue(date_hierarchy_metadata.is_datetime)
+        self.assertEqual(date_hierarchy_metadata.lookups, {
+            'year': 'created__year',
+            'month': 'created__month',
+            'day': 'created__day',
+        })
+        match = date_hierarchy_metadata.param_re.match('created__month')
+        assert match is not None
+        self.assertEqual(match.group(1), 'month')
+        self.assertIsNone(date_hierarchy_metadata.param_re.match('createdXmonth'))
+        self.assertEqual(date_hierarchy_metadata.drilldown, 'count')
+
+    def test_should_resolve_metadata_once(self) -> None:
+        model_admin = admin.site._registry[FooNoDrilldown]
+
+        self.assertIs(get_date_hierarchy_metadata(model_admin), get_date_hierarchy_metadata(model_admin))
+
+    def test_should_not_resolve_field_on_request(self) -> None:
+        superuser = User.objects.create_superuser(
+            username='foo',
+            email='foo@bar.bax',
+            password='a321321321',
+        )
+        self.client.force_login(superuser)
+        self.client.get('/admin/tests/foocount/?created__year=2017')
+
+        with mock.patch.object(metadata, 'get_fields_from_path') as get_fields_from_path:
+            self.client.get('/admin/tests/foocount/?created__year=2017')
+
+        get_fields_from_path.assert_not_called()
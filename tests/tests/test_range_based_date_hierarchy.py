@@ -1,9 +1,15 @@
 from typing import Set
+from unittest import skipIf
 import datetime
 
+import django
+
 from django.utils import timezone
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase, RequestFactory
+from django.test.utils import CaptureQueriesContext
 
 from django_admin_lightweight_date_hierarchy.admin import DateHierarchy, get_date_range_for_hierarchy
 from ..models import Foo
@@ -45,6 +51,7 @@ class TestGetDateRangeForHierarchy(TestCase):
 
 
 class TestRangeBasedDateHierarchyListFilter(TestCase):
+    changelist_url = '/admin/tests/foowithrangebaseddatehierarchylistfilter/'
 
     @classmethod
     def setUpTestData(cls) -> None:
@@ -79,7 +86,7 @@ class TestRangeBasedDateHierarchyListFilter(TestCase):
         self.client.force_login(self.superuser)
 
     def get_results(self, query: str) -> Set[int]:
-        url = f'/admin/tests/foowithrangebaseddatehierarchylistfilter/?{query}'
+        url = f'{self.changelist_url}?{query}'
         request = self.factory.get(url)
         response = self.client.get(url)
         cl = response.context_data['cl']
@@ -98,3 +105,59 @@ class TestRangeBasedDateHierarchyListFilter(TestCase):
     def test_should_filter_day(self) -> None:
         self.assertEqual(self.get_results('created__year=2018&created__month=2&created__day=28'), {7})
         self.assertEqual(self.get_results('created__year=2018&created__month=2&created__day=27'), set())
+
+    @skipIf(django.VERSION < (5, 0), 'Facets were added in Django 5.0')
+    def test_should_count_facets_of_months(self) -> None:
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(f'{self.changelist_url}?created__year=2017&_facets=1')
+
+        for title in ('January 2017 (2)', 'February 2017 (1)', 'April 2017 (0)', 'December 2017 (1)'):
+            self.assertContains(response, title)
+        self.assertContains(response, '?_facets=1&amp;created__month=2&amp;created__year=2017')
+
+        # All months are counted in a single query.
+        facet_queries = [query['sql'] for query in context.captured_queries if '"0__c"' in query['sql']]
+        self.assertEqual(len(facet_queries), 1)
+        self.assertIn('"11__c"', facet_queries[0])
+
+    @skipIf(django.VERSION < (5, 0), 'Facets were added in Django 5.0')
+    def test_should_count_facets_of_days(self) -> None:
+        response = self.client.get(f'{self.changelist_url}?created__year=2018&created__month=3&_facets=1')
+
+        for title in ('March 1 (1)', 'March 2 (0)', 'March 15 (1)'):
+            self.assertContains(response, title)
+
+    def test_should_not_count_facets_when_disabled(self) -> None:
+        response = self.client.get(f'{self.changelist_url}?created__year=2017')
+
+        self.assertNotContains(response, 'January 2017 (2)')
+
+
+class TestPrimaryKeyRangeBasedDateHierarchyListFilter(TestRangeBasedDateHierarchyListFilter):
+    changelist_url = '/admin/tests/foowithpkrangebaseddatehierarchylistfilter/'
+
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+
+    def test_should_filter_on_primary_key_range(self) -> None:
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(f'{self.changelist_url}?created__year=2018&created__month=2')
+
+        [results_query] = [
+            query['sql']
+            for query in context.captured_queries
+            if 'ORDER BY "tests_foo"."id" DESC' in query['sql']
+        ]
+        self.assertIn('"tests_foo"."id" >= 7', results_query)
+        self.assertIn('"tests_foo"."id" < 8', results_query)
+        self.assertNotIn('"tests_foo"."created" >=', results_query)
+
+    def test_should_cache_primary_key_bounds(self) -> None:
+        self.get_results('created__year=2017')
+
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(self.get_results('created__year=2017'), {1, 2, 3, 4, 5})
+
+        for query in context.captured_queries:
+            self.assertNotIn('ORDER BY "tests_foo"."created" ASC', query['sql'])
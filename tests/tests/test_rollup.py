@@ -0,0 +1,137 @@
+from typing import Dict
+import datetime
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from django_admin_lightweight_date_hierarchy.models import DateHierarchyRollup
+from ..models import Foo
+
+
+def utc(year: int, month: int, day: int, hour: int) -> datetime.datetime:
+    return datetime.datetime(year, month, day, hour, tzinfo=datetime.timezone.utc)
+
+
+class TestDateHierarchyRollup(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        # Created one by one to maintain the rollup using signals.
+        for t in [
+            (2017, 1, 15, 15),
+            (2017, 1, 15, 16),
+            (2017, 2, 15, 15),
+            (2018, 3, 15, 15),
+        ]:
+            Foo.objects.create(created=utc(*t))
+
+        cls.superuser = User.objects.create_superuser(
+            username='foo',
+            email='foo@bar.bax',
+            password='a321321321',
+        )
+
+    def setUp(self) -> None:
+        self.client.force_login(self.superuser)
+
+    def get_rollup(self) -> Dict[datetime.date, int]:
+        return dict(DateHierarchyRollup.objects.values_list('day', 'count'))
+
+    def test_should_maintain_rollup_on_save(self) -> None:
+        self.assertEqual(self.get_rollup(), {
+            datetime.date(2017, 1, 15): 2,
+            datetime.date(2017, 2, 15): 1,
+            datetime.date(2018, 3, 15): 1,
+        })
+
+        foo = Foo.objects.get(created=utc(2018, 3, 15, 15))
+        foo.created = utc(2018, 3, 16, 15)
+        foo.save()
+
+        self.assertEqual(self.get_rollup(), {
+            datetime.date(2017, 1, 15): 2,
+            datetime.date(2017, 2, 15): 1,
+            datetime.date(2018, 3, 16): 1,
+        })
+
+    def test_should_maintain_rollup_on_delete(self) -> None:
+        Foo.objects.get(created=utc(2017, 1, 15, 15)).delete()
+        Foo.objects.get(created=utc(2017, 2, 15, 15)).delete()
+
+        self.assertEqual(self.get_rollup(), {
+            datetime.date(2017, 1, 15): 1,
+            datetime.date(2018, 3, 15): 1,
+        })
+
+    def test_should_rebuild_rollup(self) -> None:
+        DateHierarchyRollup.objects.all().delete()
+        Foo.objects.bulk_create([Foo(created=utc(2019, 1, 1, 15))])
+
+        out = StringIO()
+        call_command('rebuild_date_hierarchy_rollup', 'tests.foorollup', stdout=out)
+
+        self.assertIn('tests.Foo.created: 4 days', out.getvalue())
+        self.assertEqual(self.get_rollup(), {
+            datetime.date(2017, 1, 15): 2,
+            datetime.date(2017, 2, 15): 1,
+            datetime.date(2018, 3, 15): 1,
+            datetime.date(2019, 1, 1): 1,
+        })
+
+    def test_should_drilldown_from_rollup(self) -> None:
+        for endpoint, expected_links in (
+            ('/admin/tests/foorollup/', ['?created__year=2017', '?created__year=2018']),
+            ('/admin/tests/foorollup/?created__year=2017', [
+                '?created__month=1&amp;created__year=2017',
+                '?created__month=2&amp;created__year=2017',
+            ]),
+            ('/admin/tests/foorollup/?created__year=2017&created__month=1', [
+                '?created__day=15&amp;created__month=1&amp;created__year=2017',
+            ]),
+        ):
+            with self.subTest(endpoint=endpoint):
+                with CaptureQueriesContext(connection) as context:
+                    response = self.client.get(endpoint)
+
+                for link in expected_links:
+                    self.assertContains(response, link)
+
+                self.assertNotContains(response, 'created__day=16')
+                self.assertNotContains(response, 'created__month=3&amp;created__year=2017')
+
+                for query in context.captured_queries:
+                    self.assertNotIn('django_datetime_trunc', query['sql'])
+                    self.assertNotIn('MIN("tests_foo"', query['sql'])
+
+
+class TestDateHierarchyRollupUsing(TestCase):
+    databases = {'default', 'replica'}
+
+    def get_rollup(self, using: str) -> Dict[datetime.date, int]:
+        return dict(DateHierarchyRollup.objects.using(using).values_list('day', 'count'))
+
+    def test_should_maintain_rollup_in_database_of_row(self) -> None:
+        foo = Foo.objects.using('replica').create(created=utc(2017, 1, 15, 15))
+        Foo.objects.using('replica').create(created=utc(2017, 1, 15, 16))
+
+        self.assertEqual(self.get_rollup('replica'), {datetime.date(2017, 1, 15): 2})
+        self.assertEqual(self.get_rollup('default'), {})
+
+        foo.created = utc(2017, 2, 15, 15)
+        foo.save()
+
+        self.assertEqual(self.get_rollup('replica'), {
+            datetime.date(2017, 1, 15): 1,
+            datetime.date(2017, 2, 15): 1,
+        })
+
+        foo.delete()
+
+        self.assertEqual(self.get_rollup('replica'), {datetime.date(2017, 1, 15): 1})
+        self.assertEqual(self.get_rollup('default'), {})
@@ -0,0 +1,88 @@
+import datetime
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from django_admin_lightweight_date_hierarchy import drilldown
+from django_admin_lightweight_date_hierarchy.drilldown import sample_dates
+from ..models import Foo
+
+
+class TestSampleDrilldown(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        Foo.objects.bulk_create([
+            Foo(created=datetime.datetime(2017, month, 15, 15, tzinfo=datetime.timezone.utc))
+            for month in (1, 3, 5)
+            for _ in range(100)
+        ])
+
+        cls.superuser = User.objects.create_superuser(
+            username='foo',
+            email='foo@bar.bax',
+            password='a321321321',
+        )
+
+    def setUp(self) -> None:
+        self.client.force_login(self.superuser)
+
+    def test_should_sample_all_rows(self) -> None:
+        self.assertEqual(sample_dates(Foo.objects.all(), 'created', 'month', 100), [
+            datetime.date(2017, 1, 1),
+            datetime.date(2017, 3, 1),
+            datetime.date(2017, 5, 1),
+        ])
+
+    def test_should_sample_primary_key_ranges(self) -> None:
+        with self.assertNumQueries(3):
+            dates = sample_dates(Foo.objects.all(), 'created', 'month', 1)
+
+        self.assertTrue(dates)
+        self.assertLessEqual(set(dates), {
+            datetime.date(2017, 1, 1),
+            datetime.date(2017, 3, 1),
+            datetime.date(2017, 5, 1),
+        })
+
+    def test_should_sample_primary_key_range_of_queryset(self) -> None:
+        Foo.objects.bulk_create([
+            Foo(created=datetime.datetime(2018, 1, 15, 15, tzinfo=datetime.timezone.utc))
+            for _ in range(5000)
+        ])
+        date_range = (
+            datetime.datetime(2017, 3, 1, tzinfo=datetime.timezone.utc),
+            datetime.datetime(2017, 4, 1, tzinfo=datetime.timezone.utc),
+        )
+        queryset = Foo.objects.filter(created__gte=date_range[0], created__lt=date_range[1])
+
+        # Every probe falls in the primary keys of the period, not of the table,
+        # found with one lookup for each bound.
+        for _ in range(10):
+            with self.assertNumQueries(3):
+                dates = sample_dates(queryset, 'created', 'day', 1, date_range)
+            self.assertEqual(dates, [datetime.date(2017, 3, 15)])
+
+    def test_should_merge_sample_with_candidates(self) -> None:
+        sampled = [datetime.date(2017, 1, 1), datetime.date(2017, 3, 1)]
+
+        with mock.patch.object(drilldown, 'sample_dates', return_value=sampled):
+            response = self.client.get('/admin/tests/foosample/?created__year=2017')
+
+        # February is between the sampled months, May was not sampled.
+        self.assertContains(response, '?created__month=1&amp;created__year=2017')
+        self.assertContains(response, '?created__month=2&amp;created__year=2017')
+        self.assertContains(response, '?created__month=3&amp;created__year=2017')
+        self.assertNotContains(response, '?created__month=4&amp;created__year=2017')
+        self.assertNotContains(response, '?created__month=5&amp;created__year=2017')
+
+    def test_should_query_when_sample_is_empty(self) -> None:
+        with mock.patch.object(drilldown, 'sample_dates', return_value=[]):
+            response = self.client.get('/admin/tests/foosample/?created__year=2017')
+
+        self.assertContains(response, '?created__month=1&amp;created__year=2017')
+        self.assertNotContains(response, '?created__month=2&amp;created__year=2017')
+        self.assertContains(response, '?created__month=5&amp;created__year=2017')
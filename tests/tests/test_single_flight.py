@@ -0,0 +1,223 @@
+from typing import Any, Dict, List, Tuple
+from unittest import mock
+import datetime
+import threading
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from django_admin_lightweight_date_hierarchy.instrumentation import measure
+from django_admin_lightweight_date_hierarchy.signals import date_hierarchy_measured
+from django_admin_lightweight_date_hierarchy.singleflight import coalesce, compute_with_cache_lock
+from ..models import Foo
+
+
+def utc(year: int, month: int, day: int, hour: int) -> datetime.datetime:
+    return datetime.datetime(year, month, day, hour, tzinfo=datetime.timezone.utc)
+
+
+class TestCoalesce(SimpleTestCase):
+
+    def run_followers(self, key: str, compute: Any, count: int) -> Tuple[List[threading.Thread], List[Any]]:
+        results: List[Any] = []
+
+        def follow() -> None:
+            try:
+                results.append(coalesce(key, compute))
+            except Exception as e:
+                results.append(e)
+
+        threads = [threading.Thread(target=follow) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        return threads, results
+
+    def test_should_compute_once_for_concurrent_calls(self) -> None:
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def compute() -> int:
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return 42
+
+        leader = threading.Thread(target=coalesce, args=('key', compute))
+        leader.start()
+        started.wait(5)
+
+        threads, results = self.run_followers('key', compute, 3)
+        release.set()
+        leader.join()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [42, 42, 42])
+
+    def test_should_raise_exception_in_followers(self) -> None:
+        started = threading.Event()
+        release = threading.Event()
+
+        def compute() -> int:
+            started.set()
+            release.wait(5)
+            raise ValueError('failed')
+
+        def lead() -> None:
+            with self.assertRaises(ValueError):
+                coalesce('key', compute)
+
+        leader = threading.Thread(target=lead)
+        leader.start()
+        started.wait(5)
+
+        threads, results = self.run_followers('key', compute, 2)
+        release.set()
+        leader.join()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([type(result) for result in results], [ValueError, ValueError])
+
+    def test_should_compute_again_after_flight_landed(self) -> None:
+        calls = []
+
+        def compute() -> int:
+            calls.append(1)
+            return len(calls)
+
+        self.assertEqual(coalesce('key', compute), 1)
+        self.assertEqual(coalesce('key', compute), 2)
+
+    def test_should_not_coalesce_different_keys(self) -> None:
+        self.assertEqual(coalesce('a', lambda: 1), 1)
+        self.assertEqual(coalesce('b', lambda: 2), 2)
+
+    def test_should_record_coalesced_strategy(self) -> None:
+        started = threading.Event()
+        release = threading.Event()
+
+        def compute() -> int:
+            started.set()
+            release.wait(5)
+            return 42
+
+        leader = threading.Thread(target=coalesce, args=('key', compute))
+        leader.start()
+        started.wait(5)
+
+        timer = threading.Timer(0.1, release.set)
+        timer.start()
+        with measure('drilldown', mock.Mock(), 'default') as measurement:
+            self.assertEqual(coalesce('key', compute), 42)
+        leader.join()
+        timer.join()
+
+        self.assertEqual(measurement['strategy'], 'coalesced')
+        self.assertEqual(measurement['queries'], 0)
+
+
+class TestComputeWithCacheLock(SimpleTestCase):
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_should_compute_set_and_release_lock(self) -> None:
+        value = compute_with_cache_lock(cache, 'key', lambda: 42, 60, 1)
+
+        self.assertEqual(value, 42)
+        self.assertEqual(cache.get('key'), 42)
+        self.assertIsNone(cache.get('key:lock'))
+
+    def test_should_release_lock_on_exception(self) -> None:
+        def compute() -> int:
+            raise ValueError('failed')
+
+        with self.assertRaises(ValueError):
+            compute_with_cache_lock(cache, 'key', compute, 60, 1)
+
+        self.assertIsNone(cache.get('key:lock'))
+
+    def test_should_wait_for_value_of_lock_holder(self) -> None:
+        cache.add('key:lock', 1, 5)
+        timer = threading.Timer(0.1, lambda: cache.set('key', 42, 60))
+        timer.start()
+
+        compute = mock.Mock(return_value=0)
+        value = compute_with_cache_lock(cache, 'key', compute, 60, 5)
+        timer.join()
+
+        self.assertEqual(value, 42)
+        compute.assert_not_called()
+
+        # The lock of the holder is not released by the waiter.
+        self.assertEqual(cache.get('key:lock'), 1)
+
+    def test_should_compute_when_lock_is_not_released(self) -> None:
+        cache.add('key:lock', 1, 5)
+
+        value = compute_with_cache_lock(cache, 'key', lambda: 42, 60, 0.1)
+
+        self.assertEqual(value, 42)
+        self.assertEqual(cache.get('key'), 42)
+        self.assertEqual(cache.get('key:lock'), 1)
+
+
+class TestSingleFlight(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        Foo.objects.bulk_create([
+            Foo(created=utc(*t))
+            for t in [
+                (2017, 1, 15, 15),
+                (2018, 3, 15, 15),
+            ]
+        ])
+
+        cls.superuser = User.objects.create_superuser(
+            username='foo',
+            email='foo@bar.bax',
+            password='a321321321',
+        )
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client.force_login(self.superuser)
+
+    def get_changelist(self) -> Dict[str, Any]:
+        measurements: List[Dict[str, Any]] = []
+
+        def receiver(**kwargs: Any) -> None:
+            measurements.append(kwargs)
+
+        date_hierarchy_measured.connect(receiver)
+        try:
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get('/admin/tests/foosingleflight/')
+        finally:
+            date_hierarchy_measured.disconnect(receiver)
+
+        self.assertContains(response, '?created__year=2017')
+        self.assertContains(response, '?created__year=2018')
+
+        queried = any('django_datetime_trunc' in query['sql'] for query in context.captured_queries)
+        return {'queried': queried, 'strategy': measurements[0]['strategy']}
+
+    def test_should_compute_and_cache(self) -> None:
+        self.assertEqual(self.get_changelist(), {'queried': True, 'strategy': 'query'})
+        self.assertEqual(self.get_changelist(), {'queried': False, 'strategy': 'cached'})
+
+    def test_should_compute_when_lock_is_held_by_another_process(self) -> None:
+        with mock.patch.object(LocMemCache, 'add', return_value=False):
+            self.assertEqual(self.get_changelist(), {'queried': True, 'strategy': 'query'})
+
+        self.assertEqual(self.get_changelist(), {'queried': False, 'strategy': 'cached'})
@@ -0,0 +1,52 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from ..models import Foo
+
+
+class TestSkipScanYears(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        Foo.objects.bulk_create([
+            Foo(created=datetime.datetime(*t, tzinfo=datetime.timezone.utc))
+            for t in [
+                (2015, 6, 15, 15),
+                (2017, 1, 15, 15),
+                (2017, 2, 15, 15),
+                # 2017-12-31 in the default timezone (America/Chicago).
+                (2018, 1, 1, 3),
+                (2020, 3, 15, 15),
+            ]
+        ])
+
+        cls.superuser = User.objects.create_superuser(
+            username='foo',
+            email='foo@bar.bax',
+            password='a321321321',
+        )
+
+    def setUp(self) -> None:
+        self.client.force_login(self.superuser)
+
+    def test_should_show_years_with_data(self) -> None:
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/admin/tests/fooskipscanyears/')
+
+        for year in (2015, 2017, 2020):
+            self.assertContains(response, f'?created__year={year}')
+        for year in (2016, 2018, 2019):
+            self.assertNotContains(response, f'?created__year={year}')
+
+        # One query for each year, and one to find there are no more years.
+        probes = [query for query in context.captured_queries if query['sql'].endswith('LIMIT 1')]
+        self.assertEqual(len(probes), 4)
+
+        for query in context.captured_queries:
+            self.assertNotIn('django_datetime_trunc', query['sql'])
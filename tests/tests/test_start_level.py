@@ -0,0 +1,62 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from ..models import Foo
+
+
+class TestDateHierarchyStartLevel(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        # All data in the same month.
+        Foo.objects.bulk_create([
+            Foo(created=datetime.datetime(*t, tzinfo=datetime.timezone.utc))
+            for t in [
+                (2017, 1, 15, 15),
+                (2017, 1, 16, 15),
+            ]
+        ])
+
+        cls.superuser = User.objects.create_superuser(
+            username='foo',
+            email='foo@bar.bax',
+            password='a321321321',
+        )
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client.force_login(self.superuser)
+
+    def test_should_select_start_level_using_limit(self) -> None:
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/admin/tests/foolimitstartlevel/')
+
+        for day in (15, 16):
+            self.assertContains(response, f'?created__day={day}&amp;created__month=1&amp;created__year=2017')
+
+        for query in context.captured_queries:
+            self.assertNotIn('MIN(', query['sql'])
+
+    def test_should_cache_start_level(self) -> None:
+        self.client.get('/admin/tests/foocachedstartlevel/')
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/admin/tests/foocachedstartlevel/')
+
+        for day in (15, 16):
+            self.assertContains(response, f'?created__day={day}&amp;created__month=1&amp;created__year=2017')
+
+        for query in context.captured_queries:
+            self.assertFalse(query['sql'].endswith('LIMIT 1'))
+
+    def test_should_not_select_start_level(self) -> None:
+        response = self.client.get('/admin/tests/foonostartlevel/')
+        self.assertContains(response, '?created__year=2017')
+        self.assertNotContains(response, 'created__day=15')